@@ -0,0 +1,390 @@
+"""Fake Treasure Workflow API server for benchmarks
+
+It serves synthetic attempts, tasks, workflows, schedules, sessions, logs and
+project archives at a configurable scale and latency. Resources are generated
+on demand from their ids, so large scales don't use much memory. It runs in a
+background thread, or in a child process with :class:`FakeServerProcess`.
+"""
+
+import base64
+import dataclasses
+import gzip
+import hashlib
+import json
+import multiprocessing
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Connection
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+PROJECT = {"id": "1", "name": "benchmark"}
+WORKFLOW = {"id": "1", "name": "benchmark"}
+
+
+@dataclasses.dataclass
+class FakeServerConfig:
+    n_attempts: int = 1000
+    n_tasks: int = 1000
+    n_workflows: int = 1000
+    n_schedules: int = 1000
+    n_sessions: int = 1000
+    n_log_files: int = 4
+    log_lines: int = 1000
+    archive_size: int = 1024 * 1024
+    # Number of GET attempts/{id} returning a running attempt before done
+    running_polls: int = 3
+    # Latency in seconds added to each response
+    latency: float = 0.0
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def attempt_repr(attempt_id: int, done: bool = True) -> dict[str, Any]:
+    created = EPOCH + timedelta(minutes=attempt_id)
+    return {
+        "id": str(attempt_id),
+        "index": 1,
+        "project": PROJECT,
+        "workflow": WORKFLOW,
+        "sessionId": str(attempt_id),
+        "sessionUuid": f"00000000-0000-0000-0000-{attempt_id:012d}",
+        "sessionTime": created.isoformat(),
+        "retryAttemptName": None,
+        "done": done,
+        "success": done,
+        "cancelRequested": False,
+        "params": {},
+        "createdAt": _iso(created),
+        "finishedAt": _iso(created + timedelta(seconds=30)) if done else None,
+        "status": "success" if done else "running",
+    }
+
+
+def task_repr(task_id: int) -> dict[str, Any]:
+    started = EPOCH + timedelta(seconds=task_id)
+    if task_id == 1:
+        full_name, parent_id, upstreams = "+benchmark", None, []
+    else:
+        full_name = f"+benchmark+task{task_id}"
+        parent_id = "1"
+        upstreams = [str(task_id - 1)] if task_id > 2 else []
+    return {
+        "id": str(task_id),
+        "fullName": full_name,
+        "parentId": parent_id,
+        "config": {"sh>": f"echo {task_id}"},
+        "upstreams": upstreams,
+        "state": "success",
+        "cancelRequested": False,
+        "exportParams": {},
+        "storeParams": {},
+        "stateParams": {},
+        "updatedAt": _iso(started + timedelta(seconds=1)),
+        "retryAt": None,
+        "startedAt": _iso(started),
+        "error": {},
+        "isGroup": task_id == 1,
+    }
+
+
+def workflow_repr(workflow_id: int) -> dict[str, Any]:
+    return {
+        "id": str(workflow_id),
+        "name": f"workflow{workflow_id}",
+        "project": PROJECT,
+        "revision": "r1",
+        "timezone": "UTC",
+        "config": {"+task": {"sh>": "echo"}},
+    }
+
+
+def schedule_repr(schedule_id: int) -> dict[str, Any]:
+    next_run = EPOCH + timedelta(minutes=schedule_id * 7 % 10080)
+    return {
+        "id": str(schedule_id),
+        "project": PROJECT,
+        "workflow": {"id": str(schedule_id), "name": f"workflow{schedule_id}"},
+        "nextRunTime": _iso(next_run),
+        "nextScheduleTime": next_run.isoformat(),
+        "disabledAt": None,
+    }
+
+
+def session_repr(session_id: int) -> dict[str, Any]:
+    return {
+        "id": str(session_id),
+        "project": PROJECT,
+        "workflow": WORKFLOW,
+        "sessionUuid": f"00000000-0000-0000-0000-{session_id:012d}",
+        "sessionTime": (EPOCH + timedelta(minutes=session_id)).isoformat(),
+        "lastAttempt": attempt_repr(session_id),
+    }
+
+
+def log_text(file_index: int, lines: int) -> str:
+    return "".join(
+        f"2024-01-01 00:00:{i % 60:02d}.000 +0000 [INFO] "
+        f"(0001@[1:benchmark]+benchmark+task{file_index}) "
+        f"io.digdag.core.agent.OperatorManager: line {i} of file {file_index}\n"
+        for i in range(lines)
+    )
+
+
+def log_file_bytes(file_index: int, lines: int) -> bytes:
+    return gzip.compress(log_text(file_index, lines).encode(), compresslevel=1)
+
+
+def archive_bytes(size: int) -> bytes:
+    return bytes(i * 7 % 251 for i in range(size))
+
+
+def _descending(n: int, last_id: int | None, page_size: int) -> range:
+    start = min(n, last_id - 1) if last_id else n
+    return range(start, max(0, start - page_size), -1)
+
+
+def _ascending(n: int, last_id: int | None, page_size: int) -> range:
+    start = (last_id or 0) + 1
+    return range(start, min(n, start + page_size - 1) + 1)
+
+
+class FakeWorkflowServer:
+    """Fake API server running in a background thread
+
+    .. code-block:: python
+
+       >>> with FakeWorkflowServer(FakeServerConfig(n_attempts=10)) as server:
+       ...     client = server.client()
+       ...     client.attempts()
+    """
+
+    def __init__(self, config: FakeServerConfig | None = None) -> None:
+        self.config = config or FakeServerConfig()
+        self.requests = 0
+        self._polls: dict[int, int] = {}
+        self._logs: dict[int, bytes] = {}
+        self._archive: bytes | None = None
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def client(self, **kwargs: Any) -> Any:
+        from tdworkflow.client import Client
+
+        return Client(endpoint=self.endpoint, apikey="dummy", scheme="http", **kwargs)
+
+    def start(self) -> "FakeWorkflowServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeWorkflowServer":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def log_file(self, file_index: int) -> bytes:
+        with self._lock:
+            if file_index not in self._logs:
+                lines = self.config.log_lines
+                self._logs[file_index] = log_file_bytes(file_index, lines)
+            return self._logs[file_index]
+
+    def archive(self) -> bytes:
+        with self._lock:
+            if self._archive is None:
+                self._archive = archive_bytes(self.config.archive_size)
+            return self._archive
+
+    def poll(self, attempt_id: int) -> bool:
+        with self._lock:
+            count = self._polls.get(attempt_id, 0) + 1
+            self._polls[attempt_id] = count
+        return count > self.config.running_polls
+
+    def route(self, method: str, path: str, query: dict[str, str], body: bytes):
+        c = self.config
+        last_id = int(query["last_id"]) if query.get("last_id") else None
+
+        if method == "GET" and path == "attempts":
+            page_size = int(query.get("page_size") or 100)
+            ids = _descending(c.n_attempts, last_id, page_size)
+            return {"attempts": [attempt_repr(i) for i in ids]}
+        if method == "GET" and (m := re.fullmatch(r"attempts/(\d+)", path)):
+            attempt_id = int(m.group(1))
+            return attempt_repr(attempt_id, done=self.poll(attempt_id))
+        if method == "GET" and re.fullmatch(r"attempts/\d+/tasks", path):
+            return {"tasks": [task_repr(i) for i in range(1, c.n_tasks + 1)]}
+        if method == "GET" and path == "workflows":
+            count = int(query.get("count") or 100)
+            ids = _ascending(c.n_workflows, last_id, count)
+            return {"workflows": [workflow_repr(i) for i in ids]}
+        if method == "GET" and path == "schedules":
+            ids = _ascending(c.n_schedules, last_id, 100)
+            return {"schedules": [schedule_repr(i) for i in ids]}
+        if method == "GET" and path == "sessions":
+            page_size = int(query.get("page_size") or 100)
+            ids = _descending(c.n_sessions, last_id, page_size)
+            return {"sessions": [session_repr(i) for i in ids]}
+        if method == "GET" and re.fullmatch(r"logs/\d+/files", path):
+            return {
+                "files": [
+                    {
+                        "fileName": f"+benchmark+task{i}@{i}.log.gz",
+                        "fileSize": len(self.log_file(i)),
+                        "taskName": f"+benchmark+task{i}",
+                        "fileTime": _iso(EPOCH),
+                        "agentId": "benchmark",
+                        "direct": None,
+                    }
+                    for i in range(c.n_log_files)
+                ]
+            }
+        if method == "GET" and (m := re.fullmatch(r"logs/\d+/files/.*@(\d+).*", path)):
+            return self.log_file(int(m.group(1)))
+        if method == "GET" and re.fullmatch(r"projects/\d+/archive", path):
+            return self.archive()
+        if method == "PUT" and path == "projects":
+            md5 = base64.b64encode(hashlib.md5(body).digest()).decode()
+            return {
+                "id": "1",
+                "name": query.get("project", "benchmark"),
+                "revision": query.get("revision", ""),
+                "archiveType": "db",
+                "archiveMd5": md5,
+            }
+        return None
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _handle(self, method: str) -> None:
+                with server._lock:
+                    server.requests += 1
+                if server.config.latency:
+                    time.sleep(server.config.latency)
+
+                url = urlparse(self.path)
+                path = url.path.removeprefix("/api/")
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+
+                result = server.route(method, path, query, body)
+                if result is None:
+                    self._send(404, b'{"message": "not found"}', "application/json")
+                elif isinstance(result, bytes):
+                    self._send(200, result, "application/octet-stream")
+                else:
+                    data = json.dumps(result).encode()
+                    self._send(200, data, "application/json")
+
+            def _send(self, status: int, data: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_PUT(self) -> None:
+                self._handle("PUT")
+
+            def do_POST(self) -> None:
+                self._handle("POST")
+
+        return Handler
+
+
+def _serve(config: FakeServerConfig, conn: Connection) -> None:
+    with FakeWorkflowServer(config) as server:
+        conn.send(server.endpoint)
+        # Serve until the parent asks to stop or exits
+        try:
+            conn.recv()
+        except EOFError:
+            pass
+
+
+class FakeServerProcess:
+    """:class:`FakeWorkflowServer` running in a child process
+
+    Responses are built in the child, so that memory traced in the benchmark
+    process is only allocated by the client. Log files and archives are
+    deterministic, so :meth:`log_file` and :meth:`archive` return the bytes
+    served by the child without a request.
+
+    .. code-block:: python
+
+       >>> with FakeServerProcess(FakeServerConfig(n_attempts=10)) as server:
+       ...     client = server.client()
+       ...     client.attempts()
+    """
+
+    def __init__(self, config: FakeServerConfig | None = None) -> None:
+        self.config = config or FakeServerConfig()
+        self.endpoint = ""
+        self._conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.config, child_conn), daemon=True
+        )
+        self._logs: dict[int, bytes] = {}
+        self._archive: bytes | None = None
+
+    def client(self, **kwargs: Any) -> Any:
+        from tdworkflow.client import Client
+
+        return Client(endpoint=self.endpoint, apikey="dummy", scheme="http", **kwargs)
+
+    def start(self) -> "FakeServerProcess":
+        self._process.start()
+        self.endpoint = self._conn.recv()
+        return self
+
+    def stop(self) -> None:
+        self._conn.send(None)
+        self._process.join(timeout=10)
+        self._conn.close()
+
+    def __enter__(self) -> "FakeServerProcess":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def log_file(self, file_index: int) -> bytes:
+        if file_index not in self._logs:
+            lines = self.config.log_lines
+            self._logs[file_index] = log_file_bytes(file_index, lines)
+        return self._logs[file_index]
+
+    def archive(self) -> bytes:
+        if self._archive is None:
+            self._archive = archive_bytes(self.config.archive_size)
+        return self._archive
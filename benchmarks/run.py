@@ -0,0 +1,226 @@
+"""Benchmark suite for tdworkflow Client
+
+It runs the real :class:`tdworkflow.client.Client` against a fake API server
+in a child process, so it doesn't need network access and peak memory is of
+the client only.
+
+.. code-block:: shell
+
+   python -m benchmarks.run --save baseline.json
+   # After changes
+   python -m benchmarks.run --baseline baseline.json
+"""
+
+import argparse
+import gzip
+import itertools
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Protocol
+
+import tdworkflow
+from benchmarks.fake_server import FakeServerConfig, FakeServerProcess
+from tdworkflow.log_parser import parse_batches
+from tdworkflow.util import archive_files
+
+
+class Benchmark(Protocol):
+    __name__: str
+
+    def __call__(self, client: Any, server: FakeServerProcess) -> int: ...
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+_poll_ids = itertools.count(1_000_000)
+
+
+def benchmark(func: Benchmark) -> Benchmark:
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+@benchmark
+def list_attempts(client, server):
+    return len(client.attempts(page_size=100))
+
+
+@benchmark
+def paginate_attempts(client, server):
+    total = 0
+    last_id = None
+    while attempts := client.attempts(last_id=last_id, page_size=100):
+        total += len(attempts)
+        last_id = attempts[-1].id
+    return total
+
+
+@benchmark
+def paginate_schedules(client, server):
+    total = 0
+    last_id = None
+    while schedules := client.schedules(last_id=last_id):
+        total += len(schedules)
+        last_id = schedules[-1].id
+    return total
+
+
+@benchmark
+def attempt_tasks(client, server):
+    return len(client.attempt_tasks(1))
+
+
+@benchmark
+def stream_attempt_tasks(client, server):
+    return sum(1 for _ in client.iter_attempt_tasks(1))
+
+
+@benchmark
+def download_logs(client, server):
+    return sum(len(log) for log in client.logs(1))
+
+
+@benchmark
+def upload_archive(client, server):
+    with tempfile.TemporaryDirectory() as target_dir:
+        with open(os.path.join(target_dir, "main.dig"), "w") as f:
+            f.write("+task:\n  sh>: echo hello\n")
+        with open(os.path.join(target_dir, "data.bin"), "wb") as f:
+            f.write(server.archive())
+        client.create_project("benchmark", target_dir)
+    return server.config.archive_size
+
+
+@benchmark
+def archive_parallel(client, server):
+    with tempfile.TemporaryDirectory() as target_dir:
+        with open(os.path.join(target_dir, "data.bin"), "wb") as f:
+            f.write(server.archive())
+        archive_files(target_dir, [], compresslevel=6, threads=os.cpu_count() or 1)
+    return server.config.archive_size
+
+
+@benchmark
+def poll_attempt(client, server):
+    # A new attempt id polls the running attempt from the beginning
+    attempt_id = next(_poll_ids)
+    client.wait_attempt(attempt_id, wait_interval=0)
+    return server.config.running_polls + 1
+
+
+@benchmark
+def parse_logs(client, server):
+    # Items per second is the parsing throughput in lines per second
+    lines = gzip.decompress(server.log_file(0)).decode().splitlines()
+    return sum(len(batch["time"]) for batch in parse_batches(lines))
+
+
+@benchmark
+def cold_start(client, server):
+    # Import the package and construct a Client in a fresh interpreter
+    code = "import tdworkflow.client; tdworkflow.client.Client(apikey='APIKEY')"
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return 1
+
+
+def measure(
+    func: Benchmark, client: Any, server: FakeServerProcess, repeat: int
+) -> dict[str, float]:
+    durations = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = func(client, server)
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(client, server)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    durations.sort()
+    median = statistics.median(durations)
+    return {
+        "median_s": median,
+        "p95_s": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+        "items_per_s": items / median if median else 0.0,
+        "peak_kib": peak / 1024,
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Find regressions of median time and peak memory against a baseline"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric in ("median_s", "peak_kib"):
+            before, after = baseline[name][metric], result[metric]
+            if before and after > before * (1 + tolerance):
+                regressions.append(
+                    f"{name}.{metric}: {before:.4g} -> {after:.4g} "
+                    f"(+{(after / before - 1) * 100:.1f}%)"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--select", nargs="*", help="Benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=int, default=1000, help="Number of records")
+    parser.add_argument("--latency", type=float, default=0.0, help="In seconds")
+    parser.add_argument("--save", help="Save results as JSON")
+    parser.add_argument("--baseline", help="Compare results with a saved JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+    logging.getLogger(tdworkflow.__name__).setLevel(logging.WARNING)
+
+    config = FakeServerConfig(
+        n_attempts=args.scale,
+        n_tasks=args.scale,
+        n_workflows=args.scale,
+        n_schedules=args.scale,
+        n_sessions=args.scale,
+        log_lines=args.scale,
+        latency=args.latency,
+    )
+    names = args.select or list(BENCHMARKS)
+    results = {}
+    with FakeServerProcess(config) as server:
+        client = server.client()
+        for name in names:
+            results[name] = measure(BENCHMARKS[name], client, server, args.repeat)
+            r = results[name]
+            print(
+                f"{name:<20} median {r['median_s'] * 1000:9.2f} ms  "
+                f"p95 {r['p95_s'] * 1000:9.2f} ms  "
+                f"{r['items_per_s']:12.1f} items/s  peak {r['peak_kib']:9.1f} KiB"
+            )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,76 @@
+import importlib
 import logging
-from importlib.metadata import PackageNotFoundError, version
-
-from . import (
-    attempt as attempt,
-)
-from . import (
-    client as client,
-)
-from . import (
-    exceptions as exceptions,
-)
-from . import (
-    log as log,
-)
-from . import (
-    project as project,
-)
-from . import (
-    revision as revision,
-)
-from . import (
-    schedule as schedule,
-)
-from . import (
-    session as session,
-)
-from . import (
-    workflow as workflow,
-)
-
-try:
-    __version__ = version("tdworkflow")
-except PackageNotFoundError:
-    # package is not installed
-    __version__ = "0.0.0+unknown"
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import (
+        attempt as attempt,
+    )
+    from . import (
+        client as client,
+    )
+    from . import (
+        exceptions as exceptions,
+    )
+    from . import (
+        log as log,
+    )
+    from . import (
+        project as project,
+    )
+    from . import (
+        revision as revision,
+    )
+    from . import (
+        schedule as schedule,
+    )
+    from . import (
+        session as session,
+    )
+    from . import (
+        workflow as workflow,
+    )
+
+    __version__: str
+
+# Submodules are imported on first access so that ``import tdworkflow`` doesn't
+# load requests and urllib3 until they are needed.
+_SUBMODULES = {
+    "attempt",
+    "client",
+    "exceptions",
+    "log",
+    "project",
+    "revision",
+    "schedule",
+    "session",
+    "workflow",
+}
+
+
+def _version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("tdworkflow")
+    except PackageNotFoundError:
+        # package is not installed
+        return "0.0.0+unknown"
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    if name == "__version__":
+        globals()["__version__"] = value = _version()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_SUBMODULES, "__version__"})
 
 
 logger = logging.getLogger(__name__)
@@ -0,0 +1,142 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import stat
+import time
+from pathlib import Path
+from typing import Any
+
+from .util import archive_files, list_archive_files
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST = "manifest.json"
+_ARCHIVE = "archive.tar.gz"
+# Files modified this close to when the manifest was taken may have changed
+# without changing mtime on file systems with coarse timestamps
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ArchiveCache:
+    """Local cache of project archives keyed by a manifest of their files
+
+    The manifest records path, size, mtime, mode and SHA-256 hash of each
+    archived file. An archive is reused as is when no file's size, mtime or
+    mode changed, so a no-op deploy doesn't read any file. Files whose stat
+    changed are hashed, and the archive is reused if their contents are the
+    same. Otherwise the archive is rebuilt and only the changed files are
+    hashed.
+
+    A file modified shortly before the manifest was taken can change again
+    without changing its mtime, so such a file is always hashed.
+
+    .. code-block:: python
+
+       >>> cache = ArchiveCache(".tdworkflow-cache")
+       >>> client.create_project("my-project", "path/to/project",
+       ...                       archive_cache=cache)
+
+    :param cache_dir: Directory to store manifests and archives
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_dir(self, target_dir: str, options: dict[str, Any]) -> str:
+        key = json.dumps([os.path.abspath(target_dir), options], sort_keys=True)
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, digest)
+
+    def archive(
+        self,
+        target_dir: str,
+        exclude_patterns: list[str],
+        compresslevel: int = 9,
+        threads: int = 1,
+    ) -> io.BytesIO:
+        """Get an archive of a project directory, reusing a cached one if valid
+
+        :param target_dir: Project directory
+        :param exclude_patterns: Regular expressions of paths to exclude
+        :param compresslevel: gzip compression level. Default 9
+        :param threads: Number of compression threads. Default 1
+        :return: gzip compressed tar archive
+        """
+        options = {"exclude_patterns": exclude_patterns, "compresslevel": compresslevel}
+        entry_dir = self._entry_dir(target_dir, options)
+        manifest_path = os.path.join(entry_dir, _MANIFEST)
+        archive_path = os.path.join(entry_dir, _ARCHIVE)
+
+        cached: dict[str, Any] = {"files": {}, "written_at": 0}
+        if os.path.exists(manifest_path) and os.path.exists(archive_path):
+            with open(manifest_path) as f:
+                cached = json.load(f)
+        cached_files: dict[str, dict[str, Any]] = cached["files"]
+
+        written_at = time.time_ns()
+        files: dict[str, dict[str, Any]] = {}
+        to_hash: list[tuple[str, Path]] = []
+        for path, relative_path in list_archive_files(target_dir, exclude_patterns):
+            st = os.stat(path)
+            entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "mode": st.st_mode}
+            name = relative_path.as_posix()
+            previous = cached_files.get(name)
+            if stat.S_ISDIR(st.st_mode):
+                entry["sha256"] = None
+            elif (
+                previous is not None
+                and all(previous[k] == entry[k] for k in ("size", "mtime_ns", "mode"))
+                and st.st_mtime_ns < cached["written_at"] - _RACY_WINDOW_NS
+            ):
+                entry["sha256"] = previous["sha256"]
+            else:
+                to_hash.append((name, path))
+            files[name] = entry
+
+        for name, path in to_hash:
+            files[name]["sha256"] = _hash_file(path)
+
+        def content(entries: dict[str, dict[str, Any]]) -> dict[str, tuple[Any, ...]]:
+            return {n: (e["mode"], e["sha256"]) for n, e in entries.items()}
+
+        if cached_files and content(files) == content(cached_files):
+            self.hits += 1
+            logger.info(
+                f"Reused cached archive of {target_dir}. {len(to_hash)} files hashed"
+            )
+            with open(archive_path, "rb") as f:
+                data = io.BytesIO(f.read())
+            if to_hash:
+                self._write_manifest(manifest_path, files, written_at)
+            return data
+
+        self.misses += 1
+        logger.info(f"Rebuilding archive of {target_dir}. {len(to_hash)} files hashed")
+        data = archive_files(target_dir, exclude_patterns, compresslevel, threads)
+        os.makedirs(entry_dir, exist_ok=True)
+        tmp_path = f"{archive_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data.getbuffer())
+        os.replace(tmp_path, archive_path)
+        self._write_manifest(manifest_path, files, written_at)
+        return data
+
+    def _write_manifest(
+        self, path: str, files: dict[str, dict[str, Any]], written_at: int
+    ) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"files": files, "written_at": written_at}, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,573 @@
+import concurrent.futures
+import dataclasses
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Literal, TypeVar, cast
+
+from .attempt import Attempt
+from .pagination import iter_pages
+from .project import Project
+from .schedule import Schedule, ScheduleAttempt
+from .util import to_iso8601
+from .workflow import Workflow
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class RateLimiter:
+    """Space calls evenly to at most ``rate`` calls per second across threads
+
+    :param rate: Maximum number of calls per second
+    """
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive: {rate}")
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self) -> None:
+        """Block until the next call is allowed"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def _run_concurrently(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    concurrency: int,
+    rate_limiter: RateLimiter | None = None,
+) -> list[tuple[T, R | None, Exception | None]]:
+    """Call ``func`` for each item with bounded concurrency
+
+    Exceptions are captured per item instead of aborting other calls.
+
+    :return: List of item, result and exception in the order of items
+    """
+
+    def call(item: T) -> tuple[T, R | None, Exception | None]:
+        if rate_limiter:
+            rate_limiter.acquire()
+        try:
+            return item, func(item), None
+        except Exception as e:
+            logger.warning(f"Failed for {item}: {e}")
+            return item, None, e
+
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+        return list(pool.map(call, items))
+
+
+@dataclasses.dataclass
+class BackfillRequest:
+    """Backfill of a schedule
+
+    :param schedule: Schedule ID or Schedule object
+    :param from_time: Session time to start backfill from
+    :param count: Number of sessions to run. All sessions until now if ``None``
+    :param attempt_name: Attempt name. Default ``attempt_name`` of
+                         :func:`bulk_backfill`
+    """
+
+    schedule: int | Schedule
+    from_time: str | datetime
+    count: int | None = None
+    attempt_name: str | None = None
+
+    @property
+    def schedule_id(self) -> int:
+        if isinstance(self.schedule, Schedule):
+            return self.schedule.id
+        return self.schedule
+
+
+@dataclasses.dataclass
+class BackfillResult:
+    """Result of a :class:`BackfillRequest`"""
+
+    request: BackfillRequest
+    schedule_attempt: ScheduleAttempt | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def attempts(self) -> list[Attempt]:
+        return self.schedule_attempt.attempts if self.schedule_attempt else []
+
+
+def bulk_backfill(
+    client: "Client",
+    requests: Iterable[BackfillRequest],
+    attempt_name: str,
+    dry_run: bool = False,
+    concurrency: int = 4,
+) -> list[BackfillResult]:
+    """Backfill many schedules with bounded concurrency
+
+    Use ``dry_run=True`` to plan backfills. The sessions to be run are listed
+    in :attr:`BackfillResult.attempts` without starting them.
+
+    .. code-block:: python
+
+       >>> reqs = [BackfillRequest(s, "2024-05-01T00:00:00Z") for s in schedules]
+       >>> plan = bulk_backfill(client, reqs, "outage-0501", dry_run=True)
+       >>> sum(len(r.attempts) for r in plan)
+       >>> results = bulk_backfill(client, reqs, "outage-0501")
+       >>> progress = wait_backfill(client, results, on_progress=print)
+
+    :param client: Client
+    :param requests: Backfill requests
+    :param attempt_name: Attempt name used unless a request has its own
+    :param dry_run: Plan backfills without running them
+    :param concurrency: Number of concurrent requests. Default 4
+    :return: List of :class:`BackfillResult` in the order of requests
+    """
+
+    def backfill(request: BackfillRequest) -> ScheduleAttempt:
+        return client.backfill_schedule(
+            request.schedule_id,
+            request.attempt_name or attempt_name,
+            request.from_time,
+            dry_run=dry_run,
+            count=request.count,
+        )
+
+    results = [
+        BackfillResult(request, schedule_attempt, error)
+        for request, schedule_attempt, error in _run_concurrently(
+            backfill, requests, concurrency
+        )
+    ]
+    n_failed = sum(1 for r in results if not r.ok)
+    n_attempts = sum(len(r.attempts) for r in results)
+    action = "Planned" if dry_run else "Started"
+    logger.info(
+        f"{action} {n_attempts} attempts for {len(results) - n_failed} schedules. "
+        f"{n_failed} schedules failed"
+    )
+    return results
+
+
+@dataclasses.dataclass
+class Progress:
+    """Aggregate progress of attempts tracked by :class:`AttemptPoller`"""
+
+    total: int = 0
+    running: int = 0
+    succeeded: int = 0
+    failed: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.running == 0
+
+    def __str__(self) -> str:
+        finished = self.succeeded + self.failed
+        return (
+            f"{finished}/{self.total} finished "
+            f"({self.succeeded} succeeded, {self.failed} failed)"
+        )
+
+
+class AttemptPoller:
+    """Shared poller tracking many attempts until they finish
+
+    Each :meth:`poll_once` fetches only unfinished attempts with bounded
+    concurrency, so the number of requests decreases as attempts finish.
+
+    :param client: Client
+    :param attempts: Attempt IDs or Attempt objects
+    :param concurrency: Number of concurrent requests. Default 4
+    """
+
+    def __init__(
+        self,
+        client: "Client",
+        attempts: Iterable[int | Attempt],
+        concurrency: int = 4,
+    ) -> None:
+        self.client = client
+        self.concurrency = concurrency
+        self.attempts: dict[int, Attempt] = {}
+        for attempt in attempts:
+            if isinstance(attempt, Attempt):
+                self.attempts[attempt.id] = attempt
+            else:
+                self.attempts[attempt] = Attempt(id=attempt)
+
+    def progress(self) -> Progress:
+        progress = Progress(total=len(self.attempts))
+        for attempt in self.attempts.values():
+            if not attempt.done:
+                progress.running += 1
+            elif attempt.success:
+                progress.succeeded += 1
+            else:
+                progress.failed += 1
+        return progress
+
+    def poll_once(self) -> Progress:
+        """Refresh unfinished attempts
+
+        :return: Progress after the refresh
+        """
+        running = [a for a in self.attempts.values() if not a.done]
+        for attempt_id, attempt, _ in _run_concurrently(
+            self.client.attempt, [a.id for a in running], self.concurrency
+        ):
+            if attempt is not None:
+                self.attempts[attempt_id] = attempt
+        return self.progress()
+
+    def wait(
+        self,
+        interval: float = 10.0,
+        timeout: float | None = None,
+        on_progress: Callable[[Progress], Any] | None = None,
+    ) -> Progress:
+        """Poll until all attempts finish
+
+        :param interval: Polling interval in seconds. Default 10 sec
+        :param timeout: Give up after this number of seconds, optional
+        :param on_progress: Function called with :class:`Progress` after each
+                            poll, optional
+        :return: Progress
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            progress = self.poll_once()
+            if on_progress:
+                on_progress(progress)
+            if progress.done:
+                return progress
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting attempts: {progress}")
+                return progress
+            time.sleep(interval)
+
+
+def wait_backfill(
+    client: "Client",
+    results: Iterable[BackfillResult],
+    interval: float = 10.0,
+    timeout: float | None = None,
+    on_progress: Callable[[Progress], Any] | None = None,
+    concurrency: int = 4,
+) -> Progress:
+    """Wait for all attempts started by :func:`bulk_backfill`
+
+    :param client: Client
+    :param results: Results of :func:`bulk_backfill`
+    :param interval: Polling interval in seconds. Default 10 sec
+    :param timeout: Give up after this number of seconds, optional
+    :param on_progress: Function called with :class:`Progress` after each poll
+    :param concurrency: Number of concurrent requests. Default 4
+    :return: Progress
+    """
+    attempts = [a for r in results for a in r.attempts]
+    poller = AttemptPoller(client, attempts, concurrency)
+    return poller.wait(interval, timeout, on_progress)
+
+
+ScheduleAction = Literal["disable", "enable", "skip", "restore"]
+
+
+@dataclasses.dataclass
+class ScheduleResult:
+    """Result of a bulk schedule operation for a schedule
+
+    ``changed`` is ``False`` if the schedule was already in the requested
+    state and no request was made.
+    """
+
+    schedule: Schedule
+    action: ScheduleAction
+    changed: bool = True
+    updated: Schedule | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def select_schedules(
+    client: "Client",
+    schedules: Iterable[int | Schedule] | None = None,
+    project: str | Project | None = None,
+    workflow: str | Workflow | None = None,
+    concurrency: int = 4,
+) -> list[Schedule]:
+    """Select schedules by IDs, objects or project and workflow names
+
+    Schedule IDs are fetched to know their current state. Without
+    ``schedules``, all schedules are listed and filtered by names.
+
+    :param client: Client
+    :param schedules: Schedule IDs or Schedule objects, optional
+    :param project: Project name or Project object, optional
+    :param workflow: Workflow name or Workflow object, optional
+    :param concurrency: Number of concurrent requests. Default 4
+    :return: List of Schedule
+    """
+    project_name = project.name if isinstance(project, Project) else project
+    workflow_name = workflow.name if isinstance(workflow, Workflow) else workflow
+
+    if schedules is not None:
+        selected = []
+        for _, schedule, error in _run_concurrently(
+            lambda s: s if isinstance(s, Schedule) else client.schedule(s),
+            schedules,
+            concurrency,
+        ):
+            if error:
+                raise error
+            selected.append(cast(Schedule, schedule))
+    else:
+        selected = [
+            Schedule.from_api_repr(**s)
+            for page in iter_pages(client.get, "schedules", "schedules")
+            for s in page
+        ]
+
+    return [
+        s
+        for s in selected
+        if (not project_name or s.project.name == project_name)
+        and (not workflow_name or s.workflow.name == workflow_name)
+    ]
+
+
+def save_snapshot(schedules: Iterable[Schedule], path: str) -> None:
+    """Save enabled states and next run times of schedules to a JSON file
+
+    :param schedules: Schedules
+    :param path: JSON file path
+    """
+    snapshot = [
+        {
+            "id": s.id,
+            "project": s.project.name,
+            "workflow": s.workflow.name,
+            "disabled": s.disabledAt is not None,
+            "nextRunTime": to_iso8601(s.nextRunTime) or None,
+        }
+        for s in schedules
+    ]
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"schedules": snapshot}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _bulk_update(
+    action: ScheduleAction,
+    schedules: list[Schedule],
+    func: Callable[[Schedule], Schedule],
+    needs_change: Callable[[Schedule], bool],
+    dry_run: bool,
+    concurrency: int,
+    rate_limit: float | None,
+    snapshot_path: str | None,
+    always_call: bool = False,
+) -> list[ScheduleResult]:
+    # always_call makes requests even in a dry run, for APIs supporting dry run
+    if snapshot_path and not dry_run:
+        save_snapshot(schedules, snapshot_path)
+
+    targets = [s for s in schedules if needs_change(s)]
+    results = {s.id: ScheduleResult(s, action, changed=s in targets) for s in schedules}
+    if always_call or not dry_run:
+        rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        for schedule, updated, error in _run_concurrently(
+            func, targets, concurrency, rate_limiter
+        ):
+            results[schedule.id].updated = updated
+            results[schedule.id].error = error
+
+    n_failed = sum(1 for r in results.values() if not r.ok)
+    verb = "Would" if dry_run else "Did"
+    logger.info(
+        f"{verb} {action} {len(targets)} of {len(schedules)} schedules. "
+        f"{n_failed} failed"
+    )
+    return list(results.values())
+
+
+def bulk_disable_schedules(
+    client: "Client",
+    schedules: Iterable[int | Schedule] | None = None,
+    project: str | Project | None = None,
+    workflow: str | Workflow | None = None,
+    dry_run: bool = False,
+    concurrency: int = 4,
+    rate_limit: float | None = None,
+    snapshot_path: str | None = None,
+) -> list[ScheduleResult]:
+    """Disable many schedules concurrently
+
+    Already disabled schedules are left untouched. Use ``dry_run=True`` to
+    see the change plan, and :func:`rollback_schedules` with the snapshot to
+    restore the previous states.
+
+    .. code-block:: python
+
+       >>> results = bulk_disable_schedules(
+       ...     client, project="pandas-df", rate_limit=10, snapshot_path="snap.json"
+       ... )
+       >>> [r.schedule.id for r in results if not r.ok]
+       >>> rollback_schedules(client, "snap.json")
+
+    :param client: Client
+    :param schedules: Schedule IDs or Schedule objects, optional
+    :param project: Project name or Project object to filter schedules, optional
+    :param workflow: Workflow name or Workflow object to filter schedules,
+                     optional
+    :param dry_run: Return the change plan without making changes
+    :param concurrency: Number of concurrent requests. Default 4
+    :param rate_limit: Maximum number of requests per second, optional
+    :param snapshot_path: JSON file to save the states before changes, optional
+    :return: List of :class:`ScheduleResult`
+    """
+    selected = select_schedules(client, schedules, project, workflow, concurrency)
+    return _bulk_update(
+        "disable",
+        selected,
+        client.disable_schedule,
+        lambda s: s.disabledAt is None,
+        dry_run,
+        concurrency,
+        rate_limit,
+        snapshot_path,
+    )
+
+
+def bulk_enable_schedules(
+    client: "Client",
+    schedules: Iterable[int | Schedule] | None = None,
+    project: str | Project | None = None,
+    workflow: str | Workflow | None = None,
+    dry_run: bool = False,
+    concurrency: int = 4,
+    rate_limit: float | None = None,
+    snapshot_path: str | None = None,
+) -> list[ScheduleResult]:
+    """Enable many schedules concurrently
+
+    Already enabled schedules are left untouched. See
+    :func:`bulk_disable_schedules` for parameters.
+
+    :return: List of :class:`ScheduleResult`
+    """
+    selected = select_schedules(client, schedules, project, workflow, concurrency)
+    return _bulk_update(
+        "enable",
+        selected,
+        client.enable_schedule,
+        lambda s: s.disabledAt is not None,
+        dry_run,
+        concurrency,
+        rate_limit,
+        snapshot_path,
+    )
+
+
+def bulk_skip_schedules(
+    client: "Client",
+    schedules: Iterable[int | Schedule] | None = None,
+    project: str | Project | None = None,
+    workflow: str | Workflow | None = None,
+    from_time: str | datetime | None = None,
+    next_time: str | None = None,
+    next_run_time: str | datetime | None = None,
+    dry_run: bool = False,
+    concurrency: int = 4,
+    rate_limit: float | None = None,
+    snapshot_path: str | None = None,
+) -> list[ScheduleResult]:
+    """Skip many schedules forward concurrently
+
+    With ``dry_run=True``, the skip API is called in dry run mode so that
+    :attr:`ScheduleResult.updated` shows the new next run times. Skips can't
+    be rolled back, but the snapshot records the previous next run times. See
+    :func:`bulk_disable_schedules` for other parameters.
+
+    :param from_time: From time
+    :param next_time: Next time
+    :param next_run_time: Next run time
+    :return: List of :class:`ScheduleResult`
+    """
+    selected = select_schedules(client, schedules, project, workflow, concurrency)
+
+    def skip(schedule: Schedule) -> Schedule:
+        return client.skip_schedule(
+            schedule, from_time, next_time, next_run_time, dry_run=dry_run
+        )
+
+    # The skip API supports dry run itself, so requests are always made
+    return _bulk_update(
+        "skip",
+        selected,
+        skip,
+        lambda s: True,
+        dry_run,
+        concurrency,
+        rate_limit,
+        snapshot_path,
+        always_call=True,
+    )
+
+
+def rollback_schedules(
+    client: "Client",
+    snapshot_path: str,
+    concurrency: int = 4,
+    rate_limit: float | None = None,
+) -> list[ScheduleResult]:
+    """Restore enabled states of schedules saved in a snapshot
+
+    :param client: Client
+    :param snapshot_path: JSON file saved by a bulk operation
+    :param concurrency: Number of concurrent requests. Default 4
+    :param rate_limit: Maximum number of requests per second, optional
+    :return: List of :class:`ScheduleResult`
+    """
+    with open(snapshot_path) as f:
+        snapshot = {s["id"]: s for s in json.load(f)["schedules"]}
+
+    current = select_schedules(client, list(snapshot), concurrency=concurrency)
+
+    def restore(schedule: Schedule) -> Schedule:
+        if snapshot[schedule.id]["disabled"]:
+            return client.disable_schedule(schedule)
+        return client.enable_schedule(schedule)
+
+    return _bulk_update(
+        "restore",
+        current,
+        restore,
+        lambda s: snapshot[s.id]["disabled"] != (s.disabledAt is not None),
+        False,
+        concurrency,
+        rate_limit,
+        None,
+    )
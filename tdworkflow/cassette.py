@@ -0,0 +1,262 @@
+import base64
+import gzip
+import hashlib
+import io
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from typing import IO, Any, Literal
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from . import exceptions
+
+CASSETTE_VERSION = 1
+
+# Bodies are recorded decoded, so transfer related headers are dropped
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _encode_body(body: bytes, content_type: str) -> dict[str, str]:
+    if "application/json" in content_type or content_type.startswith("text/"):
+        try:
+            return {"text": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            pass
+    return {"base64": base64.b64encode(body).decode("ascii")}
+
+
+def _decode_body(entry: Mapping[str, Any]) -> bytes:
+    if "text" in entry:
+        return entry["text"].encode("utf-8")
+    return base64.b64decode(entry.get("base64", ""))
+
+
+def _request_body_digest(body: Any) -> dict[str, Any]:
+    if body is None:
+        return {}
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if isinstance(body, bytes):
+        return {
+            "requestBytes": len(body),
+            "requestSha256": hashlib.sha256(body).hexdigest(),
+        }
+    # File-like bodies such as project archives aren't read, since reading an
+    # UploadBody counts as an upload attempt and reports progress
+    if hasattr(body, "__len__"):
+        return {"requestBytes": len(body)}
+    return {}
+
+
+class Cassette:
+    """Record and replay HTTP traffic of :class:`tdworkflow.client.Client`
+
+    A cassette is a gzip compressed JSON Lines file. The first line is a
+    header and each following line is a request and response pair. Response
+    bodies, including gzip log files and project archives, are stored as they
+    are. Request headers except Range aren't stored, so API keys never reach
+    the file; request bodies are stored as their size and SHA-256 of in-memory
+    bodies.
+
+    .. code-block:: python
+
+       >>> with Cassette("incident.jsonl.gz", mode="record") as cassette:
+       ...     client = Client("us", cassette=cassette)
+       ...     client.logs(attempt_id)
+       >>> # Replay later without network access
+       >>> cassette = Cassette("incident.jsonl.gz", mode="replay", realtime=True)
+       >>> client = Client("us", apikey="dummy", cassette=cassette)
+       >>> client.logs(attempt_id)
+
+    :param path: Cassette file path
+    :type path: str
+    :param mode: ``"record"`` to write traffic or ``"replay"`` to serve it back
+    :type mode: str
+    :param realtime: Sleep for the recorded response time on replay if ``True``.
+                     Otherwise replay as fast as possible.
+    :type realtime: bool
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: Literal["record", "replay"] = "replay",
+        realtime: bool = False,
+    ) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.realtime = realtime
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._file: IO[str] | None = None
+        self._entries: dict[tuple[str, str, str], deque[dict[str, Any]]] = {}
+        self._last: dict[tuple[str, str, str], dict[str, Any]] = {}
+
+        if mode == "record":
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+            header = {"version": CASSETTE_VERSION, "recordedAt": self._started}
+            self._write(header)
+        else:
+            self._load()
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        if self._file is None:
+            raise ValueError(f"Cassette {self.path} is closed")
+        self._file.write(json.dumps(entry, separators=(",", ":")))
+        self._file.write("\n")
+        self._file.flush()
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version: {header}")
+            for line in f:
+                entry = json.loads(line)
+                key = (entry["method"], entry["url"], entry.get("range", ""))
+                self._entries.setdefault(key, deque()).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(e) for e in self._entries.values())
+
+    def record(
+        self,
+        request: requests.PreparedRequest,
+        response: requests.Response,
+        elapsed: float,
+    ) -> None:
+        """Append a request and response pair
+
+        :param request: Sent request
+        :param response: Received response. Its body is read.
+        :param elapsed: Response time in seconds
+        """
+        content_type = response.headers.get("Content-Type", "")
+        entry: dict[str, Any] = {
+            "offset": round(time.time() - self._started, 6),
+            "elapsed": round(elapsed, 6),
+            "method": request.method,
+            "url": request.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                k: v
+                for k, v in response.headers.items()
+                if k.lower() not in _DROPPED_HEADERS
+            },
+            **_encode_body(response.content, content_type),
+            **_request_body_digest(request.body),
+        }
+        if "Range" in request.headers:
+            entry["range"] = request.headers["Range"]
+
+        with self._lock:
+            self._write(entry)
+
+    def play(self, request: requests.PreparedRequest) -> requests.Response:
+        """Build a response for a request from recorded traffic
+
+        Recorded responses of the same method, URL and Range header are served
+        in order, and the last one is repeated once exhausted, e.g. for
+        polling. The body is also available to streamed requests.
+
+        :param request: Request to be served
+        :raises CassetteError: If no response was recorded for the request
+        :return: Response
+        """
+        key = (
+            request.method or "",
+            request.url or "",
+            str(request.headers.get("Range", "")),
+        )
+        with self._lock:
+            queue = self._entries.get(key)
+            if queue:
+                entry = self._last[key] = queue.popleft()
+            elif key in self._last:
+                entry = self._last[key]
+            else:
+                raise exceptions.CassetteError(
+                    f"No recorded response for {key[0]} {key[1]}", request=request
+                )
+
+        if self.realtime:
+            time.sleep(entry["elapsed"])
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason", "")
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        body = _decode_body(entry)
+        response._content = body
+        response._content_consumed = True
+        response.raw = io.BytesIO(body)
+        response.url = entry["url"]
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def adapter(self, **kwargs: Any) -> BaseAdapter:
+        """Create a transport adapter for this cassette
+
+        :param kwargs: Keyword arguments for :class:`requests.adapters.HTTPAdapter`
+                       in record mode
+        :return: Transport adapter to be mounted to a session
+        """
+        if self.mode == "record":
+            return RecordingAdapter(self, **kwargs)
+        return ReplayAdapter(self)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter writing every response to a :class:`Cassette`"""
+
+    def __init__(self, cassette: Cassette, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(
+        self, request: requests.PreparedRequest, *args: Any, **kwargs: Any
+    ) -> requests.Response:
+        start = time.perf_counter()
+        response = super().send(request, *args, **kwargs)
+        # Reading content here keeps it available to streaming consumers
+        _ = response.content
+        self.cassette.record(request, response, time.perf_counter() - start)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Adapter serving responses from a :class:`Cassette` without network"""
+
+    def __init__(self, cassette: Cassette) -> None:
+        super().__init__()
+        self.cassette = cassette
+
+    def send(
+        self, request: requests.PreparedRequest, *args: Any, **kwargs: Any
+    ) -> requests.Response:
+        return self.cassette.play(request)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,111 @@
+import argparse
+import logging
+import os
+import sys
+from collections.abc import Sequence
+
+from .client import Client
+from .export import RESOURCES, export
+
+logger = logging.getLogger(__name__)
+
+
+def _client(args: argparse.Namespace) -> Client:
+    return Client(
+        site=args.site, endpoint=args.endpoint, apikey=args.apikey, scheme=args.scheme
+    )
+
+
+def _export(args: argparse.Namespace) -> int:
+    checkpoint = args.checkpoint or os.path.join(args.output, "checkpoint.json")
+    rows = export(
+        _client(args),
+        args.output,
+        resources=args.resource or RESOURCES,
+        format=args.format,
+        checkpoint_path=checkpoint,
+        concurrency=args.concurrency,
+        rows_per_file=args.rows_per_file,
+        project=args.project,
+        workflow=args.workflow,
+        include_retried=args.include_retried,
+        page_size=args.page_size,
+    )
+    for resource, n in rows.items():
+        print(f"{resource}\t{n}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="tdworkflow", description="Unofficial Treasure Workflow API client"
+    )
+    parser.add_argument("--site", default="us", help="Site. Default us")
+    parser.add_argument("--endpoint", help="Treasure Workflow API endpoint")
+    parser.add_argument("--scheme", default="https", help="URI scheme")
+    parser.add_argument("--apikey", help="Treasure Data API key. Default $TD_API_KEY")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Debug logs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser(
+        "export",
+        help="Export workflow history to JSON Lines or Parquet",
+        description=(
+            "Export workflow history. Rerun the same command to resume an "
+            "interrupted export from the checkpoint."
+        ),
+    )
+    export_parser.add_argument("output", help="Output directory")
+    export_parser.add_argument(
+        "-r",
+        "--resource",
+        action="append",
+        choices=RESOURCES,
+        help="Resource to export. Repeatable. Default all",
+    )
+    export_parser.add_argument(
+        "-f", "--format", choices=("jsonl", "parquet"), default="jsonl"
+    )
+    export_parser.add_argument(
+        "--checkpoint", help="Checkpoint file. Default <output>/checkpoint.json"
+    )
+    export_parser.add_argument("--project", help="Filter attempts and tasks")
+    export_parser.add_argument("--workflow", help="Filter attempts and tasks")
+    export_parser.add_argument("--include-retried", action="store_true")
+    export_parser.add_argument(
+        "--page-size", type=int, default=100, help="Items per request. Default 100"
+    )
+    export_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of resources and task requests processed concurrently",
+    )
+    export_parser.add_argument(
+        "--rows-per-file", type=int, default=100_000, help="Rows per Parquet file"
+    )
+    export_parser.set_defaults(func=_export)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point of the ``tdworkflow`` command
+
+    :param argv: Command line arguments. Default ``sys.argv[1:]``
+    :return: Exit status
+    """
+    args = build_parser().parse_args(argv)
+    if args.verbose:
+        logging.getLogger("tdworkflow").setLevel(logging.DEBUG)
+    try:
+        return args.func(args)
+    except (ValueError, ImportError) as e:
+        logger.error(str(e))
+        return 1
+    except KeyboardInterrupt:
+        logger.error("Interrupted. Rerun the same command to resume.")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
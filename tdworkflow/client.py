@@ -3,11 +3,12 @@ import io
 import json
 import logging
 import os
+import threading
 import time
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from datetime import datetime
-from typing import Any, BinaryIO, Literal, cast, overload
+from typing import TYPE_CHECKING, Any, BinaryIO, Literal, cast, overload
 
 import requests
 from mypy_extensions import DefaultArg
@@ -16,14 +17,23 @@ from urllib3.util.retry import Retry
 
 import tdworkflow
 
-from . import exceptions
+from . import exceptions, tracing
+from .archive_cache import ArchiveCache
 from .attempt import Attempt
+from .cassette import Cassette
+from .download import download_file
+from .hooks import Hook, RequestEvent, dispatch, path_template
+from .json_stream import iter_resources
 from .log import LogFile
+from .pagination import iter_pages, iter_streamed_items
 from .project import Project
+from .request_log import RequestLogger
 from .revision import Revision
 from .schedule import Schedule, ScheduleAttempt
 from .session import Session
+from .singleflight import SingleFlight
 from .task import Task
+from .upload import ProgressCallback, UploadBody
 from .util import archive_files, to_iso8601, to_iso_instant
 from .workflow import Workflow
 
@@ -38,7 +48,26 @@ DataType = str | dict[str, Any] | list[tuple[Any]] | BinaryIO
 ListOfDict = dict[str, list[dict[str, Any]]]
 
 
-class WorkflowAPI:
+def _retry_count(r: requests.Response) -> int:
+    # urllib3 keeps the Retry object used for the response with its history
+    retries = getattr(getattr(r, "raw", None), "retries", None)
+    history = getattr(retries, "history", None)
+    return len(history) if isinstance(history, tuple) else 0
+
+
+class _StreamAPI:
+    if TYPE_CHECKING:
+        # Declared as a method stub rather than a Callable attribute, so that
+        # Client.get_stream overrides it without invalid-mutable-override
+        def get_stream(
+            self,
+            path: str,
+            params: Params | None = None,
+            headers: dict[str, str] | None = None,
+        ) -> requests.Response: ...
+
+
+class WorkflowAPI(_StreamAPI):
     get: Callable[[str, DefaultArg(Params, "params")], GetResponse]
 
     def workflows(
@@ -65,6 +94,52 @@ class WorkflowAPI:
         :return: List of Workflow
         :rtype: List[Workflow]
         """
+        params = self._workflows_params(
+            name_pattern, search_project_name, order, count, last_id
+        )
+        res = cast(ListOfDict, self.get("workflows", params=params))
+        if len(res) > 0:
+            return [Workflow.from_api_repr(**wf) for wf in res["workflows"]]
+        else:
+            return []
+
+    def iter_workflows(
+        self,
+        name_pattern: str | None = None,
+        search_project_name: bool = False,
+        order: str | None = None,
+        last_id: int | None = None,
+        page_size: int = 100,
+    ) -> Iterator[Workflow]:
+        """Iterate workflows over all pages
+
+        Each page is decoded incrementally, so that the first workflow is
+        available before the whole page arrives.
+
+        :param name_pattern: Name pattern to be partially matched
+        :param search_project_name: Flag to use name_pattern to search
+            partial project name. Default False
+        :param order: Sort order. 'asc' or 'dsc'. Default 'asc'
+        :param last_id: Start pagination from this id
+        :param page_size: Number of workflows to fetch per request. Default 100
+        :return: Iterator of Workflow
+        """
+        params = self._workflows_params(
+            name_pattern, search_project_name, order, None, last_id
+        )
+        for wf in iter_streamed_items(
+            self.get_stream, "workflows", "workflows", params, page_size, "count"
+        ):
+            yield Workflow.from_api_repr(**wf)
+
+    @staticmethod
+    def _workflows_params(
+        name_pattern: str | None,
+        search_project_name: bool,
+        order: str | None,
+        count: int | None,
+        last_id: int | None,
+    ) -> Params:
         params: Params = {}
         if name_pattern:
             params["name_pattern"] = name_pattern
@@ -76,11 +151,7 @@ class WorkflowAPI:
             params["count"] = count
         if last_id:
             params["last_id"] = last_id
-        res = cast(ListOfDict, self.get("workflows", params=params))
-        if len(res) > 0:
-            return [Workflow.from_api_repr(**wf) for wf in res["workflows"]]
-        else:
-            return []
+        return params
 
     def workflow(self, workflow: int | Workflow) -> Workflow:
         """Get a specific workflow
@@ -95,7 +166,7 @@ class WorkflowAPI:
         return Workflow.from_api_repr(**res)
 
 
-class ProjectAPI:
+class ProjectAPI(_StreamAPI):
     get: Callable[
         [str, DefaultArg(Params, "params"), DefaultArg(bool, "content")], GetResponse
     ]
@@ -200,6 +271,10 @@ class ProjectAPI:
         clear_schedule_all: bool | None = None,
         exclude_patterns: list[str] | None = None,
         revision: str | None = None,
+        compresslevel: int = 9,
+        compress_threads: int = 1,
+        archive_cache: ArchiveCache | None = None,
+        on_progress: ProgressCallback | None = None,
     ) -> Project:
         """Create a new project
 
@@ -216,6 +291,15 @@ class ProjectAPI:
                                  default: ["venv", ".venv", "__pycache__", ".egg-info",\
                                   ".digdag", ".pyc"] + dot files
         :param revision: Revision name
+        :param compresslevel: gzip compression level of the project archive
+                              from 0 to 9. Lower is faster. default: 9
+        :param compress_threads: Number of threads to compress the project
+                                 archive. More than 1 compresses blocks in
+                                 parallel like pigz. default: 1
+        :param archive_cache: Cache to reuse the project archive when no file
+                              changed since the last call, optional
+        :param on_progress: Function called with uploaded bytes and total bytes
+                            of the project archive, optional
         :return:
         """
         revision = revision or str(uuid.uuid4())
@@ -239,14 +323,37 @@ class ProjectAPI:
             ".pyc",
         ]
         if exclude_patterns:
-            exclude_patterns.extend(default_excludes)
+            exclude_patterns = [*exclude_patterns, *default_excludes]
         else:
             exclude_patterns = default_excludes
-        data = archive_files(target_dir, exclude_patterns)
-        r = cast(dict[str, Any], self.put("projects", params=params, data=data))
+        with tracing.span(
+            "tdworkflow.create_project",
+            {"tdworkflow.project.name": project_name, "tdworkflow.revision": revision},
+        ):
+            if archive_cache is not None:
+                data = archive_cache.archive(
+                    target_dir, exclude_patterns, compresslevel, compress_threads
+                )
+            else:
+                data = archive_files(
+                    target_dir, exclude_patterns, compresslevel, compress_threads
+                )
+            with UploadBody(data, on_progress) as body:
+                del data
+                r = cast(dict[str, Any], self.put("projects", params=params, data=body))
+            logger.debug(
+                f"Uploaded {body.length} bytes in {body.attempts} attempt(s) "
+                f"at {(body.bytes_per_second or 0) / 1024:.1f} KiB/s"
+            )
 
         if r:
-            return Project.from_api_repr(**r)
+            project = Project.from_api_repr(**r)
+            if project.archiveMd5 and project.archiveMd5 != body.md5:
+                logger.warning(
+                    f"MD5 of the stored archive {project.archiveMd5} doesn't "
+                    f"match the uploaded archive {body.md5}"
+                )
+            return project
         else:
             raise ValueError("Unable to crate project")
 
@@ -268,24 +375,49 @@ class ProjectAPI:
         project: int | Project,
         file_path: str,
         revision: str | None = None,
+        resume: bool = False,
+        parallel: int = 1,
     ) -> bool:
         """Download a project and save as a file (tar.gz)
 
+        The archive is streamed into ``<file_path>.part``, which is renamed to
+        ``file_path`` when complete. A transfer cut off in the middle is
+        resumed with HTTP Range requests if the server supports them.
+
         :param project: Project id or Project object
         :param file_path: Target file path to be saved in tar.gz
         :param revision: Revision name
+        :param resume: Resume from a ``.part`` file left by a previous call.
+                       The archive is verified with its MD5. Default ``False``
+        :param parallel: Number of concurrent range requests for a large
+                         archive. The archive is verified with its MD5.
+                         Default 1
         :return: ``True`` if succeeded
         """
         params = {"revision": revision} if revision else {}  # type: Params
         project_id = project.id if isinstance(project, Project) else project
-        res = cast(
-            bytes,
-            self.get(f"projects/{project_id}/archive", params=params, content=True),
-        )
+
+        md5 = None
+        if resume or parallel > 1:
+            # Pieces from separate requests are verified as a whole
+            if revision:
+                revisions = self.project_revisions(project_id)
+                md5 = next(
+                    (r.archiveMd5 for r in revisions if r.revision == revision), None
+                )
+            else:
+                md5 = self.project(project_id).archiveMd5
 
         # File will be downloaded as tar.gz format
-        with open(file_path, "wb") as f:
-            f.write(res)
+        download_file(
+            self.get_stream,
+            f"projects/{project_id}/archive",
+            file_path,
+            params=params,
+            resume=resume,
+            parallel=parallel,
+            md5=md5 or None,
+        )
 
         return True
 
@@ -463,7 +595,7 @@ class ProjectAPI:
             return []
 
 
-class AttemptAPI:
+class AttemptAPI(_StreamAPI):
     get: Callable[[str, DefaultArg(Params, "params")], GetResponse]
     put: Callable[
         [
@@ -523,6 +655,47 @@ class AttemptAPI:
         )
         return res
 
+    def iter_attempts(
+        self,
+        project: str | Project | None = None,
+        workflow: str | Workflow | None = None,
+        include_retried: bool | None = None,
+        last_id: int | None = None,
+        page_size: int = 100,
+    ) -> Iterator[Attempt]:
+        """Iterate attempts over all pages
+
+        :param project: Project name or Project object, optional
+        :type project: Optional[Union[str, Project]]
+        :param workflow: Workflow name or Workflow object, optional
+        :type workflow: Optional[Union[str, Workflow]]
+        :param include_retried: List more than 1 attempts per session
+        :type include_retried: Optional[bool]
+        :param last_id: Start pagination from this id
+        :type last_id: Optional[int]
+        :param page_size: Number of attempts to fetch per request. Default 100
+        :type page_size: int
+        :return: Iterator of Attempt object
+        :rtype: Iterator[Attempt]
+        """
+        params: Params = {}
+        if project:
+            project_name = project.name if isinstance(project, Project) else project
+            params["project"] = project_name
+        if workflow:
+            workflow_name = (
+                workflow.name if isinstance(workflow, Workflow) else workflow
+            )
+            params["workflow"] = workflow_name
+        if include_retried:
+            params["include_retried"] = include_retried
+        if last_id:
+            params["last_id"] = last_id
+
+        for page in iter_pages(self.get, "attempts", "attempts", params, page_size):
+            for attempt in page:
+                yield Attempt.from_api_repr(**attempt)
+
     @overload
     def attempt(
         self, attempt: int | Attempt, inplace: Literal[False] = False
@@ -566,6 +739,22 @@ class AttemptAPI:
         res = [Task.from_api_repr(**task) for task in r["tasks"]] if r else []
         return res
 
+    def iter_attempt_tasks(self, attempt: int | Attempt) -> Iterator[Task]:
+        """Iterate tasks of an attempt while the response is received
+
+        Same as :meth:`attempt_tasks` but the response is decoded
+        incrementally, so that a large attempt with thousands of tasks is
+        processed without holding the whole list in memory.
+
+        :param attempt: Attempt id or Attempt object
+        :return: Iterator of :class:`Task`
+        """
+        attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
+        for task in iter_resources(
+            self.get_stream, f"attempts/{attempt_id}/tasks", "tasks"
+        ):
+            yield Task.from_api_repr(**task)
+
     def retried_attempts(self, attempt: int | Attempt) -> list[Attempt]:
         """Get retried attempt list
 
@@ -652,12 +841,16 @@ class AttemptAPI:
         :return: Latest status of Attempt
         :rtype: Attempt
         """
-        if isinstance(attempt, int):
-            attempt = self.attempt(attempt)
+        attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
+        with tracing.span(
+            "tdworkflow.wait_attempt", {"tdworkflow.attempt.id": attempt_id}
+        ):
+            if isinstance(attempt, int):
+                attempt = self.attempt(attempt)
 
-        while not attempt.done:
-            time.sleep(wait_interval)
-            self.attempt(attempt, inplace=True)
+            while not attempt.done:
+                time.sleep(wait_interval)
+                self.attempt(attempt, inplace=True)
 
         return attempt
 
@@ -790,7 +983,7 @@ class ScheduleAPI:
             raise ValueError(f"Unable to skip schedule id: {schedule_id}")
 
 
-class SessionAPI:
+class SessionAPI(_StreamAPI):
     get: Callable[[str, DefaultArg(Params, "params"), DefaultArg(bool, "content")], Any]
 
     def sessions(
@@ -814,6 +1007,24 @@ class SessionAPI:
         else:
             return []
 
+    def iter_sessions(
+        self, last_id: int | None = None, page_size: int = 100
+    ) -> Iterator[Session]:
+        """Iterate sessions over all pages
+
+        Each page is decoded incrementally, so that the first session is
+        available before the whole page arrives.
+
+        :param last_id: Start pagination from this id
+        :param page_size: Number of sessions to fetch per request. Default 100
+        :return: Iterator of Session
+        """
+        params: Params = {"last_id": last_id} if last_id else {}
+        for s in iter_streamed_items(
+            self.get_stream, "sessions", "sessions", params, page_size
+        ):
+            yield Session(**s)
+
     def session(self, session: int | Session) -> Session:
         """Get a session
 
@@ -854,10 +1065,11 @@ class SessionAPI:
             return []
 
 
-class LogAPI:
+class LogAPI(_StreamAPI):
     get: Callable[
         [str, DefaultArg(Params, "params"), DefaultArg(bool, "content")], GetResponse
     ]
+    attempt: Callable[[int | Attempt], Attempt]
 
     def log_files(
         self,
@@ -885,23 +1097,111 @@ class LogAPI:
         else:
             return []
 
-    def log_file(self, attempt: Attempt | int, file: LogFile | str) -> bytes | str:
+    @overload
+    def log_file(
+        self,
+        attempt: Attempt | int,
+        file: LogFile | str,
+        mode: Literal["text"] = "text",
+    ) -> str: ...
+
+    @overload
+    def log_file(
+        self,
+        attempt: Attempt | int,
+        file: LogFile | str,
+        mode: Literal["bytes", "gzip"],
+    ) -> bytes: ...
+
+    def log_file(
+        self,
+        attempt: Attempt | int,
+        file: LogFile | str,
+        mode: Literal["text", "bytes", "gzip"] = "text",
+    ) -> bytes | str:
         """Get a log string for an attempt
 
         :param attempt: Target Attempt id or Attempt object
         :param file: LogFile name or LogFile object
-        :return: Log string
+        :param mode: ``"text"`` returns a decoded string, ``"bytes"`` returns
+                     decompressed bytes without decoding, and ``"gzip"``
+                     returns the gzip compressed bytes as served.
+                     Default ``"text"``
+        :return: Log string or bytes
         """
+        if mode not in ("text", "bytes", "gzip"):
+            raise ValueError(f"Unknown mode: {mode}")
 
         attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
         file_name = file.file_name if isinstance(file, LogFile) else file
         r = cast(bytes, self.get(f"logs/{attempt_id}/files/{file_name}", content=True))
-        if r:
+        if not r:
+            raise ValueError(f"Unable to get file: {file_name}")
+
+        if mode == "gzip":
+            return r
+        elif mode == "bytes":
+            return gzip.decompress(r)
+        else:
             gzfile = io.BytesIO(r)
             with gzip.open(gzfile, "rt") as f:
                 return f.read()
-        else:
-            raise ValueError(f"Unable to get file: {file_name}")
+
+    def iter_log_file(
+        self,
+        attempt: Attempt | int,
+        file: LogFile | str,
+        chunk_size: int = 64 * 1024,
+    ) -> Iterator[bytes]:
+        """Stream the gzip compressed bytes of a log file as served
+
+        The log file is never held in memory as a whole, so chunks can be
+        written to storage as they arrive.
+
+        .. code-block:: python
+
+           >>> with open("task.log.gz", "wb") as f:
+           ...     for chunk in client.iter_log_file(attempt, log_file):
+           ...         f.write(chunk)
+
+        :param attempt: Target Attempt id or Attempt object
+        :param file: LogFile name or LogFile object
+        :param chunk_size: Size of chunks in bytes. Default 64 KiB
+        :return: Iterator of gzip compressed chunks
+        """
+        attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
+        file_name = file.file_name if isinstance(file, LogFile) else file
+        with self.get_stream(f"logs/{attempt_id}/files/{file_name}") as r:
+            yield from r.iter_content(chunk_size)
+
+    def download_log_file(
+        self,
+        attempt: Attempt | int,
+        file: LogFile | str,
+        file_path: str,
+        resume: bool = False,
+    ) -> int:
+        """Download a gzip compressed log file as served
+
+        The log is streamed into ``<file_path>.part``, which is renamed to
+        ``file_path`` when complete. A transfer cut off in the middle is
+        resumed with HTTP Range requests if the server supports them.
+
+        :param attempt: Target Attempt id or Attempt object
+        :param file: LogFile name or LogFile object
+        :param file_path: Target file path
+        :param resume: Resume from a ``.part`` file left by a previous call.
+                       Default ``False``
+        :return: Size of the downloaded file
+        """
+        attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
+        file_name = file.file_name if isinstance(file, LogFile) else file
+        return download_file(
+            self.get_stream,
+            f"logs/{attempt_id}/files/{file_name}",
+            file_path,
+            resume=resume,
+        )
 
     def logs(self, attempt: Attempt | int) -> list[bytes | str]:
         """Get log string list for an attempt
@@ -922,13 +1222,74 @@ class LogAPI:
            ...
         """  # noqa
 
-        files = self.log_files(attempt)
-        logs = []
-        for file in files:
-            logs.append(self.log_file(attempt, file))
+        attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
+        with tracing.span("tdworkflow.logs", {"tdworkflow.attempt.id": attempt_id}):
+            files = self.log_files(attempt)
+            logs = []
+            for file in files:
+                logs.append(self.log_file(attempt, file))
 
         return logs
 
+    def follow_logs(
+        self,
+        attempt: Attempt | int,
+        interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> Iterator[str]:
+        """Follow logs of a running attempt like ``tail -f``
+
+        Log files are polled and only files which haven't been seen yet are
+        downloaded. A file is identified by its name and size, and lines of a
+        grown file already yielded are skipped. A trailing line without a
+        newline is held back until it is completed or the attempt is done. The
+        polling interval doubles up to ``max_interval`` while no new log
+        arrives, and is reset when one does. The generator stops after the
+        attempt is done and its remaining logs are yielded.
+
+        .. code-block:: python
+
+           >>> for line in client.follow_logs(attempt):
+           ...     print(line)
+
+        :param attempt: Attempt ID or Attempt object
+        :param interval: Initial polling interval in seconds. Default 1 sec
+        :param max_interval: Maximum polling interval in seconds. Default 30 sec
+        :return: Iterator of log lines without trailing newlines
+        """
+        attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
+        seen: set[tuple[str, int]] = set()
+        line_counts: dict[str, int] = {}
+        # Partial last lines of files, which may be completed by later writes
+        held: dict[str, str] = {}
+        wait = interval
+        while True:
+            done = self.attempt(attempt_id).done
+
+            files = [
+                f
+                for f in self.log_files(attempt_id)
+                if (f.fileName, f.fileSize) not in seen
+            ]
+            files.sort(key=lambda f: (f.fileTime is None, f.fileTime or 0, f.fileName))
+            for file in files:
+                lines = self.log_file(attempt_id, file).splitlines(keepends=True)
+                seen.add((file.fileName, file.fileSize))
+                held.pop(file.fileName, None)
+                if lines and not lines[-1].endswith("\n") and not done:
+                    held[file.fileName] = lines.pop()
+                for line in lines[line_counts.get(file.fileName, 0) :]:
+                    yield line.rstrip("\r\n")
+                line_counts[file.fileName] = len(lines)
+
+            if done:
+                for line in held.values():
+                    yield line.rstrip("\r\n")
+                return
+            wait = interval if files else min(wait * 2, max_interval)
+            logger.debug(f"Waiting {wait} sec for logs of attempt {attempt_id}")
+            time.sleep(wait)
+
 
 class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAPI):
     def __init__(
@@ -939,6 +1300,10 @@ class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAP
         user_agent: str | None = None,
         _session: requests.Session | None = None,
         scheme: str = "https",
+        hooks: list[Hook] | None = None,
+        request_logger: RequestLogger | None = None,
+        cassette: Cassette | None = None,
+        coalesce_gets: bool = False,
     ) -> None:
         """Treasure Workflow REST API client
 
@@ -956,6 +1321,18 @@ class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAP
         :type _session: Optional[requests.Session]
         :param scheme: URI scheme default: "https"
         :type scheme: str
+        :param hooks: Request hooks to be notified of each API call
+        :type hooks: Optional[List[Hook]], optional
+        :param request_logger: Logger for requests and responses. API key is
+                               always redacted.
+        :type request_logger: Optional[RequestLogger], optional
+        :param cassette: Cassette to record traffic to or replay traffic from
+        :type cassette: Optional[Cassette], optional
+        :param coalesce_gets: Share one in-flight request and its decoded result
+                              among concurrent GETs with the same path and
+                              parameters. Shared results must not be mutated.
+                              default: False
+        :type coalesce_gets: bool
         :raises ValueError: If ``site`` is unknown name.
         :raises ValueError: If ``apikey`` is empty and environment variable
                             ``TD_API_KEY`` doesn't exist
@@ -989,10 +1366,25 @@ class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAP
                     "by TD_API_KEY in environment variable."
                 )
 
-        if _session is None:
-            _session = requests.Session()
-            user_agent = user_agent or f"tdworkflow/{tdworkflow.__version__}"
-            _session.headers.update(
+        # The HTTP session is created on the first request, so constructing a
+        # Client doesn't pay for adapters and the package version lookup.
+        self._session: requests.Session | None = _session
+        self._http_session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+        self._user_agent = user_agent
+        self._cassette = cassette
+        self.api_base = f"{scheme}://{self.endpoint}/api/"
+        self.hooks: list[Hook] = list(hooks) if hooks else []
+        self.request_logger = request_logger or RequestLogger(logger=logger)
+        self.request_logger.add_secret(self.apikey)
+        self._single_flight = SingleFlight() if coalesce_gets else None
+
+    def _create_session(self) -> requests.Session:
+        session = self._session
+        if session is None:
+            session = requests.Session()
+            user_agent = self._user_agent or f"tdworkflow/{tdworkflow.__version__}"
+            session.headers.update(
                 {"Authorization": f"TD1 {self.apikey}", "User-Agent": user_agent}
             )
 
@@ -1000,11 +1392,26 @@ class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAP
             total=5, backoff_factor=1, status_forcelist=[500, 502, 503, 504]
         )
 
-        _session.mount("https://", HTTPAdapter(max_retries=retries))
-        _session.mount("http://", HTTPAdapter(max_retries=retries))
+        if self._cassette is not None:
+            adapter = self._cassette.adapter(max_retries=retries)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        else:
+            session.mount("https://", HTTPAdapter(max_retries=retries))
+            session.mount("http://", HTTPAdapter(max_retries=retries))
+        return session
 
-        self._http = _session
-        self.api_base = f"{scheme}://{self.endpoint}/api/"
+    @property
+    def _http(self) -> requests.Session:
+        if self._http_session is None:
+            with self._session_lock:
+                if self._http_session is None:
+                    self._http_session = self._create_session()
+        return self._http_session
+
+    @_http.setter
+    def _http(self, session: requests.Session) -> None:
+        self._http_session = session
 
     @property
     def http(self) -> requests.Session:
@@ -1014,6 +1421,72 @@ class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAP
         """
         return self._http
 
+    def add_hook(self, hook: Hook) -> None:
+        """Register a request hook
+
+        :param hook: Hook to be notified of each API call
+        :type hook: Hook
+        """
+        self.hooks.append(hook)
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        with tracing.request_span(method, path) as span:
+            return self._send(method, path, span, **kwargs)
+
+    def _send(
+        self, method: str, path: str, span: Any, **kwargs: Any
+    ) -> requests.Response:
+        url = f"{self.api_base}{path}"
+        event = None
+        if self.hooks:
+            event = RequestEvent(method.upper(), path, path_template(path))
+            dispatch(self.hooks, "before_request", event)
+
+        start = time.perf_counter()
+        try:
+            r = getattr(self.http, method)(url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            if event:
+                event.duration = time.perf_counter() - start
+                event.error = e
+                dispatch(self.hooks, "on_error", event)
+            raise
+
+        duration = time.perf_counter() - start
+        # Streamed bodies are left unread for the caller
+        stream = kwargs.get("stream", False)
+        if event or span is not None:
+            if stream:
+                response_bytes = int(r.headers.get("Content-Length") or 0)
+            else:
+                response_bytes = len(r.content or b"")
+            retries = _retry_count(r)
+            if event:
+                event.duration = duration
+                event.status = r.status_code
+                event.response_bytes = response_bytes
+                event.retries = retries
+                dispatch(self.hooks, "after_response", event)
+            if span is not None:
+                span.set_attribute("http.response.status_code", r.status_code)
+                span.set_attribute("tdworkflow.response.size", response_bytes)
+                span.set_attribute("tdworkflow.retries", retries)
+
+        ok = 200 <= r.status_code < 300
+        body = None if stream and ok else r.content
+        self.request_logger.log(method, url, r, duration, body=body)
+
+        if not ok:
+            try:
+                exceptions.raise_response_error(r)
+            except exceptions.HttpError as e:
+                if event:
+                    event.error = e
+                    dispatch(self.hooks, "on_error", event)
+                raise
+
+        return r
+
     def get(
         self, path: str, params: Params | None = None, content: bool = False
     ) -> GetResponse:
@@ -1028,12 +1501,41 @@ class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAP
         :return: Response data in JSON or bytes
         :rtype: Union[Dict[str, str], bytes]
         """
-        url = f"{self.api_base}{path}"
-        r = self.http.get(url, params=params)
-        logger.debug(f"{r.status_code!r}\n{r.content!r}")
+        if self._single_flight is None:
+            return self._get(path, params, content)
 
-        if not 200 <= r.status_code < 300:
-            exceptions.raise_response_error(r)
+        key = (path, tuple(sorted((params or {}).items())), content)
+        return self._single_flight.do(key, lambda: self._get(path, params, content))
+
+    def get_stream(
+        self,
+        path: str,
+        params: Params | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        """GET operator returning a response whose body is not read yet
+
+        Use the response as a context manager to release the connection.
+
+        .. code-block:: python
+
+           >>> with client.get_stream("logs/1234/files/task.log.gz") as r:
+           ...     for chunk in r.iter_content(65536):
+           ...         ...
+
+        :param path: Treasure Workflow API path
+        :type path: str
+        :param params: Query parameters, defaults to None
+        :type params: Optional[Dict[str, Union[str, bool, int, None]]], optional
+        :param headers: Additional request headers e.g. ``Range``, defaults to None
+        :type headers: Optional[Dict[str, str]], optional
+        :return: Streamed response
+        :rtype: requests.Response
+        """
+        return self._request("get", path, params=params, headers=headers, stream=True)
+
+    def _get(self, path: str, params: Params | None, content: bool) -> GetResponse:
+        r = self._request("get", path, params=params)
 
         if content:
             return r.content
@@ -1053,12 +1555,7 @@ class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAP
         :type content: bool
         :return: ``True`` if succeeded
         """
-        url = f"{self.api_base}{path}"
-        r = self.http.post(url, json=body)
-        logger.debug(f"{r.status_code!r}\n{r.content!r}")
-
-        if not 200 <= r.status_code < 300:
-            exceptions.raise_response_error(r)
+        r = self._request("post", path, json=body)
 
         if content:
             return r.content
@@ -1087,7 +1584,6 @@ class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAP
         :return: Response content
         :rtype: Dict[str,str]
         """
-        url = f"{self.api_base}{path}"
         headers = {}
         if _json:
             headers["Content-Type"] = "application/json"
@@ -1095,11 +1591,7 @@ class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAP
         if not _json and data and hasattr(data, "read"):
             headers["Content-Type"] = "application/gzip"
 
-        r = self.http.put(url, data=data, headers=headers, params=params)
-        logger.debug(f"{r.status_code!r}\n{r.content!r}")
-
-        if not 200 <= r.status_code < 300:
-            exceptions.raise_response_error(r)
+        r = self._request("put", path, data=data, headers=headers, params=params)
 
         if r.content and "application/json" in r.headers.get("Content-Type", ""):
             return cast(dict[str, str], r.json())
@@ -1116,13 +1608,7 @@ class Client(AttemptAPI, WorkflowAPI, ProjectAPI, ScheduleAPI, SessionAPI, LogAP
         :return: ``True`` if succeeded
         :rtype: bool
         """
-        url = f"{self.api_base}{path}"
-
-        r = self.http.delete(url, params=params)
-        logger.debug(f"{r.status_code!r}\n{r.content!r}")
-
-        if not 200 <= r.status_code < 300:
-            exceptions.raise_response_error(r)
+        r = self._request("delete", path, params=params)
 
         if r.content and "application/json" in r.headers.get("Content-Type", ""):
             return cast(dict[str, str], r.json())
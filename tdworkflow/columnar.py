@@ -0,0 +1,353 @@
+import dataclasses
+import json
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Literal, cast
+
+from .attempt import Attempt
+from .pagination import Page, iter_pages
+from .project import Project
+from .util import parse_iso8601
+from .workflow import Workflow
+
+if TYPE_CHECKING:
+    from .client import Client
+
+ColumnKind = Literal["int", "str", "bool", "timestamp", "int_list", "json"]
+ResourceName = Literal["attempts", "sessions", "schedules", "tasks"]
+
+
+@dataclasses.dataclass(frozen=True)
+class Column:
+    """A column extracted from resources in API representation
+
+    :param name: Column name
+    :param path: Keys to the value e.g. ``("project", "name")``
+    :param kind: Type of the column
+    """
+
+    name: str
+    path: tuple[str, ...]
+    kind: ColumnKind = "str"
+
+
+def _columns(*specs: tuple[str, ColumnKind]) -> tuple[Column, ...]:
+    return tuple(Column(name, tuple(name.split(".")), kind) for name, kind in specs)
+
+
+_PROJECT_WORKFLOW: tuple[tuple[str, ColumnKind], ...] = (
+    ("project.id", "int"),
+    ("project.name", "str"),
+    ("workflow.id", "int"),
+    ("workflow.name", "str"),
+)
+
+COLUMNS: dict[ResourceName, tuple[Column, ...]] = {
+    "attempts": _columns(
+        ("id", "int"),
+        *_PROJECT_WORKFLOW,
+        ("sessionId", "int"),
+        ("sessionUuid", "str"),
+        ("sessionTime", "timestamp"),
+        ("index", "int"),
+        ("retryAttemptName", "str"),
+        ("status", "str"),
+        ("done", "bool"),
+        ("success", "bool"),
+        ("cancelRequested", "bool"),
+        ("createdAt", "timestamp"),
+        ("finishedAt", "timestamp"),
+        ("params", "json"),
+    ),
+    "sessions": _columns(
+        ("id", "int"),
+        *_PROJECT_WORKFLOW,
+        ("sessionUuid", "str"),
+        ("sessionTime", "timestamp"),
+        ("lastAttempt.id", "int"),
+        ("lastAttempt.status", "str"),
+        ("lastAttempt.done", "bool"),
+        ("lastAttempt.success", "bool"),
+        ("lastAttempt.createdAt", "timestamp"),
+        ("lastAttempt.finishedAt", "timestamp"),
+    ),
+    "schedules": _columns(
+        ("id", "int"),
+        *_PROJECT_WORKFLOW,
+        ("createdAt", "timestamp"),
+        ("updatedAt", "timestamp"),
+        ("disabledAt", "timestamp"),
+        ("nextRunTime", "timestamp"),
+        ("nextScheduleTime", "timestamp"),
+    ),
+    "tasks": _columns(
+        ("attemptId", "int"),
+        ("id", "int"),
+        ("fullName", "str"),
+        ("parentId", "int"),
+        ("upstreams", "int_list"),
+        ("state", "str"),
+        ("isGroup", "bool"),
+        ("cancelRequested", "bool"),
+        ("startedAt", "timestamp"),
+        ("updatedAt", "timestamp"),
+        ("retryAt", "timestamp"),
+        ("error", "json"),
+    ),
+}
+
+
+def _to_int(value: Any) -> int | None:
+    return int(value) if value is not None and value != "" else None
+
+
+def _to_json(value: Any) -> str | None:
+    return json.dumps(value) if value is not None else None
+
+
+_CONVERTERS: dict[ColumnKind, Callable[[Any], Any]] = {
+    "int": _to_int,
+    "str": lambda v: v if v is None else str(v),
+    "bool": lambda v: v if v is None else bool(v),
+    "timestamp": parse_iso8601,
+    "int_list": lambda v: [int(i) for i in v] if v is not None else None,
+    "json": _to_json,
+}
+
+
+def _dig(value: Any, path: tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow  # ty: ignore[unresolved-import]
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required. Install it with `pip install tdworkflow[arrow]`"
+        ) from e
+    return pyarrow
+
+
+def _import_pandas() -> Any:
+    try:
+        import pandas  # ty: ignore[unresolved-import]
+    except ImportError as e:
+        raise ImportError(
+            "pandas is required. Install it with `pip install tdworkflow[pandas]`"
+        ) from e
+    return pandas
+
+
+class ColumnBuffer:
+    """Column-oriented buffer of resources in API representation
+
+    Values are appended to a list per column as each page arrives, so no
+    :class:`tdworkflow.resource.Resource` object is built per row. Timestamps
+    are parsed into timezone aware ``datetime`` so that they become typed
+    timestamp columns.
+
+    .. code-block:: python
+
+       >>> buffer = ColumnBuffer("attempts")
+       >>> for page in iter_pages(client.get, "attempts", "attempts", page_size=100):
+       ...     buffer.extend(page)
+       >>> table = buffer.to_arrow()
+
+    :param resource: One of ``attempts``, ``sessions``, ``schedules`` or ``tasks``
+    :param columns: Columns to extract. Default :data:`COLUMNS` of the resource
+    """
+
+    def __init__(
+        self, resource: ResourceName, columns: Iterable[Column] | None = None
+    ) -> None:
+        if resource not in COLUMNS:
+            raise ValueError(f"Unsupported resource: {resource}")
+        self.resource = resource
+        self.columns = tuple(columns) if columns is not None else COLUMNS[resource]
+        self.data: dict[str, list[Any]] = {c.name: [] for c in self.columns}
+
+    def __len__(self) -> int:
+        return len(self.data[self.columns[0].name]) if self.columns else 0
+
+    def extend(self, items: Iterable[dict[str, Any]], **extra: Any) -> None:
+        """Append resources in API representation
+
+        Values are extracted column by column, which keeps the inner loop to a
+        single lookup and conversion per value.
+
+        :param items: Resources in dictionary as returned by the API
+        :param extra: Values of columns missing in items e.g. ``attemptId``
+        """
+        items = items if isinstance(items, list) else list(items)
+        for c in self.columns:
+            values = self.data[c.name]
+            convert = _CONVERTERS[c.kind]
+            if c.name in extra:
+                values.extend([convert(extra[c.name])] * len(items))
+            elif len(c.path) == 1:
+                key = c.path[0]
+                values.extend([convert(item.get(key)) for item in items])
+            else:
+                head, rest = c.path[0], c.path[1:]
+                values.extend([convert(_dig(item.get(head), rest)) for item in items])
+
+    def clear(self) -> None:
+        for values in self.data.values():
+            values.clear()
+
+    def arrow_schema(self) -> Any:
+        pa = _import_pyarrow()
+        types = {
+            "int": pa.int64(),
+            "str": pa.string(),
+            "bool": pa.bool_(),
+            "timestamp": pa.timestamp("us", tz="UTC"),
+            "int_list": pa.list_(pa.int64()),
+            "json": pa.string(),
+        }
+        return pa.schema([(c.name, types[c.kind]) for c in self.columns])
+
+    def to_arrow(self) -> Any:
+        """Build a ``pyarrow.Table`` with typed columns"""
+        pa = _import_pyarrow()
+        schema = self.arrow_schema()
+        arrays = [pa.array(self.data[field.name], type=field.type) for field in schema]
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def to_pandas(self) -> Any:
+        """Build a ``pandas.DataFrame`` with ``datetime64`` timestamp columns"""
+        pd = _import_pandas()
+        df = pd.DataFrame(self.data, columns=[c.name for c in self.columns])
+        for c in self.columns:
+            if c.kind == "timestamp":
+                df[c.name] = pd.to_datetime(df[c.name], utc=True)
+            elif c.kind == "int":
+                df[c.name] = df[c.name].astype("Int64")
+        return df
+
+
+def _attempt_params(
+    project: str | Project | None,
+    workflow: str | Workflow | None,
+    include_retried: bool | None,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+    if project:
+        params["project"] = project.name if isinstance(project, Project) else project
+    if workflow:
+        workflow_name = workflow.name if isinstance(workflow, Workflow) else workflow
+        params["workflow"] = workflow_name
+    if include_retried:
+        params["include_retried"] = include_retried
+    return params
+
+
+def iter_resource_pages(
+    client: "Client",
+    resource: ResourceName,
+    project: str | Project | None = None,
+    workflow: str | Workflow | None = None,
+    include_retried: bool | None = None,
+    attempts: Iterable[int | Attempt] = (),
+    last_id: int | None = None,
+    page_size: int = 100,
+) -> Iterator[tuple[Page, dict[str, Any]]]:
+    """Iterate raw pages of a resource
+
+    :param client: Client
+    :param resource: One of ``attempts``, ``sessions``, ``schedules`` or ``tasks``
+    :param project: Project name or Project object to filter attempts, optional
+    :param workflow: Workflow name or Workflow object to filter attempts, optional
+    :param include_retried: List more than 1 attempts per session. ``project``,
+                            ``workflow`` and ``include_retried`` are only
+                            supported for ``attempts``
+    :param attempts: Attempt IDs or Attempt objects whose tasks are fetched.
+                     Required for ``tasks``
+    :param last_id: Start pagination from this id, optional
+    :param page_size: Number of items per request. Default 100, which is the
+                      maximum of the API by default
+    :return: Iterator of pages and extra column values of the page
+    :raises ValueError: If attempt filters are given for another resource
+    """
+    if resource != "attempts" and (project or workflow or include_retried):
+        raise ValueError(
+            f"project, workflow and include_retried aren't supported for {resource}"
+        )
+    if resource == "tasks":
+        for attempt in attempts:
+            attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
+            r = cast(dict[str, Page] | None, client.get(f"attempts/{attempt_id}/tasks"))
+            if r and r.get("tasks"):
+                yield r["tasks"], {"attemptId": attempt_id}
+        return
+
+    params: dict[str, Any] = {"last_id": last_id} if last_id else {}
+    if resource == "attempts":
+        params.update(_attempt_params(project, workflow, include_retried))
+    elif resource == "schedules":
+        # Schedules API doesn't support page_size
+        for page in iter_pages(client.get, resource, resource, params):
+            yield page, {}
+        return
+    elif resource != "sessions":
+        raise ValueError(f"Unsupported resource: {resource}")
+
+    for page in iter_pages(client.get, resource, resource, params, page_size):
+        yield page, {}
+
+
+def fetch_columns(
+    client: "Client",
+    resource: ResourceName,
+    columns: Iterable[Column] | None = None,
+    limit: int | None = None,
+    **kwargs: Any,
+) -> ColumnBuffer:
+    """Fetch all pages of a resource into a :class:`ColumnBuffer`
+
+    .. code-block:: python
+
+       >>> df = fetch_columns(client, "attempts", project="pandas-df").to_pandas()
+       >>> table = fetch_columns(client, "tasks", attempts=[1234, 1235]).to_arrow()
+
+    :param client: Client
+    :param resource: One of ``attempts``, ``sessions``, ``schedules`` or ``tasks``
+    :param columns: Columns to extract. Default :data:`COLUMNS` of the resource
+    :param limit: Stop after this number of rows, optional
+    :param kwargs: Arguments of :func:`iter_resource_pages`
+    :return: ColumnBuffer
+    """
+    buffer = ColumnBuffer(resource, columns)
+    for page, extra in iter_resource_pages(client, resource, **kwargs):
+        if limit is not None:
+            page = page[: limit - len(buffer)]
+        buffer.extend(page, **extra)
+        if limit is not None and len(buffer) >= limit:
+            break
+    return buffer
+
+
+def to_arrow(client: "Client", resource: ResourceName, **kwargs: Any) -> Any:
+    """Fetch a resource as a ``pyarrow.Table``
+
+    :param client: Client
+    :param resource: One of ``attempts``, ``sessions``, ``schedules`` or ``tasks``
+    :param kwargs: Arguments of :func:`fetch_columns`
+    :return: pyarrow.Table
+    """
+    return fetch_columns(client, resource, **kwargs).to_arrow()
+
+
+def to_pandas(client: "Client", resource: ResourceName, **kwargs: Any) -> Any:
+    """Fetch a resource as a ``pandas.DataFrame``
+
+    :param client: Client
+    :param resource: One of ``attempts``, ``sessions``, ``schedules`` or ``tasks``
+    :param kwargs: Arguments of :func:`fetch_columns`
+    :return: pandas.DataFrame
+    """
+    return fetch_columns(client, resource, **kwargs).to_pandas()
@@ -0,0 +1,313 @@
+import base64
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from typing import IO, Any
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+GetStream = Callable[..., requests.Response]
+
+# Errors after which a transfer is resumed from the last received byte
+_RESUMABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+)
+
+
+class _RangeIgnored(Exception):
+    pass
+
+
+def _content_range(r: requests.Response) -> tuple[int, int | None]:
+    # "bytes 100-199/1000" or "bytes 100-199/*"
+    value = r.headers.get("Content-Range", "")
+    unit, _, spec = value.partition(" ")
+    byte_range, _, total = spec.partition("/")
+    if unit != "bytes" or "-" not in byte_range:
+        raise ValueError(f"Invalid Content-Range: {value!r}")
+    start = int(byte_range.split("-")[0])
+    return start, None if total in ("", "*") else int(total)
+
+
+def md5_file(file_path: str) -> str:
+    """Calculate base64 encoded MD5 of a file like ``archiveMd5`` of projects"""
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            md5.update(chunk)
+    return base64.b64encode(md5.digest()).decode("ascii")
+
+
+class _Transfer:
+    def __init__(
+        self,
+        get_stream: GetStream,
+        path: str,
+        params: dict[str, Any] | None,
+        chunk_size: int,
+        max_retries: int,
+    ) -> None:
+        self.get_stream = get_stream
+        self.path = path
+        self.params = params
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        # ETag or Last-Modified to detect the content changed between requests
+        self.validator: str | None = None
+
+    def open(self, start: int, end: int | None = None) -> requests.Response:
+        headers = {}
+        if start > 0 or end is not None:
+            headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+            if self.validator:
+                headers["If-Range"] = self.validator
+        r = self.get_stream(self.path, params=self.params, headers=headers)
+        if self.validator is None:
+            etag = r.headers.get("ETag")
+            if etag and not etag.startswith("W/"):
+                self.validator = etag
+            else:
+                self.validator = r.headers.get("Last-Modified")
+        return r
+
+    def fetch(
+        self,
+        f: IO[bytes],
+        start: int,
+        end: int | None = None,
+        resumed: bool = False,
+        r: requests.Response | None = None,
+    ) -> int | None:
+        """Write bytes from ``start`` to ``end`` inclusive to ``f``
+
+        A transfer cut off in the middle is resumed with a Range request. When
+        resuming, the last byte already received is requested again and
+        compared, which also avoids 416 for a file already complete.
+
+        :param resumed: ``f`` already has the content before ``start``
+        :return: Total size of the content if known
+        """
+        position = start
+        retries = 0
+        while True:
+            overlap = 1 if position > start or (resumed and position > 0) else 0
+            try:
+                if r is None:
+                    r = self.open(position - overlap, end)
+                with r:
+                    if r.status_code == 206:
+                        range_start, total = _content_range(r)
+                        if range_start != position - overlap:
+                            raise ValueError(
+                                f"Unexpected range from {range_start} for {self.path}"
+                            )
+                    elif position - overlap > 0 or end is not None:
+                        raise _RangeIgnored()
+                    else:
+                        length = r.headers.get("Content-Length")
+                        total = int(length) if length else None
+
+                    chunks = r.iter_content(self.chunk_size)
+                    if overlap:
+                        f.seek(position - 1)
+                        first = next(chunks, b"")
+                        if first[:1] != f.read(1):
+                            raise ValueError(f"Content of {self.path} has changed")
+                        chunks = itertools.chain([first[1:]], chunks)
+                    f.seek(position)
+                    for chunk in chunks:
+                        f.write(chunk)
+                        position += len(chunk)
+                    return total
+            except _RESUMABLE_ERRORS as e:
+                retries += 1
+                if retries > self.max_retries:
+                    raise
+                logger.warning(
+                    f"Resuming download of {self.path} from {position} bytes "
+                    f"({retries}/{self.max_retries}): {e}"
+                )
+                r = None
+
+
+class _PartState:
+    """Completed ranges of a parallel download kept next to the partial file"""
+
+    def __init__(self, path: str, size: int, part_size: int, validator: str | None):
+        self.path = path
+        self.size = size
+        self.part_size = part_size
+        self.validator = validator
+        self.done: set[int] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, size: int, part_size: int) -> "_PartState | None":
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("size") != size or state.get("part_size") != part_size:
+            return None
+        part_state = cls(path, size, part_size, state.get("validator"))
+        part_state.done = set(state.get("done", []))
+        return part_state
+
+    def mark_done(self, index: int) -> None:
+        with self._lock:
+            self.done.add(index)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(
+                    {
+                        "size": self.size,
+                        "part_size": self.part_size,
+                        "validator": self.validator,
+                        "done": sorted(self.done),
+                    },
+                    f,
+                )
+            os.replace(tmp_path, self.path)
+
+
+def download_file(
+    get_stream: GetStream,
+    path: str,
+    file_path: str,
+    params: dict[str, Any] | None = None,
+    resume: bool = False,
+    parallel: int = 1,
+    md5: str | None = None,
+    part_size: int = 64 * 1024 * 1024,
+    chunk_size: int = 1024 * 1024,
+    max_retries: int = 5,
+) -> int:
+    """Download a response body into a file with HTTP Range resumes
+
+    The body is written to ``<file_path>.part`` and renamed to ``file_path``
+    once its size, and MD5 if given, are verified. A transfer cut off in the
+    middle is resumed from the last received byte with a Range request, and
+    with ``resume=True`` a ``.part`` file left by a previous call is resumed
+    too. Servers ignoring Range are downloaded from the start.
+
+    With ``parallel`` greater than 1, ranges of ``part_size`` bytes are
+    downloaded concurrently. Completed ranges are recorded in
+    ``<file_path>.part.json`` so that a resumed download skips them.
+
+    :param get_stream: Function sending a streamed GET request with ``params``
+                       and ``headers`` e.g. :meth:`Client.get_stream`
+    :param path: Treasure Workflow API path
+    :param file_path: Target file path
+    :param params: Query parameters, optional
+    :param resume: Resume from a ``.part`` file of a previous call. Default
+                   ``False``
+    :param parallel: Number of concurrent range requests. Default 1
+    :param md5: Expected base64 encoded MD5 of the content, optional
+    :param part_size: Size of a range in a parallel download. Default 64 MiB
+    :param chunk_size: Size of chunks to read. Default 1 MiB
+    :param max_retries: Maximum number of resumes of a range. Default 5
+    :return: Size of the downloaded file
+    :raises ValueError: If the downloaded file can't be verified
+    """
+    part_path = f"{file_path}.part"
+    state_path = f"{part_path}.json"
+    transfer = _Transfer(get_stream, path, params, chunk_size, max_retries)
+
+    if parallel > 1:
+        total = _download_parallel(
+            transfer, part_path, state_path, resume, parallel, part_size
+        )
+    else:
+        if not resume and os.path.exists(part_path):
+            os.remove(part_path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        total = _download_single(transfer, part_path)
+
+    size = os.path.getsize(part_path)
+    if (total is not None and size != total) or (md5 and md5_file(part_path) != md5):
+        os.remove(part_path)
+        raise ValueError(f"Downloaded file of {path} is incomplete or corrupted")
+
+    os.replace(part_path, file_path)
+    logger.debug(f"Downloaded {size} bytes of {path} to {file_path}")
+    return size
+
+
+def _download_single(transfer: _Transfer, part_path: str) -> int | None:
+    mode = "r+b" if os.path.exists(part_path) else "w+b"
+    with open(part_path, mode) as f:
+        start = f.seek(0, os.SEEK_END)
+        try:
+            total = transfer.fetch(f, start, resumed=True)
+        except _RangeIgnored:
+            logger.info(f"Server ignored Range for {transfer.path}. Restarting")
+            f.seek(0)
+            f.truncate()
+            total = transfer.fetch(f, 0)
+        f.truncate()
+    return total
+
+
+def _download_parallel(
+    transfer: _Transfer,
+    part_path: str,
+    state_path: str,
+    resume: bool,
+    parallel: int,
+    part_size: int,
+) -> int | None:
+    # Probe the size and Range support with the first byte
+    probe = transfer.open(0, 0)
+    if probe.status_code != 206:
+        logger.info(f"Server doesn't support Range for {transfer.path}")
+        with open(part_path, "w+b") as f:
+            return transfer.fetch(f, 0, r=probe)
+    probe.close()
+    _, total = _content_range(probe)
+    if total is None:
+        raise ValueError(f"Unknown size of {transfer.path}")
+
+    state = None
+    if resume and os.path.exists(part_path):
+        state = _PartState.load(state_path, total, part_size)
+        if state is not None and state.validator != transfer.validator:
+            state = None
+    if state is None:
+        state = _PartState(state_path, total, part_size, transfer.validator)
+        with open(part_path, "wb") as f:
+            f.truncate(total)
+
+    def fetch(index: int) -> None:
+        start = index * part_size
+        end = min(total, start + part_size) - 1
+        with open(part_path, "r+b") as f:
+            try:
+                transfer.fetch(f, start, end)
+            except _RangeIgnored:
+                raise ValueError(f"Content of {transfer.path} has changed") from None
+        state.mark_done(index)
+
+    n_parts = (total + part_size - 1) // part_size
+    todo = [i for i in range(n_parts) if i not in state.done]
+    logger.debug(
+        f"Downloading {len(todo)}/{n_parts} ranges of {transfer.path} "
+        f"with {parallel} threads"
+    )
+    with concurrent.futures.ThreadPoolExecutor(parallel) as pool:
+        for future in [pool.submit(fetch, i) for i in todo]:
+            future.result()
+
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    return total
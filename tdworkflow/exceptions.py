@@ -7,6 +7,10 @@ class HttpError(Exception):
     pass
 
 
+class CassetteError(requests.exceptions.RequestException):
+    pass
+
+
 def raise_response_error(r: requests.Response) -> NoReturn | None:
     try:
         r.raise_for_status()
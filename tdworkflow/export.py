@@ -0,0 +1,292 @@
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Literal, Protocol
+
+from .columnar import ColumnBuffer, ResourceName, _import_pyarrow, iter_resource_pages
+from .pagination import Page
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["jsonl", "parquet"]
+RESOURCES: tuple[ResourceName, ...] = ("attempts", "sessions", "schedules", "tasks")
+
+
+class Checkpoint:
+    """Progress of an export persisted in a JSON file
+
+    Each resource has ``last_id`` of the last exported page, ``rows`` and the
+    position of its output, i.e. ``offset`` of a JSON Lines file or ``part``
+    number of Parquet files. It is updated only after the output is flushed,
+    so a resumed export neither loses nor duplicates records.
+
+    :param path: JSON file path. The checkpoint is kept in memory if ``None``
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.resources: dict[str, dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.resources = json.load(f).get("resources", {})
+
+    def get(self, resource: str) -> dict[str, Any]:
+        with self._lock:
+            return dict(self.resources.get(resource, {}))
+
+    def update(self, resource: str, **state: Any) -> None:
+        with self._lock:
+            self.resources.setdefault(resource, {}).update(state)
+            if not self.path:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"resources": self.resources}, f)
+            os.replace(tmp_path, self.path)
+
+
+class Writer(Protocol):
+    def write(self, records: Page, extra: dict[str, Any]) -> None: ...
+
+    def ready(self) -> bool: ...
+
+    def commit(self) -> dict[str, Any]: ...
+
+    def close(self) -> None: ...
+
+
+class JsonLinesWriter:
+    """Append records to ``<resource>.jsonl``
+
+    The file is truncated to the checkpointed ``offset`` on resume.
+    """
+
+    def __init__(
+        self, directory: str, resource: ResourceName, state: dict[str, Any]
+    ) -> None:
+        self.path = os.path.join(directory, f"{resource}.jsonl")
+        self._file = open(self.path, "ab")
+        self._file.truncate(state.get("offset", 0))
+        self._file.seek(0, os.SEEK_END)
+
+    def write(self, records: Page, extra: dict[str, Any]) -> None:
+        lines = [
+            json.dumps({**extra, **r} if extra else r, separators=(",", ":"))
+            for r in records
+        ]
+        if lines:
+            self._file.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+    def ready(self) -> bool:
+        return True
+
+    def commit(self) -> dict[str, Any]:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {"offset": self._file.tell()}
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """Write records to ``<resource>/part-NNNNN.parquet`` files
+
+    Records are buffered in a :class:`tdworkflow.columnar.ColumnBuffer` and
+    written as a part file every ``rows_per_file`` rows, so memory usage is
+    bounded by ``rows_per_file``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        resource: ResourceName,
+        state: dict[str, Any],
+        rows_per_file: int = 100_000,
+    ) -> None:
+        _import_pyarrow()
+        import pyarrow.parquet  # ty: ignore[unresolved-import]
+
+        self._parquet = pyarrow.parquet
+        self.directory = os.path.join(directory, resource)
+        os.makedirs(self.directory, exist_ok=True)
+        self.part = state.get("part", 0)
+        self.rows_per_file = rows_per_file
+        self.buffer = ColumnBuffer(resource)
+
+    def write(self, records: Page, extra: dict[str, Any]) -> None:
+        self.buffer.extend(records, **extra)
+
+    def ready(self) -> bool:
+        return len(self.buffer) >= self.rows_per_file
+
+    def commit(self) -> dict[str, Any]:
+        if len(self.buffer):
+            path = os.path.join(self.directory, f"part-{self.part:05d}.parquet")
+            self._parquet.write_table(self.buffer.to_arrow(), path)
+            self.buffer.clear()
+            self.part += 1
+        return {"part": self.part}
+
+    def close(self) -> None:
+        self.buffer.clear()
+
+
+def _iter_pages(
+    client: "Client",
+    resource: ResourceName,
+    last_id: int | None,
+    concurrency: int,
+    **filters: Any,
+) -> Iterator[tuple[Page, dict[str, Any], Any]]:
+    """Iterate pages with extra column values and the pagination cursor
+
+    Tasks are exported by walking attempts, and fetched concurrently for the
+    attempts of each page. The cursor of tasks is the id of the attempt.
+    """
+    if resource != "tasks":
+        for page, extra in iter_resource_pages(
+            client, resource, last_id=last_id, **filters
+        ):
+            yield page, extra, int(page[-1]["id"])
+        return
+
+    def fetch(attempt_id: int) -> list[tuple[Page, dict[str, Any]]]:
+        return list(iter_resource_pages(client, "tasks", attempts=[attempt_id]))
+
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+        for attempts, _ in iter_resource_pages(
+            client, "attempts", last_id=last_id, **filters
+        ):
+            ids = [int(a["id"]) for a in attempts]
+            for attempt_id, pages in zip(ids, pool.map(fetch, ids)):
+                for page, extra in pages:
+                    yield page, extra, None
+                # Advance the cursor after all tasks of the attempt
+                yield [], {}, attempt_id
+
+
+def export_resource(
+    client: "Client",
+    resource: ResourceName,
+    output_dir: str,
+    format: ExportFormat = "jsonl",
+    checkpoint: Checkpoint | None = None,
+    concurrency: int = 4,
+    rows_per_file: int = 100_000,
+    **filters: Any,
+) -> int:
+    """Export all records of a resource
+
+    It resumes from the checkpoint if the resource isn't done yet.
+
+    :param client: Client
+    :param resource: One of ``attempts``, ``sessions``, ``schedules`` or ``tasks``
+    :param output_dir: Output directory
+    :param format: ``jsonl`` or ``parquet``. Default ``jsonl``
+    :param checkpoint: Checkpoint to resume from and update, optional
+    :param concurrency: Number of concurrent requests for tasks. Default 4
+    :param rows_per_file: Number of rows per Parquet file. Default 100,000
+    :param filters: ``project``, ``workflow``, ``include_retried`` and
+                    ``page_size`` passed to
+                    :func:`tdworkflow.columnar.iter_resource_pages`. Sessions
+                    only use ``page_size`` and schedules use none of them
+    :return: Number of rows exported in total
+    """
+    checkpoint = checkpoint or Checkpoint()
+    state = checkpoint.get(resource)
+    rows = state.get("rows", 0)
+    if state.get("done"):
+        logger.info(f"Skipped {resource}: already exported {rows} rows")
+        return rows
+
+    os.makedirs(output_dir, exist_ok=True)
+    writer: Writer
+    if format == "jsonl":
+        writer = JsonLinesWriter(output_dir, resource, state)
+    elif format == "parquet":
+        writer = ParquetWriter(output_dir, resource, state, rows_per_file)
+    else:
+        raise ValueError(f"Unsupported format: {format}")
+
+    # Only attempts and tasks are filtered
+    if resource == "schedules":
+        filters = {}
+    elif resource == "sessions":
+        filters = {k: v for k, v in filters.items() if k == "page_size"}
+    cursor = state.get("last_id")
+    try:
+        pages = _iter_pages(client, resource, cursor, concurrency, **filters)
+        for page, extra, page_cursor in pages:
+            writer.write(page, extra)
+            rows += len(page)
+            cursor = page_cursor if page_cursor is not None else cursor
+            if page_cursor is not None and writer.ready():
+                checkpoint.update(
+                    resource, last_id=cursor, rows=rows, **writer.commit()
+                )
+                logger.info(f"Exported {rows} {resource}")
+        checkpoint.update(
+            resource, last_id=cursor, rows=rows, done=True, **writer.commit()
+        )
+    finally:
+        writer.close()
+
+    logger.info(f"Finished exporting {rows} {resource}")
+    return rows
+
+
+def export(
+    client: "Client",
+    output_dir: str,
+    resources: Iterable[ResourceName] = RESOURCES,
+    format: ExportFormat = "jsonl",
+    checkpoint_path: str | None = None,
+    concurrency: int = 4,
+    **kwargs: Any,
+) -> dict[str, int]:
+    """Export workflow history, running resources concurrently
+
+    .. code-block:: python
+
+       >>> export(client, "history", format="parquet",
+       ...        checkpoint_path="history/checkpoint.json")
+
+    :param client: Client
+    :param output_dir: Output directory
+    :param resources: Resources to export. Default all
+    :param format: ``jsonl`` or ``parquet``. Default ``jsonl``
+    :param checkpoint_path: JSON file to resume from, optional
+    :param concurrency: Number of resources exported at the same time.
+                        Default 4
+    :param kwargs: Arguments of :func:`export_resource`
+    :return: Number of rows per resource
+    """
+    checkpoint = Checkpoint(checkpoint_path)
+    resources = list(dict.fromkeys(resources))
+    for resource in resources:
+        if resource not in RESOURCES:
+            raise ValueError(f"Unsupported resource: {resource}")
+
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+        futures = {
+            resource: pool.submit(
+                export_resource,
+                client,
+                resource,
+                output_dir,
+                format,
+                checkpoint,
+                concurrency,
+                **kwargs,
+            )
+            for resource in resources
+        }
+        return {r: f.result() for r, f in futures.items()}
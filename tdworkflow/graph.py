@@ -0,0 +1,241 @@
+import collections
+import heapq
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from .attempt import Attempt
+from .task import Task
+
+if TYPE_CHECKING:
+    from .client import Client
+
+DurationFunc = Callable[[Task], float]
+# Start or finish of a task in critical path computation: (task_id, is_finish)
+_Node = tuple[int, bool]
+
+FAILED_STATES = {"error", "group_error"}
+
+
+def task_duration(task: Task) -> float:
+    """Elapsed seconds from ``startedAt`` to ``updatedAt`` of a task
+
+    :param task: Task
+    :return: Duration in seconds. ``0.0`` if the task hasn't started.
+    """
+    if task.startedAt and task.updatedAt:
+        return max(0.0, (task.updatedAt - task.startedAt).total_seconds())
+    return 0.0
+
+
+class TaskGraph:
+    """Indexed DAG of tasks built from ``parentId`` and ``upstreams``
+
+    Indexes by id, full name, parent and state are built in one pass, so
+    lookups are O(1) and traversals are O(n + e).
+
+    Digdag starts a task after its upstream sibling tasks, including all of
+    their descendants, finish, and starts children of a group when the group
+    starts. A group finishes when all of its children finish.
+
+    .. code-block:: python
+
+       >>> graph = TaskGraph.from_attempt(client, attempt)
+       >>> graph.failed_leaves()
+       >>> [t.fullName for t in graph.critical_path()]
+
+    :param tasks: Tasks of an attempt
+    """
+
+    def __init__(self, tasks: Iterable[Task]) -> None:
+        self.by_id: dict[int, Task] = {}
+        self.by_name: dict[str, Task] = {}
+        self.children: dict[int, list[int]] = collections.defaultdict(list)
+        self.downstreams: dict[int, list[int]] = collections.defaultdict(list)
+        self.by_state: dict[str, list[int]] = collections.defaultdict(list)
+        self.roots: list[int] = []
+
+        for task in tasks:
+            self.by_id[task.id] = task
+            self.by_name[task.fullName] = task
+            self.by_state[task.state].append(task.id)
+            if task.parentId is None:
+                self.roots.append(task.id)
+            else:
+                self.children[task.parentId].append(task.id)
+            for upstream in task.upstreams or []:
+                self.downstreams[upstream].append(task.id)
+
+    @classmethod
+    def from_attempt(cls, client: "Client", attempt: int | Attempt) -> "TaskGraph":
+        """Build a graph from tasks of an attempt
+
+        :param client: Client
+        :param attempt: Attempt ID or Attempt object
+        :return: TaskGraph
+        """
+        return cls(client.attempt_tasks(attempt))
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self.by_id
+
+    def __getitem__(self, task_id: int) -> Task:
+        return self.by_id[task_id]
+
+    def find(self, full_name: str) -> Task | None:
+        """Find a task by full name e.g. ``+workflow+task``"""
+        return self.by_name.get(full_name)
+
+    def parent(self, task_id: int) -> Task | None:
+        parent_id = self.by_id[task_id].parentId
+        return self.by_id.get(parent_id) if parent_id is not None else None
+
+    def children_of(self, task_id: int) -> list[Task]:
+        return [self.by_id[i] for i in self.children.get(task_id, [])]
+
+    def upstreams_of(self, task_id: int) -> list[Task]:
+        upstreams = self.by_id[task_id].upstreams or []
+        return [self.by_id[i] for i in upstreams if i in self.by_id]
+
+    def downstreams_of(self, task_id: int) -> list[Task]:
+        return [self.by_id[i] for i in self.downstreams.get(task_id, [])]
+
+    def with_state(self, *states: str) -> list[Task]:
+        """Tasks in any of the given states"""
+        return [self.by_id[i] for s in states for i in self.by_state.get(s, [])]
+
+    def iter_subtree(self, task_id: int) -> Iterator[Task]:
+        """Iterate a task and its descendants in depth-first order"""
+        stack = [task_id]
+        while stack:
+            current = stack.pop()
+            yield self.by_id[current]
+            stack.extend(reversed(self.children.get(current, [])))
+
+    def subtree(self, task_id: int) -> list[Task]:
+        return list(self.iter_subtree(task_id))
+
+    def leaves(self) -> list[Task]:
+        """Tasks without children"""
+        return [t for t in self.by_id.values() if not self.children.get(t.id)]
+
+    def failed_leaves(self) -> list[Task]:
+        """Failed tasks without failed children, i.e. root causes of errors"""
+        failed = []
+        for task in self.with_state(*FAILED_STATES):
+            children = self.children.get(task.id, [])
+            if not any(self.by_id[c].state in FAILED_STATES for c in children):
+                failed.append(task)
+        return failed
+
+    def topological_order(self) -> list[Task]:
+        """Sort tasks so that parents and upstreams come first
+
+        :raises ValueError: If dependencies have a cycle
+        :return: List of Task
+        """
+        in_degree = dict.fromkeys(self.by_id, 0)
+        for task in self.by_id.values():
+            if task.parentId in self.by_id:
+                in_degree[task.id] += 1
+            in_degree[task.id] += sum(1 for u in task.upstreams or [] if u in in_degree)
+
+        queue = collections.deque(i for i, d in in_degree.items() if d == 0)
+        order = []
+        while queue:
+            task_id = queue.popleft()
+            order.append(self.by_id[task_id])
+            for next_id in (
+                *self.children.get(task_id, []),
+                *self.downstreams.get(task_id, []),
+            ):
+                in_degree[next_id] -= 1
+                if in_degree[next_id] == 0:
+                    queue.append(next_id)
+
+        if len(order) != len(self.by_id):
+            raise ValueError("Task dependencies have a cycle")
+        return order
+
+    def critical_path(self, duration: DurationFunc = task_duration) -> list[Task]:
+        """Find the chain of non-group tasks determining the total duration
+
+        Each task is modeled as a start node and a finish node. A task starts
+        after its parent starts and its upstreams finish, and a group finishes
+        after its children finish. The longest path weighted by durations of
+        non-group tasks is computed over the nodes in topological order.
+
+        :param duration: Function returning duration of a task in seconds.
+                         Default :func:`task_duration`
+        :raises ValueError: If dependencies have a cycle
+        :return: Tasks on the critical path in execution order
+        """
+        edges: dict[_Node, list[tuple[_Node, float]]] = collections.defaultdict(list)
+        in_degree: dict[_Node, int] = {}
+
+        def add_edge(src: _Node, dst: _Node, weight: float) -> None:
+            edges[src].append((dst, weight))
+            in_degree[dst] = in_degree.get(dst, 0) + 1
+
+        for task in self.by_id.values():
+            start, finish = (task.id, False), (task.id, True)
+            in_degree.setdefault(start, 0)
+            is_leaf = not self.children.get(task.id)
+            add_edge(start, finish, duration(task) if is_leaf else 0.0)
+            if task.parentId is not None and task.parentId in self.by_id:
+                add_edge((task.parentId, False), start, 0.0)
+                add_edge(finish, (task.parentId, True), 0.0)
+            for upstream in task.upstreams or []:
+                if upstream in self.by_id:
+                    add_edge((upstream, True), start, 0.0)
+
+        distance = dict.fromkeys(in_degree, 0.0)
+        previous: dict[_Node, _Node] = {}
+        queue = collections.deque(n for n, d in in_degree.items() if d == 0)
+        visited = 0
+        while queue:
+            node = queue.popleft()
+            visited += 1
+            for next_node, weight in edges.get(node, []):
+                if distance[node] + weight > distance[next_node] or (
+                    next_node not in previous
+                ):
+                    distance[next_node] = distance[node] + weight
+                    previous[next_node] = node
+                in_degree[next_node] -= 1
+                if in_degree[next_node] == 0:
+                    queue.append(next_node)
+
+        if visited != len(distance):
+            raise ValueError("Task dependencies have a cycle")
+        if not distance:
+            return []
+
+        current: _Node | None = max(distance, key=lambda n: distance[n])
+        path = []
+        while current is not None:
+            pred = previous.get(current)
+            task_id, is_finish = current
+            if (
+                is_finish
+                and pred == (task_id, False)
+                and not self.children.get(task_id)
+            ):
+                path.append(self.by_id[task_id])
+            current = pred
+        path.reverse()
+        return path
+
+    def longest_tasks(
+        self, n: int = 10, duration: DurationFunc = task_duration
+    ) -> list[tuple[Task, float]]:
+        """Find non-group tasks with the longest duration
+
+        :param n: Number of tasks to return
+        :param duration: Function returning duration of a task in seconds
+        :return: List of tasks and their durations in descending order
+        """
+        leaves = ((t, duration(t)) for t in self.leaves())
+        return heapq.nlargest(n, leaves, key=lambda e: e[1])
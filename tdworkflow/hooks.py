@@ -0,0 +1,173 @@
+import bisect
+import dataclasses
+import logging
+import re
+import threading
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_NUMERIC_SEGMENT = re.compile(r"^\d+$")
+# Segments following these names are user supplied names rather than ids
+_NAMED_SEGMENTS = {"files", "secrets"}
+
+
+def path_template(path: str) -> str:
+    """Normalize an API path into a template for aggregation
+
+    >>> path_template("attempts/123/tasks")
+    'attempts/{id}/tasks'
+    >>> path_template("logs/123/files/+wf+task@example.log.gz")
+    'logs/{id}/files/{name}'
+
+    :param path: Treasure Workflow API path
+    :return: Path template
+    """
+    segments = path.split("/")
+    templated = []
+    for i, segment in enumerate(segments):
+        if i > 0 and segments[i - 1] in _NAMED_SEGMENTS and segment:
+            templated.append("{name}")
+        elif _NUMERIC_SEGMENT.match(segment):
+            templated.append("{id}")
+        else:
+            templated.append(segment)
+    return "/".join(templated)
+
+
+@dataclasses.dataclass
+class RequestEvent:
+    """An event passed to :class:`Hook` for each API request"""
+
+    method: str
+    path: str
+    path_template: str
+    status: int | None = None
+    response_bytes: int = 0
+    duration: float = 0.0
+    retries: int = 0
+    error: BaseException | None = None
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.method} {self.path_template}"
+
+
+class Hook:
+    """Base class of request hooks
+
+    Override any of the methods and register an instance with
+    :meth:`tdworkflow.client.Client.add_hook`. Exceptions raised by hooks are
+    logged and never interrupt the request.
+    """
+
+    def before_request(self, event: RequestEvent) -> None:
+        """Called before a request is sent"""
+
+    def after_response(self, event: RequestEvent) -> None:
+        """Called when a response is received, including non-2xx responses"""
+
+    def on_error(self, event: RequestEvent) -> None:
+        """Called when a request fails with a connection or HTTP error"""
+
+
+def dispatch(hooks: list[Hook], name: str, event: RequestEvent) -> None:
+    for hook in hooks:
+        try:
+            getattr(hook, name)(event)
+        except Exception:
+            logger.warning(f"Hook {hook!r} failed on {name}", exc_info=True)
+
+
+def _default_bounds() -> list[float]:
+    # Geometric buckets from 1ms to about 17 minutes with ~10% resolution
+    bounds = []
+    bound = 0.001
+    while bound < 1024:
+        bounds.append(bound)
+        bound *= 1.1
+    return bounds
+
+
+class LatencyHistogram(Hook):
+    """In-memory latency histogram per endpoint
+
+    Durations are recorded into fixed geometric buckets, so memory usage
+    doesn't grow with the number of requests. Percentiles are reported as
+    the upper bound of the bucket.
+
+    .. code-block:: python
+
+       >>> histogram = LatencyHistogram()
+       >>> client = Client("us", hooks=[histogram])
+       >>> client.attempts()
+       >>> histogram.report()
+       {'GET attempts': {'count': 1, 'p50': 0.36, 'p95': 0.36, 'p99': 0.36}}
+    """
+
+    def __init__(self, bounds: list[float] | None = None) -> None:
+        self.bounds = sorted(bounds) if bounds else _default_bounds()
+        self._counts: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def after_response(self, event: RequestEvent) -> None:
+        self.observe(event.endpoint, event.duration)
+
+    def on_error(self, event: RequestEvent) -> None:
+        # Responses were already observed in after_response
+        if event.status is None:
+            self.observe(event.endpoint, event.duration)
+
+    def observe(self, endpoint: str, duration: float) -> None:
+        index = bisect.bisect_left(self.bounds, duration)
+        with self._lock:
+            counts = self._counts.get(endpoint)
+            if counts is None:
+                counts = self._counts[endpoint] = [0] * (len(self.bounds) + 1)
+            counts[index] += 1
+
+    def count(self, endpoint: str) -> int:
+        with self._lock:
+            return sum(self._counts.get(endpoint, []))
+
+    def percentile(self, endpoint: str, q: float) -> float | None:
+        """Get a percentile of latency in seconds
+
+        :param endpoint: Endpoint e.g. ``"GET attempts/{id}"``
+        :param q: Percentile in [0, 100]
+        :return: Latency in seconds or ``None`` if nothing was recorded
+        """
+        with self._lock:
+            counts = list(self._counts.get(endpoint, []))
+        total = sum(counts)
+        if total == 0:
+            return None
+
+        rank = max(1, round(total * q / 100))
+        cumulative = 0
+        for i, c in enumerate(counts):
+            cumulative += c
+            if cumulative >= rank:
+                return self.bounds[i] if i < len(self.bounds) else float("inf")
+        return float("inf")
+
+    def report(self) -> dict[str, dict[str, Any]]:
+        """Summarize count, p50, p95 and p99 per endpoint
+
+        :return: Dictionary keyed by endpoint
+        """
+        with self._lock:
+            endpoints = sorted(self._counts)
+        return {
+            endpoint: {
+                "count": self.count(endpoint),
+                "p50": self.percentile(endpoint, 50),
+                "p95": self.percentile(endpoint, 95),
+                "p99": self.percentile(endpoint, 99),
+            }
+            for endpoint in endpoints
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
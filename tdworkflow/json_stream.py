@@ -0,0 +1,150 @@
+import codecs
+import json
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+import requests
+
+_WHITESPACE = " \t\n\r"
+_NUMBER = "-+.0123456789eE"
+
+
+class _Buffer:
+    def __init__(self, chunks: Iterable[bytes | str]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = 1) -> bool:
+        """Read chunks of at least ``size`` characters and drop consumed text
+
+        The text from ``pos`` moves to the start of the buffer, so offsets into
+        the previous buffer are shifted by ``pos``.
+
+        :return: ``False`` if nothing was read at the end of input
+        """
+        if self.eof:
+            return False
+        parts = [self.text[self.pos :]]
+        n = 0
+        for chunk in self._chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._decoder.decode(chunk)
+            parts.append(chunk)
+            n += len(chunk)
+            if n >= size:
+                break
+        else:
+            parts.append(self._decoder.decode(b"", final=True))
+            n += len(parts[-1])
+            self.eof = True
+        self.text = "".join(parts)
+        self.pos = 0
+        return n > 0
+
+    def skip_whitespace(self) -> None:
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text) or not self.fill():
+                return
+
+    def expect(self, chars: str) -> str:
+        self.skip_whitespace()
+        if self.pos >= len(self.text) or self.text[self.pos] not in chars:
+            found = self.text[self.pos : self.pos + 20] or "end of input"
+            raise ValueError(f"Expected {chars!r} in JSON but found {found!r}")
+        self.pos += 1
+        return self.text[self.pos - 1]
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                # The value may be incomplete. Reading as much again as the
+                # pending text keeps retries of a large value linear.
+                if not self.fill(len(self.text) - self.pos):
+                    raise
+                continue
+            # A number may continue in the next chunk e.g. "1" of "1.5"
+            if self.text[self.pos] in _NUMBER and not self._terminated(end):
+                length = end - self.pos
+                if self.fill():
+                    continue
+                end = self.pos + length
+            self.pos = end
+            return value
+
+    def _terminated(self, end: int) -> bool:
+        while end < len(self.text):
+            if self.text[end] not in _NUMBER:
+                return True
+            end += 1
+        return False
+
+
+def iter_json_array(
+    chunks: Iterable[bytes | str], key: str
+) -> Iterator[dict[str, Any]]:
+    """Decode items of an array in a JSON object incrementally
+
+    Items of ``key`` of the top level object are yielded as soon as each of
+    them is received, so only one item and a chunk are held in memory. Other
+    keys before ``key`` are decoded and discarded, and input after the array
+    isn't read.
+
+    >>> list(iter_json_array([b'{"tasks": [{"id"', b': "1"}, {"id": "2"}]}'], "tasks"))
+    [{'id': '1'}, {'id': '2'}]
+
+    :param chunks: Chunks of a UTF-8 JSON document e.g.
+                   ``response.iter_content(65536)``
+    :param key: Key of the array in the top level object
+    :return: Iterator of items
+    """
+    decoder = json.JSONDecoder()
+    buffer = _Buffer(chunks)
+    buffer.expect("{")
+    if buffer.expect('"}') == "}":
+        return
+    buffer.pos -= 1
+    while True:
+        name = buffer.value(decoder)
+        buffer.expect(":")
+        if name != key:
+            buffer.value(decoder)
+        else:
+            buffer.expect("[")
+            buffer.skip_whitespace()
+            if buffer.text[buffer.pos : buffer.pos + 1] == "]":
+                return
+            while True:
+                yield buffer.value(decoder)
+                if buffer.expect(",]") == "]":
+                    return
+        if buffer.expect(",}") == "}":
+            return
+
+
+def iter_resources(
+    get_stream: Callable[..., requests.Response],
+    path: str,
+    key: str,
+    params: dict[str, Any] | None = None,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[dict[str, Any]]:
+    """Request a list API and yield its items while the response is received
+
+    :param get_stream: Streamed GET operator e.g.
+                       :meth:`tdworkflow.client.Client.get_stream`
+    :param path: Treasure Workflow API path e.g. ``attempts/1/tasks``
+    :param key: Key of the list in a response e.g. ``tasks``
+    :param params: Query parameters, optional
+    :param chunk_size: Size of chunks to read. Default 64 KiB
+    :return: Iterator of resources in dictionary
+    """
+    with get_stream(path, params=params) as r:
+        yield from iter_json_array(r.iter_content(chunk_size), key)
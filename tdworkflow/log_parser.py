@@ -0,0 +1,167 @@
+import dataclasses
+import re
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+# 2019-10-30 08:34:51.672 +0000 [INFO] (0250@[1:pandas-df]+pandas-df+read_into_df) io.digdag.core.agent.OperatorManager: message  # noqa: E501
+_LINE = re.compile(
+    r"(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(?:\.\d+)?) ([+-]\d{4}) \[(\w+)\] "
+    r"\((?:([^@)\s]*)@\[(\d+):([^\]]*)\](\S*)|([^)]*))\) "
+    r"([^\s:]+):(?: |$)(.*)"
+)
+
+COLUMNS = (
+    "time",
+    "level",
+    "thread",
+    "site_id",
+    "project",
+    "task",
+    "logger",
+    "message",
+)
+
+LogBatch = dict[str, list[Any]]
+_Fields = tuple[
+    datetime | None,
+    str | None,
+    str | None,
+    int | None,
+    str | None,
+    str | None,
+    str | None,
+    str,
+]
+
+
+@dataclasses.dataclass
+class LogRecord:
+    """A log record of Treasure Workflow
+
+    Lines following a log line which don't start with a timestamp, such as
+    stack traces, are a part of ``message``.
+    """
+
+    time: datetime | None
+    level: str | None
+    thread: str | None
+    site_id: int | None
+    project: str | None
+    task: str | None
+    logger: str | None
+    message: str
+
+
+class _TimeParser:
+    def __init__(self) -> None:
+        # "+0900" -> "+09:00" which datetime.fromisoformat() accepts
+        self._offsets: dict[str, str] = {}
+
+    def __call__(self, local: str, offset: str) -> datetime:
+        iso_offset = self._offsets.get(offset)
+        if iso_offset is None:
+            iso_offset = self._offsets[offset] = f"{offset[:3]}:{offset[3:]}"
+        return datetime.fromisoformat(local + iso_offset)
+
+
+def _iter_fields(lines: Iterable[str]) -> Iterator[_Fields]:
+    parse_time = _TimeParser()
+    match = _LINE.match
+    current: _Fields | None = None
+    continuation: list[str] = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        m = match(line)
+        if m is None:
+            if current is None:
+                # Lines before the first log line
+                current = (None, None, None, None, None, None, None, line)
+            else:
+                continuation.append(line)
+            continue
+
+        if current is not None:
+            if continuation:
+                message = "\n".join([current[7], *continuation])
+                current = (*current[:7], message)
+                continuation.clear()
+            yield current
+        local, offset, level, thread, site, project, task, other, logger, message = (
+            m.groups()
+        )
+        current = (
+            parse_time(local, offset),
+            level,
+            thread if other is None else other,
+            None if site is None else int(site),
+            project,
+            task,
+            logger,
+            message,
+        )
+
+    if current is not None:
+        if continuation:
+            current = (*current[:7], "\n".join([current[7], *continuation]))
+        yield current
+
+
+def parse_lines(lines: Iterable[str]) -> Iterator[LogRecord]:
+    """Parse log lines into records
+
+    Lines are consumed lazily, so it can parse a stream such as
+    :meth:`tdworkflow.client.LogAPI.follow_logs`.
+
+    .. code-block:: python
+
+       >>> for record in parse_lines(client.follow_logs(attempt)):
+       ...     if record.level == "ERROR":
+       ...         print(record.task, record.message)
+
+    :param lines: Log lines with or without trailing newlines
+    :return: Iterator of :class:`LogRecord`
+    """
+    for fields in _iter_fields(lines):
+        yield LogRecord(*fields)
+
+
+def parse_log(log: str | bytes) -> list[LogRecord]:
+    """Parse a log file into records
+
+    :param log: Log string e.g. a result of
+                :meth:`tdworkflow.client.LogAPI.log_file`
+    :return: List of :class:`LogRecord`
+    """
+    if isinstance(log, bytes):
+        log = log.decode("utf-8", errors="replace")
+    return list(parse_lines(log.splitlines()))
+
+
+def parse_batches(lines: Iterable[str], batch_size: int = 10000) -> Iterator[LogBatch]:
+    """Parse log lines into column batches
+
+    Each batch is a dict from a name in :data:`COLUMNS` to a list of values,
+    which skips creating an object per record and can be passed to
+    ``pyarrow.Table.from_pydict`` or ``pandas.DataFrame`` as is.
+
+    :param lines: Log lines with or without trailing newlines
+    :param batch_size: Maximum number of records in a batch. Default 10000
+    :return: Iterator of batches
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive: {batch_size}")
+
+    rows: list[_Fields] = []
+    for fields in _iter_fields(lines):
+        rows.append(fields)
+        if len(rows) >= batch_size:
+            yield _to_batch(rows)
+            rows = []
+    if rows:
+        yield _to_batch(rows)
+
+
+def _to_batch(rows: list[_Fields]) -> LogBatch:
+    # Transposing with zip() is faster than appending to each column per row
+    return {name: list(column) for name, column in zip(COLUMNS, zip(*rows))}
@@ -0,0 +1,202 @@
+import collections
+import concurrent.futures
+import dataclasses
+import fnmatch
+import gzip
+import io
+import queue
+import re
+import threading
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, cast
+
+from .attempt import Attempt
+from .log import LogFile
+
+if TYPE_CHECKING:
+    from .client import Client
+
+# Signals that a worker finished a log file
+_DONE = object()
+_CHUNK_SIZE = 64 * 1024
+
+
+@dataclasses.dataclass
+class LogMatch:
+    """A line of a log file matching a pattern
+
+    ``line_number`` is 1-origin within the log file.
+    """
+
+    attempt_id: int
+    file_name: str
+    task_name: str
+    line_number: int
+    line: str
+    before: list[str] = dataclasses.field(default_factory=list)
+    after: list[str] = dataclasses.field(default_factory=list)
+
+
+def grep_lines(
+    lines: Iterable[str], pattern: re.Pattern[str], context: int = 0
+) -> Iterator[tuple[int, str, list[str], list[str]]]:
+    """Find lines matching a pattern with surrounding lines
+
+    Only ``context`` lines are kept in memory besides pending matches.
+
+    :param lines: Lines without trailing newlines
+    :param pattern: Compiled regular expression
+    :param context: Number of lines before and after a match
+    :return: Iterator of line number, line, lines before and lines after
+    """
+    before: collections.deque[str] = collections.deque(maxlen=context)
+    pending: list[tuple[int, str, list[str], list[str]]] = []
+    for line_number, line in enumerate(lines, 1):
+        while pending and len(pending[0][3]) >= context:
+            yield pending.pop(0)
+        for match in pending:
+            match[3].append(line)
+        if pattern.search(line):
+            pending.append((line_number, line, list(before), []))
+        before.append(line)
+    yield from pending
+
+
+class _ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterator of bytes chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = chunk
+        n = min(len(buffer), len(self._buffer))
+        buffer[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def _iter_lines(chunks: Iterable[bytes], stop: threading.Event) -> Iterator[str]:
+    with gzip.GzipFile(fileobj=_ChunkReader(chunks)) as gz:
+        text = io.TextIOWrapper(gz, encoding="utf-8", errors="replace")
+        for line in text:
+            if stop.is_set():
+                return
+            yield line.rstrip("\n")
+
+
+def search_logs(
+    client: "Client",
+    attempts: int | Attempt | Iterable[int | Attempt],
+    pattern: str | re.Pattern[str],
+    tasks: str | Iterable[str] | None = None,
+    context: int = 0,
+    max_matches: int | None = None,
+    concurrency: int = 4,
+    flags: int = 0,
+) -> Iterator[LogMatch]:
+    """Search log files of attempts with a regular expression
+
+    Log files are downloaded and decompressed as streams in parallel, and
+    searched line by line, so no log file is held in memory. Downloads stop as
+    soon as ``max_matches`` matches are found or the iterator is closed.
+    Matches of a log file are in line order, but matches of different log
+    files may interleave.
+
+    .. code-block:: python
+
+       >>> for m in search_logs(client, attempt, r"Traceback", context=20,
+       ...                      max_matches=1):
+       ...     print(m.task_name, m.line_number)
+       ...     print("\\n".join([*m.before, m.line, *m.after]))
+
+    :param client: Client
+    :param attempts: Attempt ID, Attempt object or their iterable
+    :param pattern: Regular expression
+    :param tasks: Glob patterns of task names e.g. ``+wf+load*``, optional
+    :param context: Number of lines before and after a match. Default 0
+    :param max_matches: Stop after this number of matches, optional
+    :param concurrency: Number of log files downloaded at the same time.
+                        Default 4
+    :param flags: Flags of :func:`re.compile`
+    :return: Iterator of :class:`LogMatch`
+    """
+    regex = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+    if isinstance(attempts, (int, Attempt)):
+        attempts = [attempts]
+    task_patterns = [tasks] if isinstance(tasks, str) else list(tasks or [])
+
+    files: list[tuple[int, LogFile]] = []
+    for attempt in attempts:
+        attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
+        for file in client.log_files(attempt_id):
+            if not task_patterns or any(
+                fnmatch.fnmatchcase(file.taskName, p) for p in task_patterns
+            ):
+                files.append((attempt_id, file))
+    if not files or max_matches == 0:
+        return
+
+    stop = threading.Event()
+    results: queue.Queue[object] = queue.Queue(maxsize=1024)
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def search(attempt_id: int, file: LogFile) -> None:
+        try:
+            if stop.is_set():
+                return
+            path = f"logs/{attempt_id}/files/{file.fileName}"
+            with client.get_stream(path) as r:
+                # iter_content also serves a body already read e.g. by a
+                # recording cassette
+                chunks = r.iter_content(_CHUNK_SIZE)
+                for n, line, before, after in grep_lines(
+                    _iter_lines(chunks, stop), regex, context
+                ):
+                    match = LogMatch(
+                        attempt_id, file.fileName, file.taskName, n, line, before, after
+                    )
+                    if not put(match):
+                        return
+        except Exception as e:
+            put(e)
+        finally:
+            put(_DONE)
+
+    pool = concurrent.futures.ThreadPoolExecutor(concurrency)
+    try:
+        for attempt_id, file in files:
+            pool.submit(search, attempt_id, file)
+
+        n_done = n_matches = 0
+        while n_done < len(files):
+            item = results.get()
+            if item is _DONE:
+                n_done += 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield cast(LogMatch, item)
+                n_matches += 1
+                if max_matches is not None and n_matches >= max_matches:
+                    return
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,89 @@
+from collections.abc import Callable, Iterator
+from typing import Any, cast
+
+from .json_stream import iter_resources
+
+Page = list[dict[str, Any]]
+
+
+def iter_pages(
+    get: Callable[..., Any],
+    path: str,
+    key: str,
+    params: dict[str, Any] | None = None,
+    page_size: int | None = None,
+    page_size_param: str = "page_size",
+) -> Iterator[Page]:
+    """Iterate raw pages of a list API paginated by ``last_id``
+
+    The id of the last item of a page is passed as ``last_id`` of the next
+    request, so it works for both ascending lists (e.g. schedules) and
+    descending lists (e.g. attempts and sessions). It stops at an empty page or
+    when ``last_id`` doesn't advance. A page shorter than ``page_size`` doesn't
+    stop it, since servers may cap the page size below the requested one.
+
+    :param get: GET operator e.g. :meth:`tdworkflow.client.Client.get`
+    :param path: Treasure Workflow API path e.g. ``attempts``
+    :param key: Key of the list in a response e.g. ``attempts``
+    :param params: Query parameters. ``last_id`` is used for the first page.
+    :param page_size: Number of items per page
+    :param page_size_param: Query parameter name of the page size
+    :return: Iterator of pages of resources in dictionary
+    """
+    params = dict(params or {})
+    last_id = params.pop("last_id", None)
+    if page_size:
+        params[page_size_param] = page_size
+
+    while True:
+        if last_id:
+            params["last_id"] = last_id
+        r = cast(dict[str, Page] | None, get(path, params=params))
+        items = r.get(key, []) if r else []
+        if not items:
+            return
+
+        yield items
+
+        if items[-1]["id"] == last_id:
+            return
+        last_id = items[-1]["id"]
+
+
+def iter_streamed_items(
+    get_stream: Callable[..., Any],
+    path: str,
+    key: str,
+    params: dict[str, Any] | None = None,
+    page_size: int | None = None,
+    page_size_param: str = "page_size",
+) -> Iterator[dict[str, Any]]:
+    """Iterate items of a list API over all pages as each page is received
+
+    Same as :func:`iter_pages` but each page is decoded incrementally with
+    :func:`tdworkflow.json_stream.iter_resources`, so that items are yielded
+    before the whole page arrives.
+
+    :param get_stream: Streamed GET operator e.g.
+                       :meth:`tdworkflow.client.Client.get_stream`
+    :param path: Treasure Workflow API path e.g. ``sessions``
+    :param key: Key of the list in a response e.g. ``sessions``
+    :param params: Query parameters. ``last_id`` is used for the first page.
+    :param page_size: Number of items per page
+    :param page_size_param: Query parameter name of the page size
+    :return: Iterator of resources in dictionary
+    """
+    params = dict(params or {})
+    last_id = params.pop("last_id", None)
+    if page_size:
+        params[page_size_param] = page_size
+
+    while True:
+        if last_id:
+            params["last_id"] = last_id
+        item = None
+        for item in iter_resources(get_stream, path, key, params):
+            yield item
+        if item is None or item["id"] == last_id:
+            return
+        last_id = item["id"]
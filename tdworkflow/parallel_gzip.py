@@ -0,0 +1,125 @@
+import collections
+import concurrent.futures
+import io
+import os
+import struct
+import time
+import zlib
+from typing import BinaryIO
+
+# Size of the deflate window. Each block is primed with this many bytes of the
+# previous block so that compression ratio is close to a single stream.
+_WINDOW_SIZE = 32 * 1024
+
+
+def _compress_block(data: bytes, dictionary: bytes, level: int, last: bool) -> bytes:
+    if dictionary:
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    # A sync flush ends a block on a byte boundary, so blocks compressed
+    # separately concatenate into one deflate stream
+    flush_mode = zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    return compressor.compress(data) + compressor.flush(flush_mode)
+
+
+class ParallelGzipWriter(io.RawIOBase):
+    """Write-only file object compressing into gzip with multiple threads
+
+    Data is split into blocks, which are compressed concurrently by a thread
+    pool like `pigz <https://zlib.net/pigz/>`_. The output is a single
+    standard gzip member, so any gzip reader can decompress it. Since
+    :mod:`zlib` releases the GIL while compressing, it scales with the number
+    of cores.
+
+    The underlying file object is not closed by :meth:`close`.
+
+    .. code-block:: python
+
+       >>> with ParallelGzipWriter(f, compresslevel=6, threads=8) as gz:
+       ...     gz.write(data)
+
+    :param fileobj: Binary file object to write compressed data to
+    :param compresslevel: Compression level from 0 to 9. Default 9
+    :param threads: Number of compression threads. Default number of CPUs
+    :param block_size: Size of uncompressed blocks. Default 128 KiB
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        compresslevel: int = 9,
+        threads: int | None = None,
+        block_size: int = 128 * 1024,
+    ) -> None:
+        if not 0 <= compresslevel <= 9:
+            raise ValueError(f"compresslevel must be from 0 to 9: {compresslevel}")
+        if block_size < _WINDOW_SIZE:
+            raise ValueError(f"block_size must be at least {_WINDOW_SIZE}")
+
+        super().__init__()
+        self.fileobj = fileobj
+        self.compresslevel = compresslevel
+        self.threads = threads or os.cpu_count() or 1
+        self.block_size = block_size
+        self._pool = concurrent.futures.ThreadPoolExecutor(self.threads)
+        self._pending: collections.deque[concurrent.futures.Future[bytes]] = (
+            collections.deque()
+        )
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._crc = 0
+        self._size = 0
+        self.fileobj.write(
+            b"\x1f\x8b\x08\x00"
+            + struct.pack("<I", int(time.time()))
+            + (b"\x02" if compresslevel == 9 else b"\x00")
+            + b"\xff"
+        )
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        view = memoryview(data).cast("B")
+        self._crc = zlib.crc32(view, self._crc)
+        self._size += len(view)
+        self._buffer += view
+        start = 0
+        while len(self._buffer) - start >= self.block_size:
+            end = start + self.block_size
+            self._submit(bytes(self._buffer[start:end]), last=False)
+            start = end
+        del self._buffer[:start]
+        return len(view)
+
+    def _submit(self, block: bytes, last: bool) -> None:
+        self._pending.append(
+            self._pool.submit(
+                _compress_block, block, self._dictionary, self.compresslevel, last
+            )
+        )
+        self._dictionary = block[-_WINDOW_SIZE:]
+        # Bound memory by writing out finished blocks in order
+        while self._pending and (
+            len(self._pending) > 2 * self.threads or self._pending[0].done()
+        ):
+            self.fileobj.write(self._pending.popleft().result())
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._submit(bytes(self._buffer), last=True)
+            self._buffer.clear()
+            while self._pending:
+                self.fileobj.write(self._pending.popleft().result())
+            self.fileobj.write(struct.pack("<II", self._crc, self._size & 0xFFFFFFFF))
+        finally:
+            self._pool.shutdown()
+            super().close()
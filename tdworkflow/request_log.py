@@ -0,0 +1,161 @@
+import logging
+import random
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import requests
+
+REDACTED = "***"
+
+_TEXT_CONTENT_TYPES = ("application/json", "text/")
+_TD1_AUTH = re.compile(r"TD1 \S+")
+
+
+class _LazyMessage:
+    """Defer formatting a request log until a handler emits it"""
+
+    def __init__(self, request_logger: "RequestLogger", record: dict[str, Any]):
+        self.request_logger = request_logger
+        self.record = record
+
+    def __str__(self) -> str:
+        return self.request_logger.format(**self.record)
+
+
+class RequestLogger:
+    """Structured, lazily evaluated logging of API requests
+
+    Nothing is formatted unless the logger is enabled for ``DEBUG`` and a
+    handler emits the record, so it is safe to keep debug logging enabled in
+    production. Response bodies are capped at ``max_body_bytes``, binary
+    bodies such as log files and archives are only summarized, and sensitive
+    headers and registered secret values are redacted.
+
+    :param max_body_bytes: Maximum bytes of a response body to be logged.
+                           ``0`` disables body logging. default: 1024
+    :type max_body_bytes: int
+    :param sample_rate: Fraction of successful requests to be logged in [0, 1].
+                        Failed requests are always logged. default: 1.0
+    :type sample_rate: float
+    :param redact_headers: Header names whose values are redacted
+    :type redact_headers: Iterable[str]
+    :param secrets: Secret values to be masked, e.g. API key
+    :type secrets: Iterable[str]
+    :param logger: Logger to write records to
+    :type logger: Optional[logging.Logger], optional
+    """
+
+    def __init__(
+        self,
+        max_body_bytes: int = 1024,
+        sample_rate: float = 1.0,
+        redact_headers: Iterable[str] = ("Authorization", "Cookie", "Set-Cookie"),
+        secrets: Iterable[str | None] = (),
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be in [0, 1]: {sample_rate}")
+
+        self.max_body_bytes = max_body_bytes
+        self.sample_rate = sample_rate
+        self.redact_headers = {h.lower() for h in redact_headers}
+        self.secrets = {s for s in secrets if s}
+        self.logger = logger or logging.getLogger(__name__)
+
+    def add_secret(self, value: str) -> None:
+        """Register a secret value to be masked in log records
+
+        :param value: Secret value
+        :type value: str
+        """
+        if value:
+            self.secrets.add(value)
+
+    def enabled(self) -> bool:
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def log(
+        self,
+        method: str,
+        url: str,
+        response: requests.Response,
+        duration: float,
+        body: bytes | None = None,
+    ) -> None:
+        """Log a response if debug logging is enabled and the request is sampled
+
+        :param method: HTTP method
+        :param url: Requested URL
+        :param response: Response object
+        :param duration: Elapsed time in seconds
+        :param body: Response body. Pass ``None`` for streamed responses
+        """
+        if not self.enabled():
+            return
+
+        failed = not 200 <= response.status_code < 300
+        if not failed and self.sample_rate < 1.0:
+            if random.random() >= self.sample_rate:
+                return
+
+        record = {
+            "method": method.upper(),
+            "url": url,
+            "status": response.status_code,
+            "duration": duration,
+            "headers": getattr(response.request, "headers", None),
+            "content_type": response.headers.get("Content-Type", ""),
+            # Truncated after redaction in format(), so that a secret across
+            # the limit isn't partially logged
+            "body": body,
+            "body_size": len(body) if body is not None else None,
+        }
+        self.logger.debug("%s", _LazyMessage(self, record))
+
+    def redact(self, text: str) -> str:
+        """Mask registered secrets and TD1 API keys in a text
+
+        :param text: Target text
+        :return: Redacted text
+        """
+        for secret in self.secrets:
+            text = text.replace(secret, REDACTED)
+        return _TD1_AUTH.sub(f"TD1 {REDACTED}", text)
+
+    def redact_header_values(self, headers: Mapping[str, Any] | None) -> dict[str, Any]:
+        if not headers:
+            return {}
+        return {
+            k: REDACTED if k.lower() in self.redact_headers else v
+            for k, v in headers.items()
+        }
+
+    def format(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        duration: float,
+        headers: Mapping[str, Any] | None,
+        content_type: str,
+        body: bytes | None,
+        body_size: int | None,
+    ) -> str:
+        size = "streamed" if body_size is None else f"{body_size} bytes"
+        lines = [f"{method} {url} -> {status} ({duration:.3f}s, {size})"]
+        redacted_headers = self.redact_header_values(headers)
+        if redacted_headers:
+            lines.append(f"request headers: {redacted_headers!r}")
+
+        if body and self.max_body_bytes > 0:
+            if any(t in str(content_type) for t in _TEXT_CONTENT_TYPES):
+                redacted = self.redact(body.decode("utf-8", errors="replace"))
+                text = repr(redacted.encode("utf-8")[: self.max_body_bytes])
+                if len(body) > self.max_body_bytes:
+                    text += f"... ({len(body) - self.max_body_bytes} bytes truncated)"
+                lines.append(f"response: {text}")
+            else:
+                lines.append(f"response: <{body_size} bytes of {content_type}>")
+
+        return self.redact("\n".join(lines))
@@ -0,0 +1,238 @@
+import bisect
+import collections
+import logging
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from .exceptions import HttpError
+from .pagination import iter_pages
+from .project import Project
+from .schedule import Schedule
+from .util import parse_iso8601
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+_TimeKey = tuple[float, int]
+
+
+def _timestamp(dt: datetime | str | None) -> float | None:
+    if isinstance(dt, str):
+        dt = parse_iso8601(dt)
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _version(schedule: Schedule) -> tuple[object, ...]:
+    return (schedule.updatedAt, schedule.disabledAt, schedule.nextRunTime)
+
+
+class ScheduleIndex:
+    """In-memory index of schedules
+
+    Schedules are indexed by id, project name and workflow name, and kept in a
+    list sorted by ``(nextRunTime, id)``, so lookups are O(1) and
+    ``nextRunTime`` range queries are O(log n + k) with :mod:`bisect`.
+
+    :meth:`refresh` fetches only schedules created since the last refresh
+    and schedules whose ``nextRunTime`` has passed, since those are the ones
+    whose ``nextRunTime`` has moved. Use ``refresh(full=True)`` to pick up
+    other changes such as deletions. Apply results of
+    :meth:`tdworkflow.client.ScheduleAPI.disable_schedule` and so on with
+    :meth:`add` to keep the index up to date without refreshing.
+
+    .. code-block:: python
+
+       >>> index = ScheduleIndex(client)
+       >>> index.refresh()
+       >>> index.due_within(timedelta(hours=1))
+       >>> index.find(project="pandas-df", workflow="pandas-df")
+
+    :param client: Client used by :meth:`refresh`, optional
+    :param schedules: Initial schedules, optional
+    """
+
+    def __init__(
+        self, client: "Client | None" = None, schedules: Iterable[Schedule] = ()
+    ) -> None:
+        self.client = client
+        self.by_id: dict[int, Schedule] = {}
+        self.by_project: dict[str, set[int]] = collections.defaultdict(set)
+        self.by_workflow: dict[str, set[int]] = collections.defaultdict(set)
+        self.disabled: set[int] = set()
+        self._times: list[_TimeKey] = []
+        self._time_keys: dict[int, _TimeKey] = {}
+        self.last_id = 0
+        for schedule in schedules:
+            self.add(schedule)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, schedule_id: object) -> bool:
+        return schedule_id in self.by_id
+
+    def __iter__(self) -> Iterator[Schedule]:
+        return iter(self.by_id.values())
+
+    def get(self, schedule_id: int) -> Schedule | None:
+        return self.by_id.get(schedule_id)
+
+    def add(self, schedule: Schedule) -> None:
+        """Add or replace a schedule
+
+        :param schedule: Schedule
+        """
+        if schedule.id in self.by_id:
+            self.remove(schedule.id)
+
+        self.by_id[schedule.id] = schedule
+        self.by_project[schedule.project.name].add(schedule.id)
+        self.by_workflow[schedule.workflow.name].add(schedule.id)
+        if schedule.disabledAt is not None:
+            self.disabled.add(schedule.id)
+        timestamp = _timestamp(schedule.nextRunTime)
+        if timestamp is not None:
+            key = (timestamp, schedule.id)
+            bisect.insort(self._times, key)
+            self._time_keys[schedule.id] = key
+        self.last_id = max(self.last_id, schedule.id)
+
+    def remove(self, schedule_id: int) -> Schedule | None:
+        """Remove a schedule
+
+        :param schedule_id: Schedule ID
+        :return: Removed Schedule or ``None`` if it doesn't exist
+        """
+        schedule = self.by_id.pop(schedule_id, None)
+        if schedule is None:
+            return None
+
+        self.by_project[schedule.project.name].discard(schedule_id)
+        self.by_workflow[schedule.workflow.name].discard(schedule_id)
+        self.disabled.discard(schedule_id)
+        key = self._time_keys.pop(schedule_id, None)
+        if key is not None:
+            i = bisect.bisect_left(self._times, key)
+            if i < len(self._times) and self._times[i] == key:
+                del self._times[i]
+        return schedule
+
+    def find(
+        self,
+        project: str | Project | None = None,
+        workflow: str | None = None,
+        disabled: bool | None = None,
+    ) -> list[Schedule]:
+        """Find schedules by names and disabled state
+
+        :param project: Project name or Project object, optional
+        :param workflow: Workflow name, optional
+        :param disabled: Only disabled schedules if ``True``, only enabled
+                         schedules if ``False``, optional
+        :return: List of Schedule in the order of id
+        """
+        project_name = project.name if isinstance(project, Project) else project
+        candidates: set[int] | None = None
+        if project_name is not None:
+            candidates = set(self.by_project.get(project_name, ()))
+        if workflow is not None:
+            ids = self.by_workflow.get(workflow, set())
+            candidates = ids.copy() if candidates is None else candidates & ids
+        if candidates is None:
+            candidates = set(self.by_id)
+        if disabled is True:
+            candidates &= self.disabled
+        elif disabled is False:
+            candidates -= self.disabled
+        return [self.by_id[i] for i in sorted(candidates)]
+
+    def next_runs(
+        self,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+        include_disabled: bool = False,
+    ) -> list[Schedule]:
+        """Find schedules whose ``nextRunTime`` is in ``[start, end)``
+
+        :param start: Start time inclusive. Unbounded if ``None``
+        :param end: End time exclusive. Unbounded if ``None``
+        :param include_disabled: Include disabled schedules. Default ``False``
+        :return: List of Schedule in the order of ``nextRunTime``
+        """
+        start_ts = _timestamp(start)
+        end_ts = _timestamp(end)
+        lo = 0 if start_ts is None else bisect.bisect_left(self._times, (start_ts,))
+        hi = (
+            len(self._times)
+            if end_ts is None
+            else bisect.bisect_left(self._times, (end_ts,))
+        )
+        return [
+            self.by_id[i]
+            for _, i in self._times[lo:hi]
+            if include_disabled or i not in self.disabled
+        ]
+
+    def due_within(
+        self, delta: timedelta, now: datetime | None = None
+    ) -> list[Schedule]:
+        """Find enabled schedules which run within ``delta`` from now
+
+        :param delta: Time window
+        :param now: Current time. Default current UTC time
+        :return: List of Schedule in the order of ``nextRunTime``
+        """
+        now = now or datetime.now(timezone.utc)
+        return self.next_runs(now, now + delta)
+
+    def refresh(self, full: bool = False, now: datetime | None = None) -> int:
+        """Fetch changes of schedules from the API
+
+        :param full: List all schedules and remove deleted ones. Otherwise,
+                     fetch only new schedules and schedules whose
+                     ``nextRunTime`` has passed. Default ``False``
+        :param now: Current time. Default current UTC time
+        :return: Number of added or updated schedules
+        """
+        if self.client is None:
+            raise ValueError("client is required to refresh")
+
+        changed = 0
+        if full or not self.by_id:
+            seen = set()
+            pages = iter_pages(self.client.get, "schedules", "schedules")
+            for schedule in (Schedule.from_api_repr(**s) for p in pages for s in p):
+                seen.add(schedule.id)
+                current = self.by_id.get(schedule.id)
+                if current is None or _version(current) != _version(schedule):
+                    self.add(schedule)
+                    changed += 1
+            for schedule_id in set(self.by_id) - seen:
+                self.remove(schedule_id)
+            logger.debug(f"Refreshed {len(self)} schedules. {changed} changed")
+            return changed
+
+        stale = [s.id for s in self.next_runs(end=now or datetime.now(timezone.utc))]
+        for schedule_id in stale:
+            try:
+                self.add(self.client.schedule(schedule_id))
+            except (HttpError, ValueError):
+                logger.debug(f"Removed schedule {schedule_id} which doesn't exist")
+                self.remove(schedule_id)
+            changed += 1
+
+        params = {"last_id": self.last_id}
+        for page in iter_pages(self.client.get, "schedules", "schedules", params):
+            for s in page:
+                self.add(Schedule.from_api_repr(**s))
+                changed += 1
+
+        logger.debug(f"Refreshed {changed} schedules incrementally")
+        return changed
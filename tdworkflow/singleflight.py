@@ -0,0 +1,61 @@
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.shared = 0
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls with the same key
+
+    While a call for a key is in flight, other callers of the same key wait
+    for it and share its result or exception instead of making their own call.
+    The result isn't cached after the call completes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Call ``func`` unless a call with the same key is in flight
+
+        :param key: Key identifying the call
+        :param func: Function to be called
+        :return: Result of ``func``, possibly shared with other callers
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                call.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of keys being called"""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,190 @@
+import dataclasses
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Literal
+
+from .attempt import Attempt
+from .project import Project
+from .workflow import Workflow
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+EventKind = Literal["created", "status_changed", "finished"]
+
+
+def attempt_status(attempt: Attempt) -> str:
+    """Get the status of an attempt
+
+    Fall back to ``done`` and ``success`` flags if the API doesn't return
+    ``status``.
+
+    :param attempt: Attempt object
+    :return: Status e.g. ``"running"``, ``"success"`` or ``"error"``
+    """
+    if attempt.status:
+        return attempt.status
+    if not attempt.done:
+        return "running"
+    return "success" if attempt.success else "error"
+
+
+@dataclasses.dataclass
+class AttemptEvent:
+    """A change of an attempt found by :class:`AttemptSync`"""
+
+    kind: EventKind
+    attempt: Attempt
+    previous_status: str | None = None
+
+
+@dataclasses.dataclass
+class SyncState:
+    """Watermark of an :class:`AttemptSync`
+
+    ``last_id`` is the largest attempt id seen so far and ``running`` maps
+    unfinished attempt ids to their last known status.
+    """
+
+    last_id: int = 0
+    running: dict[int, str] = dataclasses.field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"last_id": self.last_id, "running": self.running}
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "SyncState":
+        running = {int(k): v for k, v in d.get("running", {}).items()}
+        return cls(last_id=int(d.get("last_id", 0)), running=running)
+
+
+class AttemptSync:
+    """Incremental synchronization of attempts
+
+    Each :meth:`sync` fetches only attempts newer than the watermark and
+    re-polls only attempts which were still running, so the number of API
+    calls scales with the rate of change rather than the size of history.
+    Digdag lists attempts in descending order of id, so pagination stops at
+    the first page reaching the watermark.
+
+    States of multiple filters can share one ``state_path``.
+
+    .. code-block:: python
+
+       >>> sync = AttemptSync(client, project="pandas-df", state_path="sync.json")
+       >>> for event in sync.sync():
+       ...     print(event.kind, event.attempt.id, event.attempt.status)
+
+    :param client: Client
+    :param project: Project name or Project object, optional
+    :param workflow: Workflow name or Workflow object, optional
+    :param include_retried: List more than 1 attempts per session
+    :param page_size: Number of attempts to fetch per request. Default 100
+    :param state_path: JSON file to persist the watermark, optional
+    :param start_id: Ignore attempts whose id is less than or equal to this id
+                     on the first sync. Default 0
+    """
+
+    def __init__(
+        self,
+        client: "Client",
+        project: str | Project | None = None,
+        workflow: str | Workflow | None = None,
+        include_retried: bool | None = None,
+        page_size: int = 100,
+        state_path: str | None = None,
+        start_id: int = 0,
+    ) -> None:
+        self.client = client
+        self.project = project.name if isinstance(project, Project) else project
+        self.workflow = workflow.name if isinstance(workflow, Workflow) else workflow
+        self.include_retried = include_retried
+        self.page_size = page_size
+        self.state_path = state_path
+        self.state = self._load() or SyncState(last_id=start_id)
+
+    @property
+    def key(self) -> str:
+        """Key identifying the filter in a state file"""
+        return json.dumps(
+            {
+                "project": self.project,
+                "workflow": self.workflow,
+                "include_retried": bool(self.include_retried),
+            },
+            sort_keys=True,
+        )
+
+    def _read_states(self) -> dict[str, Any]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _load(self) -> SyncState | None:
+        states = self._read_states()
+        if self.key in states:
+            return SyncState.from_dict(states[self.key])
+        return None
+
+    def save(self) -> None:
+        """Persist the watermark to ``state_path`` atomically"""
+        if not self.state_path:
+            return
+        states = self._read_states()
+        states[self.key] = self.state.to_dict()
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(states, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _fetch_new(self) -> list[Attempt]:
+        new_attempts = []
+        for attempt in self.client.iter_attempts(
+            project=self.project,
+            workflow=self.workflow,
+            include_retried=self.include_retried,
+            page_size=self.page_size,
+        ):
+            if attempt.id <= self.state.last_id:
+                break
+            new_attempts.append(attempt)
+        # Emit events in the order of creation
+        return sorted(new_attempts, key=lambda a: a.id)
+
+    def sync(self) -> list[AttemptEvent]:
+        """Fetch changes since the last sync
+
+        :return: List of events in the order of attempt id
+        """
+        events = []
+        state = self.state
+
+        for attempt_id, previous in sorted(state.running.items()):
+            attempt = self.client.attempt(attempt_id)
+            status = attempt_status(attempt)
+            if status != previous:
+                events.append(AttemptEvent("status_changed", attempt, previous))
+            if attempt.done:
+                events.append(AttemptEvent("finished", attempt, previous))
+                del state.running[attempt_id]
+            else:
+                state.running[attempt_id] = status
+
+        for attempt in self._fetch_new():
+            events.append(AttemptEvent("created", attempt))
+            if attempt.done:
+                events.append(AttemptEvent("finished", attempt))
+            else:
+                state.running[attempt.id] = attempt_status(attempt)
+            state.last_id = max(state.last_id, attempt.id)
+
+        self.save()
+        logger.debug(
+            f"Synced {len(events)} events. last_id={state.last_id} "
+            f"running={len(state.running)}"
+        )
+        return events
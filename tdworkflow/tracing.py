@@ -0,0 +1,103 @@
+import contextlib
+import importlib.util
+from collections.abc import Generator
+from typing import Any
+
+
+def _find_opentelemetry() -> bool:
+    # OpenTelemetry is imported on the first span to keep import time short
+    try:
+        return importlib.util.find_spec("opentelemetry.trace") is not None
+    except ModuleNotFoundError:
+        return False
+
+
+_available = _find_opentelemetry()
+_NULL_CONTEXT: contextlib.nullcontext[None] = contextlib.nullcontext()
+_enabled = _available
+
+AttributeValue = str | bool | int | float
+
+
+def enabled() -> bool:
+    """Whether spans are created
+
+    :return: ``True`` if OpenTelemetry is installed and tracing isn't disabled
+    """
+    return _enabled
+
+
+def set_enabled(flag: bool) -> None:
+    """Enable or disable tracing
+
+    :param flag: Create spans if ``True``. It is ignored if OpenTelemetry is
+                 not installed.
+    """
+    global _enabled
+    _enabled = flag and _available
+
+
+def _tracer() -> Any:
+    import tdworkflow
+
+    if not _available:
+        raise RuntimeError("OpenTelemetry is not installed")
+    from opentelemetry import trace
+
+    return trace.get_tracer("tdworkflow", tdworkflow.__version__)
+
+
+@contextlib.contextmanager
+def _span(name: str, attributes: dict[str, AttributeValue]) -> Generator[Any]:
+    with _tracer().start_as_current_span(name, attributes=attributes) as s:
+        yield s
+
+
+def span(
+    name: str, attributes: dict[str, AttributeValue | None] | None = None
+) -> contextlib.AbstractContextManager[Any]:
+    """Create a span as the current span
+
+    It returns a no-op context manager yielding ``None`` when tracing is
+    disabled, so it costs nothing if OpenTelemetry is not installed.
+
+    :param name: Span name
+    :param attributes: Span attributes. ``None`` values are dropped.
+    :return: Context manager yielding the span or ``None``
+    """
+    if not _enabled:
+        return _NULL_CONTEXT
+    attrs = {k: v for k, v in (attributes or {}).items() if v is not None}
+    return _span(name, attrs)
+
+
+def resource_attributes(path: str) -> dict[str, AttributeValue | None]:
+    """Extract resource attributes from an API path
+
+    :param path: Treasure Workflow API path e.g. ``attempts/123/tasks``
+    :return: Span attributes
+    """
+    segments = path.split("/")
+    attributes: dict[str, AttributeValue | None] = {"tdworkflow.resource": segments[0]}
+    if len(segments) > 1 and segments[1].isdigit():
+        if segments[0] in ("attempts", "logs"):
+            attributes["tdworkflow.attempt.id"] = int(segments[1])
+        elif segments[0] == "projects":
+            attributes["tdworkflow.project.id"] = int(segments[1])
+        else:
+            attributes[f"tdworkflow.{segments[0].rstrip('s')}.id"] = int(segments[1])
+    return attributes
+
+
+def request_span(method: str, path: str) -> contextlib.AbstractContextManager[Any]:
+    """Create a span for an HTTP request to the API
+
+    :param method: HTTP method
+    :param path: Treasure Workflow API path
+    :return: Context manager yielding the span or ``None``
+    """
+    if not _enabled:
+        return _NULL_CONTEXT
+    attributes = resource_attributes(path)
+    attributes["http.request.method"] = method.upper()
+    return span(f"tdworkflow {method.upper()} {path.split('/')[0]}", attributes)
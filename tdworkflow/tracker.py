@@ -0,0 +1,87 @@
+import dataclasses
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, cast
+
+from .attempt import Attempt
+from .task import Task
+
+if TYPE_CHECKING:
+    from .client import Client
+
+
+@dataclasses.dataclass
+class TaskChange:
+    """A task which was added or updated since the last poll"""
+
+    task: Task
+    previous: Task | None = None
+
+    @property
+    def previous_state(self) -> str | None:
+        return self.previous.state if self.previous else None
+
+    @property
+    def state_changed(self) -> bool:
+        return self.previous_state != self.task.state
+
+
+class TaskTracker:
+    """Incrementally maintained index of the tasks of an attempt
+
+    Tasks are indexed by ``Task.id``. On each poll, a :class:`Task` is rebuilt
+    only when its ``updatedAt`` or ``state`` differs from the last poll, so
+    the cost of building tasks is proportional to the number of changes
+    rather than the size of the attempt.
+
+    .. code-block:: python
+
+       >>> tracker = TaskTracker(client, attempt)
+       >>> while not client.attempt(attempt).done:
+       ...     for change in tracker.poll():
+       ...         print(change.task.fullName, change.previous_state, change.task.state)
+       ...     time.sleep(10)
+
+    :param client: Client
+    :param attempt: Attempt ID or Attempt object
+    """
+
+    def __init__(self, client: "Client", attempt: int | Attempt) -> None:
+        self.client = client
+        self.attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
+        self.tasks: dict[int, Task] = {}
+        self._versions: dict[str, tuple[Any, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __getitem__(self, task_id: int) -> Task:
+        return self.tasks[task_id]
+
+    def poll(self) -> list[TaskChange]:
+        """Fetch tasks and update the index
+
+        :return: List of added or updated tasks
+        """
+        r = self.client.get(f"attempts/{self.attempt_id}/tasks")
+        raw_tasks = cast(dict[str, list[dict[str, Any]]], r)["tasks"] if r else []
+        return self.update(raw_tasks)
+
+    def update(self, raw_tasks: Iterable[dict[str, Any]]) -> list[TaskChange]:
+        """Update the index with tasks in API representation
+
+        :param raw_tasks: Tasks in dictionary as returned by the API
+        :return: List of added or updated tasks
+        """
+        changes = []
+        versions = self._versions
+        for raw in raw_tasks:
+            key = str(raw["id"])
+            version = (raw.get("updatedAt"), raw.get("state"))
+            if versions.get(key) == version:
+                continue
+
+            versions[key] = version
+            task = Task.from_api_repr(**raw)
+            changes.append(TaskChange(task, self.tasks.get(task.id)))
+            self.tasks[task.id] = task
+        return changes
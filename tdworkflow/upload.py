@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import io
+import logging
+import tempfile
+import time
+from collections.abc import Callable
+from typing import BinaryIO
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class UploadBody(io.RawIOBase):
+    """Rewindable request body with a known length and MD5 checksum
+
+    The source is copied once into a spooled temporary file, which stays in
+    memory up to ``spool_size`` bytes and moves to disk beyond it. Since the
+    body is seekable, urllib3 rewinds it when the adapter retries a request,
+    so every attempt sends the whole body again without rebuilding it.
+    ``len()`` gives requests the ``Content-Length`` up front.
+
+    .. code-block:: python
+
+       >>> body = UploadBody(archive, on_progress=lambda sent, total: ...)
+       >>> client.put("projects", data=body, params=params)
+       >>> body.attempts, body.bytes_per_second
+
+    :param source: Binary file object or bytes to upload
+    :param on_progress: Function called with sent bytes and total bytes after
+                        each chunk is read, optional
+    :param spool_size: Maximum size kept in memory. Default 64 MiB
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO | bytes,
+        on_progress: ProgressCallback | None = None,
+        spool_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        super().__init__()
+        self.on_progress = on_progress
+        self._file = tempfile.SpooledTemporaryFile(max_size=spool_size)
+        md5 = hashlib.md5()
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        while chunk := source.read(1024 * 1024):
+            md5.update(chunk)
+            self._file.write(chunk)
+        self.length = self._file.tell()
+        self._file.seek(0)
+        self.md5 = base64.b64encode(md5.digest()).decode("ascii")
+        self.attempts = 0
+        self.sent = 0
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+
+    def __len__(self) -> int:
+        return self.length
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def read(self, size: int | None = -1) -> bytes:
+        position = self._file.tell()
+        data = self._file.read(-1 if size is None else size)
+        if position == 0 and data:
+            # Reading from the start again means the request is retried
+            self.attempts += 1
+            self._started_at = time.perf_counter()
+            self._finished_at = None
+            if self.attempts > 1:
+                logger.info(f"Retrying upload of {self.length} bytes")
+        self.sent = position + len(data)
+        if data and self.sent == self.length:
+            self._finished_at = time.perf_counter()
+        if data and self.on_progress:
+            self.on_progress(self.sent, self.length)
+        return data
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    @property
+    def elapsed(self) -> float | None:
+        """Seconds taken to read the whole body in the last attempt"""
+        if self._started_at is None or self._finished_at is None:
+            return None
+        return self._finished_at - self._started_at
+
+    @property
+    def bytes_per_second(self) -> float | None:
+        """Throughput of the last attempt"""
+        elapsed = self.elapsed
+        if elapsed is None:
+            return None
+        return self.length / elapsed if elapsed else float("inf")
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
@@ -1,3 +1,4 @@
+import contextlib
 import io
 import logging
 import os
@@ -6,28 +7,70 @@ import tarfile
 from datetime import datetime, timezone
 from pathlib import Path
 
+from .parallel_gzip import ParallelGzipWriter
+
 logger = logging.getLogger(__name__)
 
 
-def archive_files(target_dir: str, exclude_patterns: list[str]) -> io.BytesIO:
+def list_archive_files(
+    target_dir: str, exclude_patterns: list[str]
+) -> list[tuple[Path, Path]]:
+    """List files and directories to be archived
+
+    :param target_dir: Project directory
+    :param exclude_patterns: Regular expressions of paths to exclude. Dot files
+                             are always excluded
+    :return: List of paths and paths relative to ``target_dir``
+    """
     _partial = r")|(".join(exclude_patterns)
-    pattern = rf"({_partial})"
+    # An empty group would match every path
+    pattern = rf"({_partial})" if exclude_patterns else None
 
     target_dir_path = Path(target_dir)
+    paths = []
+    for current_dir, directories, files in os.walk(target_dir_path):
+        for file_or_dir in [*directories, *files]:
+            file_path = Path(os.path.join(current_dir, file_or_dir))
+            if file_or_dir.startswith(".") or (
+                pattern and re.search(pattern, str(file_path))
+            ):
+                continue
+            paths.append((file_path, file_path.relative_to(target_dir_path)))
+    return paths
+
+
+def archive_files(
+    target_dir: str,
+    exclude_patterns: list[str],
+    compresslevel: int = 9,
+    threads: int = 1,
+) -> io.BytesIO:
     _bytes = io.BytesIO()
-    with tarfile.open(mode="w:gz", fileobj=_bytes, format=tarfile.GNU_FORMAT) as tar:
-        for current_dir, directories, files in os.walk(target_dir_path):
-            for file_or_dir in [*directories, *files]:
-                file_path = Path(os.path.join(current_dir, file_or_dir))
-                if re.search(pattern, str(file_path)) or file_or_dir.startswith("."):
-                    continue
-                relative_path = file_path.relative_to(target_dir_path)
-                logger.info(f"Added {file_path} as {relative_path}")
-                tar.add(
-                    file_path,
-                    relative_path,
-                    recursive=False,
+    with contextlib.ExitStack() as stack:
+        if threads > 1:
+            # Write an uncompressed tar stream and compress its blocks in parallel
+            gz = stack.enter_context(ParallelGzipWriter(_bytes, compresslevel, threads))
+            tar = stack.enter_context(
+                tarfile.open(mode="w|", fileobj=gz, format=tarfile.GNU_FORMAT)
+            )
+        else:
+            tar = stack.enter_context(
+                tarfile.open(
+                    mode="w:gz",
+                    fileobj=_bytes,
+                    format=tarfile.GNU_FORMAT,
+                    compresslevel=compresslevel,
                 )
+            )
+        for file_path, relative_path in list_archive_files(
+            target_dir, exclude_patterns
+        ):
+            logger.info(f"Added {file_path} as {relative_path}")
+            tar.add(
+                file_path,
+                relative_path,
+                recursive=False,
+            )
 
     _bytes.seek(0)
     return _bytes
@@ -0,0 +1,370 @@
+import dataclasses
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Literal
+
+from .attempt import Attempt
+from .project import Project
+from .task import Task
+from .tracker import TaskChange, TaskTracker
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+EventKind = Literal[
+    "started",
+    "retried",
+    "failed",
+    "succeeded",
+    "canceled",
+    "state_changed",
+    "attempt_started",
+    "attempt_finished",
+]
+
+_TASK_EVENT_KINDS: dict[str, EventKind] = {
+    "running": "started",
+    "planned": "started",
+    "retry_waiting": "retried",
+    "group_retry_waiting": "retried",
+    "error": "failed",
+    "group_error": "failed",
+    "success": "succeeded",
+    "canceled": "canceled",
+}
+# States of tasks which haven't started yet
+_PENDING_STATES = {"blocked", "ready"}
+
+
+def task_event_kind(state: str) -> EventKind:
+    """Classify a task state into an event kind
+
+    :param state: New task state
+    :return: Event kind. ``"state_changed"`` for unknown states.
+    """
+    return _TASK_EVENT_KINDS.get(state, "state_changed")
+
+
+@dataclasses.dataclass
+class WatchEvent:
+    """A state transition of an attempt or a task"""
+
+    kind: EventKind
+    attempt: Attempt
+    task: Task | None = None
+    previous_state: str | None = None
+
+
+Callback = Callable[[WatchEvent], None]
+
+
+def transitions(attempt: Attempt, changes: Iterable[TaskChange]) -> list[WatchEvent]:
+    """Convert task changes into state transition events
+
+    :param attempt: Attempt of tasks
+    :param changes: Changes from :meth:`tdworkflow.tracker.TaskTracker.poll`
+    :return: List of events
+    """
+    events = []
+    for change in changes:
+        if not change.state_changed:
+            continue
+        task, before = change.task, change.previous_state
+        if before is None and task.state in _PENDING_STATES:
+            continue
+        events.append(WatchEvent(task_event_kind(task.state), attempt, task, before))
+    return events
+
+
+class Subscription:
+    """Handle of a subscription returned by :meth:`Watcher.subscribe`"""
+
+    def __init__(self, watcher: "Watcher", attempt_id: int, callback: Callback):
+        self.watcher = watcher
+        self.attempt_id = attempt_id
+        self.callback = callback
+
+    def cancel(self) -> None:
+        self.watcher.unsubscribe(self)
+
+
+class Watcher:
+    """Shared scheduler polling attempts and emitting state transitions
+
+    Each attempt is polled once per interval however many subscribers watch
+    it, and the transitions are fanned out to all of them. Tasks are kept in a
+    :class:`tdworkflow.tracker.TaskTracker` per attempt, so only changed tasks
+    are rebuilt on each poll. Subscriptions of an attempt are removed after it
+    finishes.
+
+    .. code-block:: python
+
+       >>> watcher = Watcher(client, interval=10)
+       >>> watcher.subscribe(attempt, lambda e: print(e.kind, e.task))
+       >>> watcher.subscribe_project("pandas-df", notify_slack)
+       >>> watcher.start()  # Poll in a background thread
+
+    :param client: Client
+    :param interval: Polling interval in seconds. Default 5 sec
+    """
+
+    def __init__(self, client: "Client", interval: float = 5.0) -> None:
+        self.client = client
+        self.interval = interval
+        self._lock = threading.RLock()
+        self._subscriptions: dict[int, list[Subscription]] = {}
+        self._trackers: dict[int, TaskTracker] = {}
+        self._projects: dict[str, tuple[int, list[Callback]]] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether there is any attempt or project to watch"""
+        with self._lock:
+            return bool(self._subscriptions or self._projects)
+
+    def subscribe(self, attempt: int | Attempt, callback: Callback) -> Subscription:
+        """Subscribe transitions of an attempt and its tasks
+
+        :param attempt: Attempt ID or Attempt object
+        :param callback: Function called with each :class:`WatchEvent`
+        :return: Subscription
+        """
+        attempt_id = attempt.id if isinstance(attempt, Attempt) else attempt
+        subscription = Subscription(self, attempt_id, callback)
+        with self._lock:
+            self._subscriptions.setdefault(attempt_id, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.attempt_id, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.attempt_id, None)
+                self._trackers.pop(subscription.attempt_id, None)
+
+    def subscribe_project(
+        self,
+        project: str | Project,
+        callback: Callback,
+        lookback: timedelta = timedelta(days=1),
+    ) -> None:
+        """Subscribe transitions of running and new attempts of a project
+
+        :param project: Project name or Project object
+        :param callback: Function called with each :class:`WatchEvent`
+        :param lookback: Watch running attempts created within this period.
+                         Default 1 day
+        """
+        project_name = project.name if isinstance(project, Project) else project
+        with self._lock:
+            if project_name in self._projects:
+                self._projects[project_name][1].append(callback)
+                return
+
+        # Watch attempts already running and remember the newest id. Attempts
+        # are listed from the newest, so stop at the first one older than cutoff
+        cutoff = datetime.now(timezone.utc) - lookback
+        last_id = 0
+        for attempt in self.client.iter_attempts(project=project_name):
+            if attempt.createdAt and attempt.createdAt < cutoff:
+                break
+            last_id = max(last_id, attempt.id)
+            if not attempt.done:
+                self.subscribe(attempt, callback)
+        with self._lock:
+            self._projects[project_name] = (last_id, [callback])
+
+    def unsubscribe_project(self, project: str | Project, callback: Callback) -> None:
+        """Unsubscribe a callback from a project and its attempts
+
+        :param project: Project name or Project object
+        :param callback: Callback passed to :meth:`subscribe_project`
+        """
+        project_name = project.name if isinstance(project, Project) else project
+        with self._lock:
+            if project_name in self._projects:
+                callbacks = self._projects[project_name][1]
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    del self._projects[project_name]
+            subscriptions = [
+                s
+                for subscriptions in self._subscriptions.values()
+                for s in subscriptions
+                if s.callback == callback
+            ]
+        for subscription in subscriptions:
+            self.unsubscribe(subscription)
+
+    def _discover(self) -> None:
+        with self._lock:
+            projects = list(self._projects.items())
+
+        for project_name, (last_id, callbacks) in projects:
+            new_attempts = []
+            for attempt in self.client.iter_attempts(project=project_name):
+                if attempt.id <= last_id:
+                    break
+                new_attempts.append(attempt)
+            for attempt in sorted(new_attempts, key=lambda a: a.id):
+                for callback in callbacks:
+                    self.subscribe(attempt, callback)
+                    self._notify([callback], WatchEvent("attempt_started", attempt))
+            if new_attempts:
+                newest = max(a.id for a in new_attempts)
+                with self._lock:
+                    self._projects[project_name] = (newest, callbacks)
+
+    def _notify(self, callbacks: Iterable[Callback], event: WatchEvent) -> None:
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.warning(f"Watch callback {callback!r} failed", exc_info=True)
+
+    def poll_once(self) -> None:
+        """Poll every watched attempt once and notify subscribers"""
+        self._discover()
+
+        with self._lock:
+            attempt_ids = list(self._subscriptions)
+
+        for attempt_id in attempt_ids:
+            with self._lock:
+                tracker = self._trackers.get(attempt_id)
+                if tracker is None:
+                    tracker = self._trackers[attempt_id] = TaskTracker(
+                        self.client, attempt_id
+                    )
+            attempt = self.client.attempt(attempt_id)
+            events = transitions(attempt, tracker.poll())
+            with self._lock:
+                subscriptions = list(self._subscriptions.get(attempt_id, []))
+            if attempt.done:
+                events.append(WatchEvent("attempt_finished", attempt))
+
+            callbacks = [s.callback for s in subscriptions]
+            for event in events:
+                self._notify(callbacks, event)
+
+            if attempt.done:
+                for subscription in subscriptions:
+                    self.unsubscribe(subscription)
+
+    def run(self) -> None:
+        """Poll until :meth:`stop` is called or nothing is left to watch"""
+        while not self._stop.is_set() and self.active:
+            try:
+                self.poll_once()
+            except Exception:
+                logger.warning("Failed to poll attempts", exc_info=True)
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Start polling in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+def watch(
+    client: "Client",
+    attempts: Iterable[int | Attempt] = (),
+    projects: Iterable[str | Project] = (),
+    interval: float = 5.0,
+    watcher: Watcher | None = None,
+) -> Iterator[WatchEvent]:
+    """Watch attempts and projects, and yield state transitions
+
+    It stops after all attempts finish if no project is watched.
+
+    Pass a shared :class:`Watcher` to coalesce polls of concurrent ``watch()``
+    calls. It is started in a background thread on the first iteration, and
+    the subscriptions of this call are removed from it when the iterator
+    finishes or is closed.
+
+    .. code-block:: python
+
+       >>> for event in watch(client, attempts=[attempt]):
+       ...     if event.kind == "failed":
+       ...         print(f"{event.task.fullName} failed: {event.task.error}")
+
+    :param client: Client
+    :param attempts: Attempt IDs or Attempt objects
+    :param projects: Project names or Project objects
+    :param interval: Polling interval in seconds. Default 5 sec. Ignored if
+                     ``watcher`` is given
+    :param watcher: Shared watcher, optional. By default, a private watcher is
+                    polled while iterating
+    :return: Iterator of :class:`WatchEvent`
+    """
+    shared = watcher is not None
+    if watcher is None:
+        watcher = Watcher(client, interval)
+    # Subscribe eagerly, so that no transition is missed before iterating
+    events: queue.Queue[WatchEvent] = queue.Queue()
+    subscriptions = [watcher.subscribe(attempt, events.put) for attempt in attempts]
+    project_names = []
+    for project in projects:
+        watcher.subscribe_project(project, events.put)
+        project_names.append(project.name if isinstance(project, Project) else project)
+    return _iter_events(watcher, shared, events, subscriptions, project_names)
+
+
+def _iter_events(
+    watcher: Watcher,
+    shared: bool,
+    events: "queue.Queue[WatchEvent]",
+    subscriptions: list[Subscription],
+    project_names: list[str],
+) -> Iterator[WatchEvent]:
+    pending = {subscription.attempt_id for subscription in subscriptions}
+    if shared:
+        watcher.start()
+    try:
+        polled = False
+        while pending or project_names:
+            if shared:
+                try:
+                    event = events.get(timeout=watcher.interval)
+                except queue.Empty:
+                    # Start the watcher, or restart it if it stopped
+                    watcher.start()
+                    continue
+            elif events.empty():
+                if polled:
+                    time.sleep(watcher.interval)
+                watcher.poll_once()
+                polled = True
+                continue
+            else:
+                event = events.get_nowait()
+
+            if event.kind == "attempt_finished":
+                pending.discard(event.attempt.id)
+            yield event
+    finally:
+        for subscription in subscriptions:
+            subscription.cancel()
+        for project_name in project_names:
+            watcher.unsubscribe_project(project_name, events.put)
@@ -0,0 +1,70 @@
+import os
+import tarfile
+import time
+
+from tdworkflow import archive_cache
+from tdworkflow.archive_cache import ArchiveCache
+from tdworkflow.client import Client
+
+
+def write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def read_archive(data):
+    files = {}
+    with tarfile.open(mode="r:gz", fileobj=data) as tar:
+        for t in tar:
+            f = tar.extractfile(t)
+            if f:
+                files[t.name] = f.read()
+    return files
+
+
+def test_archive_cache(tmp_path, mocker):
+    project = tmp_path / "project"
+    project.mkdir()
+    old = time.time_ns() - 60 * 10**9
+    write(project / "main.dig", "+task:\n  sh>: echo hello\n", old)
+    write(project / "data.csv", "a,b\n", old)
+    cache = ArchiveCache(str(tmp_path / "cache"))
+    hash_file = mocker.spy(archive_cache, "_hash_file")
+
+    first = read_archive(cache.archive(str(project), []))
+    assert (cache.hits, cache.misses, hash_file.call_count) == (0, 1, 2)
+
+    # Nothing changed, so no file is read
+    assert read_archive(cache.archive(str(project), [])) == first
+    assert (cache.hits, cache.misses, hash_file.call_count) == (1, 1, 2)
+
+    # Touched but unchanged files are only hashed
+    write(project / "data.csv", "a,b\n", old + 10**9)
+    assert read_archive(cache.archive(str(project), [])) == first
+    assert (cache.hits, cache.misses, hash_file.call_count) == (2, 1, 3)
+
+    write(project / "data.csv", "a,b\n1,2\n", old + 2 * 10**9)
+    assert read_archive(cache.archive(str(project), []))["data.csv"] == b"a,b\n1,2\n"
+    assert (cache.hits, cache.misses, hash_file.call_count) == (2, 2, 4)
+
+    # Options are a part of the cache key
+    cache.archive(str(project), [], compresslevel=1)
+    assert cache.misses == 3
+
+
+def test_create_project_with_archive_cache(tmp_path, mocker):
+    client = Client(site="us", apikey="APIKEY")
+    mocker.patch.object(client, "put", return_value={"id": "1", "name": "p"})
+    cache = ArchiveCache(str(tmp_path / "cache"))
+    exclude_patterns = ["data.csv"]
+
+    for _ in range(2):
+        client.create_project(
+            "p",
+            "tests/resources/sample_project",
+            exclude_patterns=exclude_patterns,
+            archive_cache=cache,
+        )
+
+    assert exclude_patterns == ["data.csv"]
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,152 @@
+from dataclasses import asdict
+
+from tdworkflow.attempt import Attempt
+from tdworkflow.bulk import (
+    BackfillRequest,
+    bulk_backfill,
+    bulk_disable_schedules,
+    bulk_skip_schedules,
+    rollback_schedules,
+    wait_backfill,
+)
+from tdworkflow.exceptions import HttpError
+from tdworkflow.schedule import Schedule, ScheduleAttempt
+
+
+class FakeClient:
+    def __init__(self):
+        self.backfills = []
+        self.polls = {}
+
+    def backfill_schedule(self, schedule, attempt_name, from_time, dry_run, count):
+        if schedule == 3:
+            raise HttpError("404 Client Error")
+        self.backfills.append((schedule, attempt_name, dry_run))
+        attempts = [{"id": str(schedule * 10 + i)} for i in range(count or 1)]
+        return ScheduleAttempt(id=schedule, attempts=attempts)
+
+    def attempt(self, attempt_id):
+        self.polls[attempt_id] = self.polls.get(attempt_id, 0) + 1
+        done = self.polls[attempt_id] >= 2
+        return Attempt(id=attempt_id, done=done, success=attempt_id != 11)
+
+
+def test_bulk_backfill(mocker):
+    mocker.patch("time.sleep")
+    client = FakeClient()
+    requests = [
+        BackfillRequest(1, "2024-05-01T00:00:00Z", count=2),
+        BackfillRequest(2, "2024-05-01T00:00:00Z", attempt_name="retry"),
+        BackfillRequest(3, "2024-05-01T00:00:00Z"),
+    ]
+
+    plan = bulk_backfill(client, requests, "outage", dry_run=True)
+    assert [len(r.attempts) for r in plan] == [2, 1, 0]
+    assert not plan[2].ok
+
+    results = bulk_backfill(client, requests, "outage", concurrency=2)
+    assert sorted(client.backfills[2:]) == [(1, "outage", False), (2, "retry", False)]
+
+    reports = []
+    progress = wait_backfill(client, results, interval=0, on_progress=reports.append)
+    assert [str(p) for p in reports] == [
+        "0/3 finished (0 succeeded, 0 failed)",
+        "3/3 finished (2 succeeded, 1 failed)",
+    ]
+    assert progress.done
+    # Finished attempts aren't polled again
+    assert client.polls == {10: 2, 11: 2, 20: 2}
+
+
+def make_schedule(schedule_id, project="p1", disabled=False):
+    return Schedule(
+        id=schedule_id,
+        project={"id": "1", "name": project},
+        workflow={"id": "2", "name": "wf"},
+        disabledAt="2024-05-01T00:00:00Z" if disabled else None,
+    )
+
+
+class FakeScheduleClient:
+    def __init__(self, schedules):
+        self.schedules = {s.id: s for s in schedules}
+        self.posts = []
+        self.skips = []
+
+    def get(self, path, params=None):
+        if params and params.get("last_id"):
+            return {"schedules": []}
+        return {"schedules": [asdict(s) for s in self.schedules.values()]}
+
+    def schedule(self, schedule_id):
+        return self.schedules[schedule_id]
+
+    def _set(self, schedule, disabled):
+        self.posts.append((schedule.id, disabled))
+        updated = make_schedule(schedule.id, schedule.project.name, disabled)
+        self.schedules[schedule.id] = updated
+        return updated
+
+    def disable_schedule(self, schedule):
+        if schedule.id == 4:
+            raise HttpError("500 Server Error")
+        return self._set(schedule, True)
+
+    def enable_schedule(self, schedule):
+        return self._set(schedule, False)
+
+    def skip_schedule(self, schedule, from_time, next_time, next_run_time, dry_run):
+        self.skips.append((schedule.id, dry_run))
+        return schedule
+
+
+def test_bulk_disable_and_rollback(tmp_path):
+    client = FakeScheduleClient(
+        [
+            make_schedule(1),
+            make_schedule(2, disabled=True),
+            make_schedule(3),
+            make_schedule(4),
+            make_schedule(5, project="p2"),
+        ]
+    )
+    snapshot_path = str(tmp_path / "snapshot.json")
+
+    plan = bulk_disable_schedules(client, project="p1", dry_run=True)
+    assert [(r.schedule.id, r.changed) for r in plan] == [
+        (1, True),
+        (2, False),
+        (3, True),
+        (4, True),
+    ]
+    assert client.posts == []
+
+    results = bulk_disable_schedules(
+        client, project="p1", rate_limit=1000, snapshot_path=snapshot_path
+    )
+    assert [r.ok for r in results] == [True, True, True, False]
+    assert sorted(client.posts) == [(1, True), (3, True)]
+
+    client.posts.clear()
+    results = rollback_schedules(client, snapshot_path)
+    assert sorted(client.posts) == [(1, False), (3, False)]
+    assert all(r.ok for r in results)
+    assert client.schedules[2].disabledAt is not None
+
+
+def test_bulk_skip_dry_run(tmp_path, caplog):
+    client = FakeScheduleClient([make_schedule(1), make_schedule(2)])
+    snapshot_path = tmp_path / "snapshot.json"
+
+    with caplog.at_level("INFO", logger="tdworkflow.bulk"):
+        plan = bulk_skip_schedules(
+            client,
+            next_time="2024-06-01",
+            dry_run=True,
+            snapshot_path=str(snapshot_path),
+        )
+    assert all(r.ok and r.changed for r in plan)
+    # The skip API is called in dry run mode
+    assert sorted(client.skips) == [(1, True), (2, True)]
+    assert not snapshot_path.exists()
+    assert "Would skip 2 of 2 schedules" in caplog.text
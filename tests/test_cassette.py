@@ -0,0 +1,164 @@
+import gzip
+import json
+import time
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from tdworkflow import exceptions
+from tdworkflow.cassette import Cassette
+from tdworkflow.client import Client
+from tdworkflow.log_search import search_logs
+from tdworkflow.upload import UploadBody
+
+ATTEMPT = {"id": "1", "done": True, "status": "success"}
+LOG = gzip.compress(b"2019-11-01 07:00:22.000 +0000 [INFO] hello\n")
+LOG_FILE = {
+    "fileName": "+simple@example.log.gz",
+    "fileSize": len(LOG),
+    "taskName": "+simple",
+    "fileTime": "2019-11-01T07:00:22Z",
+    "agentId": "agent",
+    "direct": None,
+}
+ARCHIVE = b"archive" * 100
+TASK = {
+    "id": "2",
+    "fullName": "+simple+echo",
+    "parentId": None,
+    "config": {},
+    "upstreams": [],
+    "state": "success",
+    "cancelRequested": False,
+    "exportParams": {},
+    "storeParams": {},
+    "stateParams": {},
+    "updatedAt": "2019-11-01T07:00:22Z",
+    "retryAt": None,
+    "startedAt": "2019-11-01T07:00:21Z",
+    "error": {},
+    "isGroup": False,
+}
+
+
+def fake_send(request, *args, **kwargs):
+    response = requests.Response()
+    response.status_code = 200
+    response.request = request
+    response.url = request.url
+    if request.url.endswith("/files"):
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response._content = json.dumps({"files": [LOG_FILE]}).encode()
+    elif "/files/" in request.url:
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/gzip"})
+        response._content = LOG
+    elif request.url.endswith("/tasks"):
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response._content = json.dumps({"tasks": [TASK]}).encode()
+    elif "Range" in request.headers:
+        start, end = map(int, request.headers["Range"][len("bytes=") :].split("-"))
+        response.status_code = 206
+        response.headers = CaseInsensitiveDict(
+            {"Content-Range": f"bytes {start}-{end}/{len(ARCHIVE)}", "ETag": '"v1"'}
+        )
+        response._content = ARCHIVE[start : end + 1]
+    elif "/archive" in request.url:
+        response.headers = CaseInsensitiveDict({"ETag": '"v1"'})
+        response._content = ARCHIVE
+    else:
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response._content = b'{"id": "1", "done": true, "status": "success"}'
+    return response
+
+
+def test_record_and_replay(tmp_path, mocker):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    mocker.patch.object(HTTPAdapter, "send", side_effect=fake_send)
+
+    with Cassette(path, mode="record") as cassette:
+        client = Client(endpoint="digdag.example.com", apikey="KEY", cassette=cassette)
+        recorded_attempt = client.attempt(1)
+        recorded_log = client.log_file(1, "+simple@example.log.gz")
+
+    with gzip.open(path, "rt") as f:
+        assert "KEY" not in f.read()
+
+    mocker.stopall()
+    cassette = Cassette(path, mode="replay")
+    assert len(cassette) == 2
+    client = Client(endpoint="digdag.example.com", apikey="KEY", cassette=cassette)
+    assert client.attempt(1) == recorded_attempt
+    # The last response is repeated for polling
+    assert client.attempt(1) == recorded_attempt
+    assert client.log_file(1, "+simple@example.log.gz") == recorded_log
+
+    with pytest.raises(exceptions.CassetteError):
+        client.attempt(2)
+
+
+def test_replay_streamed_and_ranged_requests(tmp_path, mocker):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    mocker.patch.object(HTTPAdapter, "send", side_effect=fake_send)
+
+    with Cassette(path, mode="record") as cassette:
+        client = Client(endpoint="digdag.example.com", apikey="KEY", cassette=cassette)
+        recorded_tasks = list(client.iter_attempt_tasks(1))
+        recorded_matches = list(search_logs(client, 1, "hello"))
+        mocker.patch.object(client, "project_revisions", return_value=[])
+        client.download_project_archive(
+            1, str(tmp_path / "a.tar.gz"), revision="r1", parallel=2
+        )
+        client.download_project_archive(1, str(tmp_path / "a.tar.gz"), revision="r1")
+
+    mocker.stopall()
+    cassette = Cassette(path, mode="replay")
+    client = Client(endpoint="digdag.example.com", apikey="KEY", cassette=cassette)
+    assert recorded_tasks
+    assert list(client.iter_attempt_tasks(1)) == recorded_tasks
+    assert [m.line_number for m in recorded_matches] == [1]
+    assert list(search_logs(client, 1, "hello")) == recorded_matches
+
+    # Requests with and without Range are served separately in any order
+    mocker.patch.object(client, "project_revisions", return_value=[])
+    for parallel in [1, 2]:
+        client.download_project_archive(
+            1, str(tmp_path / "b.tar.gz"), revision="r1", parallel=parallel
+        )
+        with open(tmp_path / "b.tar.gz", "rb") as f:
+            assert f.read() == ARCHIVE
+
+
+def test_record_upload_body(tmp_path, mocker):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    mocker.patch.object(HTTPAdapter, "send", side_effect=fake_send)
+    progress = []
+    body = UploadBody(b"abc", on_progress=lambda *args: progress.append(args))
+
+    with Cassette(path, mode="record") as cassette:
+        client = Client(endpoint="digdag.example.com", apikey="KEY", cassette=cassette)
+        request = requests.Request("PUT", "https://example.com/", data=body)
+        cassette.record(client.http.prepare_request(request), fake_send(request), 0.1)
+
+    assert progress == []
+    with gzip.open(path, "rt") as f:
+        assert json.loads(f.readlines()[1])["requestBytes"] == 3
+
+
+def test_replay_realtime(tmp_path, mocker):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    mocker.patch.object(HTTPAdapter, "send", side_effect=fake_send)
+    with Cassette(path, mode="record") as cassette:
+        Client(endpoint="example.com", apikey="KEY", cassette=cassette).attempt(1)
+    mocker.stopall()
+
+    sleep = mocker.patch.object(time, "sleep")
+    cassette = Cassette(path, mode="replay", realtime=True)
+    Client(endpoint="example.com", apikey="KEY", cassette=cassette).attempt(1)
+    sleep.assert_called_once()
+
+
+def test_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(str(tmp_path / "cassette.jsonl.gz"), mode="append")
@@ -1,7 +1,10 @@
 import copy
 import datetime
+import gzip
 import io
 import json
+import subprocess
+import sys
 
 import pytest
 import requests
@@ -374,6 +377,23 @@ def test_create_client_with_endpoint():
     assert client.api_base == "https://digdag.example.com/api/"
 
 
+def test_lazy_import():
+    code = (
+        "import sys, tdworkflow; "
+        "assert 'requests' not in sys.modules; "
+        "assert tdworkflow.client.Client; "
+        "assert 'requests' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_create_client_session_lazily():
+    client = Client(site="us", apikey="APIKEY")
+    assert client._http_session is None
+    assert client.http is client.http
+    assert client._http_session is not None
+
+
 def test_create_client_with_scheme():
     session = requests.Session()
     client = Client(
@@ -634,6 +654,28 @@ class TestSessionAPI:
         s = self.client.sessions()
         assert [Session(**ss) for ss in RESP_DATA_GET_5["sessions"]] == s
 
+    def test_iter_sessions(self, mocker):
+        second_page = copy.deepcopy(RESP_DATA_GET_5)
+        second_page["sessions"][0]["id"] = "1"
+        pages = [RESP_DATA_GET_5, second_page, {"sessions": []}]
+
+        def get(url, params=None, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.raw = io.BytesIO(json.dumps(pages.pop(0)).encode())
+            return response
+
+        self.client._http = mocker.MagicMock()
+        self.client._http.get.side_effect = get
+
+        sessions = list(self.client.iter_sessions(page_size=1))
+        assert [s.id for s in sessions] == [
+            int(RESP_DATA_GET_5["sessions"][0]["id"]),
+            1,
+        ]
+        last_call = self.client._http.get.call_args_list[-1]
+        assert last_call[1]["params"] == {"page_size": 1, "last_id": "1"}
+
     def test_session(self, mocker):
         session = RESP_DATA_GET_5["sessions"][0]
         prepare_mock(self.client, mocker, ret_json=session)
@@ -671,6 +713,67 @@ class TestLogAPI:
         prepare_mock(self.client, mocker, ret_json=file, content=dummy_file.getvalue())
         f = self.client.log_file(attempt_id, file["fileName"])
         assert isinstance(f, str)
+        assert self.client.log_file(attempt_id, file["fileName"], "bytes") == b"abc"
+        assert (
+            self.client.log_file(attempt_id, file["fileName"], mode="gzip")
+            == dummy_file.getvalue()
+        )
+        with pytest.raises(ValueError):
+            self.client.log_file(attempt_id, file["fileName"], "binary")  # type: ignore
+
+    def test_iter_log_file(self, mocker):
+        attempt_id = int(RESP_DATA_GET_6["attempts"][0]["id"])
+        file = LogFile(**RESP_DATA_GET_7["files"][0])
+        compressed = gzip.compress(b"abc" * 1000)
+
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(compressed)
+        self.client._http = mocker.MagicMock()
+        self.client._http.get.return_value = response
+
+        chunks = list(self.client.iter_log_file(attempt_id, file, chunk_size=16))
+        assert b"".join(chunks) == compressed
+        assert len(chunks) > 1
+        assert self.client._http.get.call_args[1]["stream"] is True
+
+    def test_follow_logs(self, mocker):
+        sleep = mocker.patch("time.sleep")
+        attempt = RESP_DATA_GET_6["attempts"][0]
+        states = [False, False, False, True]
+        mocker.patch.object(
+            self.client,
+            "attempt",
+            side_effect=[Attempt(**dict(attempt, done=done)) for done in states],
+        )
+
+        def log_file(name, size, time):
+            return LogFile(name, "+wf+task", {}, size, "agent", time)
+
+        first = log_file("a.log.gz", 10, "2019-11-01T07:00:00Z")
+        second = log_file("b.log.gz", 10, "2019-11-01T07:00:10Z")
+        grown = log_file("b.log.gz", 20, "2019-11-01T07:00:10Z")
+        mocker.patch.object(
+            self.client,
+            "log_files",
+            side_effect=[[second, first], [first, second], [first, grown], [grown]],
+        )
+        # Trailing lines without newlines are partially written
+        contents = {
+            ("a.log.gz", 10): "a1\na2",
+            ("b.log.gz", 10): "b1\nb2 par",
+            ("b.log.gz", 20): "b1\nb2 partial\nb3",
+        }
+        mocker.patch.object(
+            self.client,
+            "log_file",
+            side_effect=lambda _, f: contents[f.fileName, f.fileSize],
+        )
+
+        lines = list(self.client.follow_logs(int(attempt["id"]), max_interval=1.5))
+        assert lines == ["a1", "b1", "b2 partial", "a2", "b3"]
+        # Back off while no new log arrives, and reset once one does
+        assert [c.args[0] for c in sleep.call_args_list] == [1.0, 1.5, 1.0]
 
 
 class TestAttemptAPI:
@@ -683,6 +786,17 @@ class TestAttemptAPI:
         attempts = self.client.attempts()
         assert [Attempt(**a) for a in RESP_DATA_GET_6["attempts"]] == attempts
 
+    def test_iter_attempts(self, mocker):
+        second_page = copy.deepcopy(RESP_DATA_GET_6)
+        second_page["attempts"][0]["id"] = "62487259"
+        responses = [RESP_DATA_GET_6, second_page, {"attempts": []}]
+        prepare_mock(self.client, mocker, responses=responses)
+
+        attempts = list(self.client.iter_attempts(page_size=1))
+        assert [a.id for a in attempts] == [62487260, 62487259]
+        last_call = self.client._http.get.call_args_list[-1]
+        assert last_call[1]["params"] == {"page_size": 1, "last_id": "62487259"}
+
     def test_attempt(self, mocker):
         attempt = RESP_DATA_GET_6["attempts"][0]
         prepare_mock(self.client, mocker, ret_json=attempt)
@@ -701,6 +815,17 @@ class TestAttemptAPI:
         tasks = self.client.attempt_tasks(1)
         assert [Task(**t) for t in RESP_DATA_GET_8["tasks"]] == tasks
 
+    def test_iter_attempt_tasks(self, mocker):
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(json.dumps(RESP_DATA_GET_8).encode())
+        self.client._http = mocker.MagicMock()
+        self.client._http.get.return_value = response
+
+        tasks = self.client.iter_attempt_tasks(1)
+        assert [Task(**t) for t in RESP_DATA_GET_8["tasks"]] == list(tasks)
+        assert self.client._http.get.call_args[1]["stream"] is True
+
     def test_retried_attempts(self, mocker):
         prepare_mock(self.client, mocker, ret_json=RESP_DATA_GET_6)
         attempts = self.client.retried_attempts(RESP_DATA_GET_6["attempts"][0]["id"])
@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from tdworkflow.columnar import ColumnBuffer, fetch_columns
+
+ATTEMPT = {
+    "id": "12",
+    "project": {"id": "1", "name": "pandas-df"},
+    "workflow": {"name": "pandas-df", "id": "3"},
+    "sessionId": "5",
+    "sessionUuid": "a8fdb7c0-2a3b-4e6a-8f3c-1234",
+    "sessionTime": "2019-10-05T04:31:33+09:00",
+    "retryAttemptName": None,
+    "done": True,
+    "success": True,
+    "cancelRequested": False,
+    "params": {"last_session_time": "2019-10-05T04:31:33+09:00"},
+    "createdAt": "2019-10-04T19:31:34Z",
+    "finishedAt": "2019-10-04T19:32:01Z",
+    "status": "success",
+}
+
+
+def test_column_buffer():
+    buffer = ColumnBuffer("attempts")
+    buffer.extend([ATTEMPT, {"id": "11"}])
+
+    assert len(buffer) == 2
+    assert buffer.data["id"] == [12, 11]
+    assert buffer.data["project.name"] == ["pandas-df", None]
+    assert buffer.data["workflow.id"] == [3, None]
+    assert buffer.data["createdAt"][0] == datetime(
+        2019, 10, 4, 19, 31, 34, tzinfo=timezone.utc
+    )
+    assert buffer.data["done"] == [True, None]
+    assert buffer.data["params"][0] == (
+        '{"last_session_time": "2019-10-05T04:31:33+09:00"}'
+    )
+
+
+def test_column_buffer_schedules():
+    buffer = ColumnBuffer("schedules")
+    buffer.extend(
+        [
+            {
+                "id": "23494",
+                "project": {"id": "168037", "name": "python-tdworkflow"},
+                "workflow": {"id": "1624118", "name": "simple"},
+                "nextRunTime": "2019-11-01T07:00:00Z",
+                "nextScheduleTime": "2019-11-01T00:00:00+00:00",
+                "disabledAt": None,
+            }
+        ]
+    )
+
+    assert buffer.data["nextRunTime"] == [datetime(2019, 11, 1, 7, tzinfo=timezone.utc)]
+    assert buffer.data["nextScheduleTime"] == [
+        datetime(2019, 11, 1, tzinfo=timezone.utc)
+    ]
+    assert buffer.data["disabledAt"] == [None]
+
+
+def test_fetch_tasks():
+    tasks = {
+        "tasks": [
+            {"id": "7", "fullName": "+wf", "parentId": None, "upstreams": []},
+            {"id": "8", "fullName": "+wf+a", "parentId": "7", "upstreams": ["9"]},
+        ]
+    }
+
+    class FakeClient:
+        def get(self, path, params=None):
+            return tasks
+
+    buffer = fetch_columns(FakeClient(), "tasks", attempts=[12, 13], limit=3)
+    assert buffer.data["attemptId"] == [12, 12, 13]
+    assert buffer.data["parentId"] == [None, 7, None]
+    assert buffer.data["upstreams"] == [[], [9], []]
+
+
+def test_fetch_sessions_with_attempt_filters():
+    with pytest.raises(ValueError):
+        fetch_columns(object(), "sessions", project="pandas-df")
+
+
+def test_to_arrow():
+    pa = pytest.importorskip("pyarrow")
+    buffer = ColumnBuffer("attempts")
+    buffer.extend([ATTEMPT])
+
+    table = buffer.to_arrow()
+    assert table.num_rows == 1
+    assert table.schema.field("createdAt").type == pa.timestamp("us", tz="UTC")
+    assert table.schema.field("id").type == pa.int64()
+
+
+def test_to_pandas():
+    pd = pytest.importorskip("pandas")
+    buffer = ColumnBuffer("attempts")
+    buffer.extend([ATTEMPT])
+
+    df = buffer.to_pandas()
+    # The unit is ns before pandas 3 and us after
+    assert isinstance(df["createdAt"].dtype, pd.DatetimeTZDtype)
+    assert str(df["createdAt"].dtype.tz) == "UTC"
+    assert df["id"].tolist() == [12]
@@ -0,0 +1,116 @@
+import base64
+import hashlib
+import io
+import os
+
+import pytest
+import requests
+
+from tdworkflow.download import download_file, md5_file
+
+CONTENT = os.urandom(300_000)
+CONTENT_MD5 = base64.b64encode(hashlib.md5(CONTENT).digest()).decode()
+
+
+class FlakyReader(io.BytesIO):
+    def __init__(self, data, fail_after=None):
+        super().__init__(data)
+        self.fail_after = fail_after
+
+    def read(self, size=-1):
+        if self.fail_after is not None and self.tell() >= self.fail_after:
+            raise requests.exceptions.ChunkedEncodingError("Connection broken")
+        return super().read(size)
+
+
+class FakeServer:
+    def __init__(self, content=CONTENT, ranges=True, fail_after=None):
+        self.content = content
+        self.ranges = ranges
+        self.fail_after = fail_after
+        self.requests = []
+
+    def get_stream(self, path, params=None, headers=None):
+        range_header = (headers or {}).get("Range")
+        self.requests.append(range_header)
+        r = requests.Response()
+        r.headers["ETag"] = '"v1"'
+        body = self.content
+        if self.ranges and range_header:
+            start, end = range_header.removeprefix("bytes=").split("-")
+            end = int(end) if end else len(self.content) - 1
+            body = self.content[int(start) : end + 1]
+            r.status_code = 206
+            r.headers["Content-Range"] = f"bytes {start}-{end}/{len(self.content)}"
+        else:
+            r.status_code = 200
+        r.headers["Content-Length"] = str(len(body))
+        fail_after = self.fail_after
+        # Fail only the first response
+        self.fail_after = None
+        r.raw = FlakyReader(body, fail_after)
+        return r
+
+
+def test_download_file_resumes(tmp_path):
+    server = FakeServer(fail_after=100_000)
+    file_path = str(tmp_path / "archive.tar.gz")
+
+    size = download_file(server.get_stream, "archive", file_path, chunk_size=10_000)
+
+    assert size == len(CONTENT)
+    with open(file_path, "rb") as f:
+        assert f.read() == CONTENT
+    # The last received byte is requested again
+    assert server.requests == [None, "bytes=99999-"]
+    assert not os.path.exists(f"{file_path}.part")
+
+
+def test_download_file_resumes_part_file(tmp_path):
+    file_path = str(tmp_path / "archive.tar.gz")
+    with open(f"{file_path}.part", "wb") as f:
+        f.write(CONTENT[:50_000])
+
+    server = FakeServer()
+    download_file(server.get_stream, "archive", file_path, resume=True)
+    assert server.requests == ["bytes=49999-"]
+    assert md5_file(file_path) == CONTENT_MD5
+
+    # Servers ignoring Range are downloaded from the start
+    with open(f"{file_path}.part", "wb") as f:
+        f.write(b"x" * 400_000)
+    download_file(FakeServer(ranges=False).get_stream, "a", file_path, resume=True)
+    with open(file_path, "rb") as f:
+        assert f.read() == CONTENT
+
+
+def test_download_file_in_parallel(tmp_path):
+    server = FakeServer()
+    file_path = str(tmp_path / "archive.tar.gz")
+
+    download_file(
+        server.get_stream,
+        "archive",
+        file_path,
+        parallel=3,
+        part_size=100_000,
+        md5=CONTENT_MD5,
+    )
+
+    with open(file_path, "rb") as f:
+        assert f.read() == CONTENT
+    assert sorted(server.requests) == [
+        "bytes=0-0",
+        "bytes=0-99999",
+        "bytes=100000-199999",
+        "bytes=200000-299999",
+    ]
+    assert not os.path.exists(f"{file_path}.part.json")
+
+
+def test_download_file_verifies_md5(tmp_path):
+    file_path = str(tmp_path / "archive.tar.gz")
+    with pytest.raises(ValueError):
+        download_file(FakeServer().get_stream, "archive", file_path, md5="invalid")
+    assert not os.path.exists(file_path)
+    assert not os.path.exists(f"{file_path}.part")
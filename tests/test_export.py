@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from tdworkflow import cli
+from tdworkflow.export import Checkpoint, export, export_resource
+
+
+class FakeClient:
+    def __init__(self, n_attempts=5, fail_at=None):
+        self.attempts = [{"id": str(i), "status": "success"} for i in range(1, 6)]
+        self.attempts = self.attempts[:n_attempts]
+        self.fail_at = fail_at
+        self.calls = 0
+
+    def get(self, path, params=None):
+        self.calls += 1
+        if self.fail_at is not None and self.calls >= self.fail_at:
+            raise KeyboardInterrupt
+        params = params or {}
+        if path == "attempts":
+            last_id = int(params.get("last_id") or 1 << 62)
+            items = [a for a in reversed(self.attempts) if int(a["id"]) < last_id]
+            return {"attempts": items[: params.get("page_size", 100)]}
+        if path == "schedules":
+            return {"schedules": [] if params.get("last_id") else [{"id": "1"}]}
+        if path == "sessions":
+            return {"sessions": []}
+        attempt_id = path.split("/")[1]
+        return {"tasks": [{"id": f"{attempt_id}0", "state": "success"}]}
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_export(tmp_path):
+    rows = export(FakeClient(), str(tmp_path), page_size=2)
+
+    assert rows == {"attempts": 5, "sessions": 0, "schedules": 1, "tasks": 5}
+    attempts = read_jsonl(tmp_path / "attempts.jsonl")
+    assert [a["id"] for a in attempts] == ["5", "4", "3", "2", "1"]
+    tasks = read_jsonl(tmp_path / "tasks.jsonl")
+    assert tasks[0] == {"attemptId": 5, "id": "50", "state": "success"}
+
+
+def test_export_resume(tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    with pytest.raises(KeyboardInterrupt):
+        export_resource(
+            FakeClient(fail_at=3),
+            "attempts",
+            str(tmp_path),
+            checkpoint=Checkpoint(checkpoint_path),
+            page_size=2,
+        )
+    state = Checkpoint(checkpoint_path).get("attempts")
+    assert state["last_id"] == 2
+    assert not state.get("done")
+
+    # Simulate a partial write after the last checkpoint
+    with open(tmp_path / "attempts.jsonl", "a") as f:
+        f.write('{"id":"1"}\n')
+
+    rows = export_resource(
+        FakeClient(),
+        "attempts",
+        str(tmp_path),
+        checkpoint=Checkpoint(checkpoint_path),
+        page_size=2,
+    )
+    assert rows == 5
+    attempts = read_jsonl(tmp_path / "attempts.jsonl")
+    assert [a["id"] for a in attempts] == ["5", "4", "3", "2", "1"]
+
+
+def test_cli_export(tmp_path, mocker, capsys):
+    mocker.patch("tdworkflow.cli._client", return_value=FakeClient())
+
+    status = cli.main(["export", str(tmp_path), "-r", "attempts", "-r", "tasks"])
+    assert status == 0
+    assert capsys.readouterr().out == "attempts\t5\ntasks\t5\n"
+    assert Checkpoint(str(tmp_path / "checkpoint.json")).get("tasks")["done"]
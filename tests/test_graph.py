@@ -0,0 +1,79 @@
+import pytest
+
+from tdworkflow.graph import TaskGraph
+from tdworkflow.task import Task
+
+
+def make_task(task_id, name, parent=None, upstreams=None, state="success", span=None):
+    started, updated = span or (None, None)
+    return Task(
+        id=task_id,
+        state=state,
+        fullName=name,
+        parentId=parent,
+        upstreams=upstreams,
+        startedAt=None if span is None else f"2019-12-15T07:{started:02d}:00Z",
+        updatedAt=None if span is None else f"2019-12-15T07:{updated:02d}:00Z",
+        isGroup=span is None,
+    )
+
+
+@pytest.fixture
+def graph():
+    # +wf
+    #   +a (0-5)
+    #   +g (upstream +a)
+    #     +b (5-7)
+    #     +c (5-15)
+    #   +d (upstream +g, 15-16)
+    #   +e (upstream +a, 5-9)
+    return TaskGraph(
+        [
+            make_task(1, "+wf", state="group_error"),
+            make_task(2, "+wf+a", 1, span=(0, 5)),
+            make_task(3, "+wf+g", 1, [2], state="group_error"),
+            make_task(4, "+wf+g+b", 3, span=(5, 7)),
+            make_task(5, "+wf+g+c", 3, state="error", span=(5, 15)),
+            make_task(6, "+wf+d", 1, [3], state="canceled", span=(15, 16)),
+            make_task(7, "+wf+e", 1, [2], span=(5, 9)),
+        ]
+    )
+
+
+def test_indexes(graph):
+    assert len(graph) == 7
+    assert graph.find("+wf+g+c").id == 5
+    assert graph.parent(4).id == 3
+    assert [t.id for t in graph.children_of(3)] == [4, 5]
+    assert [t.id for t in graph.downstreams_of(2)] == [3, 7]
+    assert [t.id for t in graph.with_state("canceled")] == [6]
+    assert [t.id for t in graph.subtree(3)] == [3, 4, 5]
+    assert graph.roots == [1]
+
+
+def test_failed_leaves(graph):
+    assert [t.fullName for t in graph.failed_leaves()] == ["+wf+g+c"]
+
+
+def test_topological_order(graph):
+    order = [t.id for t in graph.topological_order()]
+    assert order.index(1) < order.index(2) < order.index(3) < order.index(4)
+    assert order.index(3) < order.index(6)
+
+    cyclic = TaskGraph(
+        [make_task(1, "+a", upstreams=[2]), make_task(2, "+b", upstreams=[1])]
+    )
+    with pytest.raises(ValueError):
+        cyclic.topological_order()
+
+
+def test_critical_path(graph):
+    assert [t.fullName for t in graph.critical_path()] == [
+        "+wf+a",
+        "+wf+g+c",
+        "+wf+d",
+    ]
+
+
+def test_longest_tasks(graph):
+    assert [(t.id, d) for t, d in graph.longest_tasks(2)] == [(5, 600.0), (2, 300.0)]
@@ -0,0 +1,91 @@
+import pytest
+import requests
+
+from tdworkflow import exceptions
+from tdworkflow.client import Client
+from tdworkflow.hooks import Hook, LatencyHistogram, path_template
+
+
+class RecordingHook(Hook):
+    def __init__(self):
+        self.calls = []
+
+    def before_request(self, event):
+        self.calls.append(("before_request", event.endpoint, event.status))
+
+    def after_response(self, event):
+        self.calls.append(("after_response", event.endpoint, event.status))
+
+    def on_error(self, event):
+        self.calls.append(("on_error", event.endpoint, event.status))
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("attempts", "attempts"),
+        ("attempts/123", "attempts/{id}"),
+        ("attempts/123/tasks", "attempts/{id}/tasks"),
+        ("logs/1/files/+simple+task.log.gz", "logs/{id}/files/{name}"),
+        ("projects/1/secrets/td.apikey", "projects/{id}/secrets/{name}"),
+        ("projects/1/secrets/", "projects/{id}/secrets/"),
+    ],
+)
+def test_path_template(path, expected):
+    assert path_template(path) == expected
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    for i in range(1, 101):
+        histogram.observe("GET attempts", i / 100)
+
+    assert histogram.count("GET attempts") == 100
+    assert histogram.percentile("GET attempts", 50) == pytest.approx(0.5, rel=0.1)
+    assert histogram.percentile("GET attempts", 99) == pytest.approx(0.99, rel=0.1)
+    assert histogram.percentile("GET unknown", 50) is None
+    assert list(histogram.report()) == ["GET attempts"]
+
+
+def test_client_hooks(mocker):
+    hook = RecordingHook()
+    histogram = LatencyHistogram()
+    client = Client(site="us", apikey="APIKEY", hooks=[hook])
+    client.add_hook(histogram)
+    client._http = mocker.MagicMock()
+    response = client._http.get.return_value
+    response.status_code = 200
+    response.content = b'{"tasks": []}'
+    response.json.return_value = {"tasks": []}
+
+    client.attempt_tasks(1)
+
+    assert hook.calls == [
+        ("before_request", "GET attempts/{id}/tasks", None),
+        ("after_response", "GET attempts/{id}/tasks", 200),
+    ]
+    assert histogram.count("GET attempts/{id}/tasks") == 1
+
+
+def test_client_hooks_on_error(mocker):
+    hook = RecordingHook()
+    client = Client(site="us", apikey="APIKEY", hooks=[hook])
+    client._http = mocker.MagicMock()
+    response = client._http.get.return_value
+    response.status_code = 404
+    response.content = b""
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError()
+
+    with pytest.raises(exceptions.HttpError):
+        client.attempt(1)
+
+    assert [c[0] for c in hook.calls] == [
+        "before_request",
+        "after_response",
+        "on_error",
+    ]
+
+    client._http.get.side_effect = requests.exceptions.ConnectionError()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.attempt(1)
+    assert hook.calls[-1] == ("on_error", "GET attempts/{id}", None)
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from tdworkflow.json_stream import iter_json_array, iter_resources
+
+
+def chunked(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+DOCUMENT = {
+    "meta": {"next": [1, 2.5, None, True], "name": "café ☃"},
+    "tasks": [
+        {"id": "1", "fullName": "+wf+é", "params": {}},
+        {"id": "2", "upstreams": [], "retryCount": 12345},
+        [],
+        -1.5e3,
+    ],
+    "after": "unused",
+}
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 100, 1_000_000])
+def test_iter_json_array(size):
+    data = json.dumps(DOCUMENT, ensure_ascii=False, indent=2).encode()
+    items = list(iter_json_array(chunked(data, size), "tasks"))
+    assert items == DOCUMENT["tasks"]
+
+
+@pytest.mark.parametrize("text", ['{"tasks": []}', " { } ", '{"other": [1]}'])
+def test_iter_json_array_empty(text):
+    assert list(iter_json_array([text.encode()], "tasks")) == []
+
+
+@pytest.mark.parametrize("text", ['{"tasks": [{"id": "1"}', "[1, 2]", ""])
+def test_iter_json_array_invalid(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunked(text.encode(), 4), "tasks"))
+
+
+def test_iter_resources():
+    requested = []
+
+    class FakeResponse:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self.closed = True
+
+        def iter_content(self, chunk_size):
+            return chunked(json.dumps(DOCUMENT).encode(), chunk_size)
+
+    response = FakeResponse()
+
+    def get_stream(path, params=None, headers=None):
+        requested.append((path, params))
+        return response
+
+    items = iter_resources(get_stream, "attempts/1/tasks", "tasks", chunk_size=5)
+    assert next(items) == DOCUMENT["tasks"][0]
+    assert list(items) == DOCUMENT["tasks"][1:]
+    assert requested == [("attempts/1/tasks", None)]
+    assert response.closed
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tdworkflow.log_parser import COLUMNS, LogRecord, parse_batches, parse_log
+
+LOG = """\
+2019-10-30 08:34:51.672 +0000 [INFO] (0250@[1:pandas-df]+pandas-df+read_into_df) io.digdag.core.agent.OperatorManager: py>: py_scripts.examples.read_td_table
+2019-10-30 17:34:59.879 +0900 [ERROR] (0250@[1:pandas-df]+pandas-df+read_into_df) io.digdag.core.agent.OperatorManager: Task failed
+Traceback (most recent call last):
+  File "main.py", line 1, in <module>
+ValueError: boom
+2019-10-30 08:35:00.000 +0000 [INFO] (main) io.digdag.cli.Main:
+"""  # noqa: E501
+
+
+def test_parse_log():
+    records = parse_log(LOG.encode())
+
+    assert records[0] == LogRecord(
+        time=datetime(2019, 10, 30, 8, 34, 51, 672000, tzinfo=timezone.utc),
+        level="INFO",
+        thread="0250",
+        site_id=1,
+        project="pandas-df",
+        task="+pandas-df+read_into_df",
+        logger="io.digdag.core.agent.OperatorManager",
+        message="py>: py_scripts.examples.read_td_table",
+    )
+    assert records[1].time == datetime(
+        2019, 10, 30, 17, 34, 59, 879000, tzinfo=timezone(timedelta(hours=9))
+    )
+    assert records[1].message.splitlines() == [
+        "Task failed",
+        "Traceback (most recent call last):",
+        '  File "main.py", line 1, in <module>',
+        "ValueError: boom",
+    ]
+    assert (records[2].thread, records[2].project, records[2].message) == (
+        "main",
+        None,
+        "",
+    )
+
+
+def test_parse_log_without_header():
+    records = parse_log("Wait running a command task\n" + LOG)
+    assert records[0].time is None
+    assert records[0].message == "Wait running a command task"
+    assert len(records) == 4
+
+
+def test_parse_batches():
+    lines = LOG.splitlines(keepends=True)
+    batches = list(parse_batches(lines, batch_size=2))
+
+    assert [len(b["time"]) for b in batches] == [2, 1]
+    assert all(list(b) == list(COLUMNS) for b in batches)
+    assert batches[0]["level"] == ["INFO", "ERROR"]
+    assert batches[0]["message"][1].endswith("ValueError: boom")
+    records = parse_log(LOG)
+    assert [r.message for r in records] == [m for b in batches for m in b["message"]]
+
+    with pytest.raises(ValueError):
+        list(parse_batches(lines, batch_size=0))
@@ -0,0 +1,72 @@
+import gzip
+import io
+import re
+
+import pytest
+import requests
+
+from tdworkflow.log import LogFile
+from tdworkflow.log_search import grep_lines, search_logs
+
+LOGS = {
+    "+wf+extract.log.gz": ["start", "ok", "done"],
+    "+wf+load.log.gz": ["start", "Traceback", "  File x", "ValueError", "end"],
+}
+
+
+class FakeClient:
+    def __init__(self):
+        self.streamed = []
+
+    def log_files(self, attempt):
+        return [
+            LogFile(name, name.rsplit(".log", 1)[0], {}, 0, "agent") for name in LOGS
+        ]
+
+    def get_stream(self, path, params=None):
+        file_name = path.split("/")[-1]
+        self.streamed.append(file_name)
+        r = requests.Response()
+        r.status_code = 200
+        r.raw = io.BytesIO(gzip.compress("\n".join(LOGS[file_name]).encode()))
+        return r
+
+
+def test_grep_lines():
+    lines = ["a", "x1", "b", "c", "x2", "d"]
+    matches = list(grep_lines(lines, re.compile(r"x\d"), context=1))
+    assert matches == [
+        (2, "x1", ["a"], ["b"]),
+        (5, "x2", ["c"], ["d"]),
+    ]
+
+
+def test_search_logs():
+    client = FakeClient()
+    matches = list(search_logs(client, 1, "Traceback|Error", context=1))
+
+    assert [(m.task_name, m.line_number, m.line) for m in matches] == [
+        ("+wf+load", 2, "Traceback"),
+        ("+wf+load", 4, "ValueError"),
+    ]
+    assert matches[0].before == ["start"]
+    assert matches[1].after == ["end"]
+
+
+@pytest.mark.parametrize(
+    "kwargs, streamed",
+    [
+        ({"tasks": "+wf+load*"}, ["+wf+load.log.gz"]),
+        ({"tasks": ["+wf+ext*"]}, ["+wf+extract.log.gz"]),
+    ],
+)
+def test_search_logs_task_filter(kwargs, streamed):
+    client = FakeClient()
+    list(search_logs(client, [1], "start", **kwargs))
+    assert client.streamed == streamed
+
+
+def test_search_logs_max_matches():
+    client = FakeClient()
+    matches = list(search_logs(client, 1, "start", max_matches=1, concurrency=1))
+    assert len(matches) == 1
@@ -0,0 +1,37 @@
+from tdworkflow.pagination import iter_pages
+
+ITEMS = [{"id": str(i)} for i in range(10, 0, -1)]
+
+
+def capped_get(max_page_size):
+    calls = []
+
+    def get(path, params):
+        calls.append(dict(params))
+        last_id = int(params.get("last_id", 11))
+        items = [item for item in ITEMS if int(item["id"]) < last_id]
+        return {"attempts": items[: min(params["page_size"], max_page_size)]}
+
+    return get, calls
+
+
+def test_iter_pages_capped_page_size():
+    get, calls = capped_get(max_page_size=3)
+    pages = list(iter_pages(get, "attempts", "attempts", page_size=5))
+
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    assert [item for page in pages for item in page] == ITEMS
+    assert calls[-1] == {"page_size": 5, "last_id": "1"}
+
+
+def test_iter_pages_stops_without_progress():
+    calls = []
+
+    def get(path, params):
+        calls.append(dict(params))
+        # last_id is ignored
+        return {"attempts": ITEMS[:2]}
+
+    pages = list(iter_pages(get, "attempts", "attempts"))
+    assert len(pages) == 2
+    assert len(calls) == 2
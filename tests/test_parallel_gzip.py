@@ -0,0 +1,31 @@
+import gzip
+import io
+import os
+
+import pytest
+
+from tdworkflow.parallel_gzip import ParallelGzipWriter
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_parallel_gzip_writer(threads):
+    data = os.urandom(100_000) + b"tdworkflow " * 50_000
+    out = io.BytesIO()
+    with ParallelGzipWriter(out, compresslevel=6, threads=threads) as gz:
+        for i in range(0, len(data), 30_000):
+            gz.write(data[i : i + 30_000])
+
+    assert gzip.decompress(out.getvalue()) == data
+    # Priming blocks with the previous window keeps the ratio of one stream
+    assert len(out.getvalue()) < len(gzip.compress(data, 6)) * 1.01
+    assert not out.closed
+
+
+def test_parallel_gzip_writer_empty():
+    out = io.BytesIO()
+    with ParallelGzipWriter(out):
+        pass
+    assert gzip.decompress(out.getvalue()) == b""
+
+    with pytest.raises(ValueError):
+        ParallelGzipWriter(out, compresslevel=10)
@@ -0,0 +1,97 @@
+import logging
+
+import requests
+
+from tdworkflow.client import Client
+from tdworkflow.request_log import RequestLogger
+
+
+def make_response(status_code=200, content=b"", content_type="application/json"):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers["Content-Type"] = content_type
+    response.request = requests.Request(
+        "GET",
+        "https://example.com/api/attempts",
+        headers={"Authorization": "TD1 1/secret", "User-Agent": "tdworkflow"},
+    ).prepare()
+    return response
+
+
+def test_request_logger_lazy(mocker):
+    request_logger = RequestLogger(logger=logging.getLogger("test.lazy"))
+    request_logger.logger.setLevel(logging.INFO)
+    spy = mocker.spy(request_logger, "format")
+
+    request_logger.log("get", "https://example.com", make_response(), 0.1, b"{}")
+    assert spy.call_count == 0
+
+
+def test_request_logger_redact_and_truncate(caplog):
+    request_logger = RequestLogger(
+        max_body_bytes=10,
+        secrets=["s3cr3t"],
+        logger=logging.getLogger("test.redact"),
+    )
+    body = b'{"value": "s3cr3t", "padding": "' + b"x" * 100 + b'"}'
+    with caplog.at_level(logging.DEBUG, logger="test.redact"):
+        request_logger.log(
+            "get", "https://example.com/api/attempts", make_response(), 0.1, body
+        )
+
+    message = caplog.records[0].getMessage()
+    assert "GET https://example.com/api/attempts -> 200" in message
+    assert "1/secret" not in message
+    assert "'Authorization': '***'" in message
+    assert "s3cr3t" not in message
+    assert f"({len(body) - 10} bytes truncated)" in message
+
+
+def test_request_logger_redact_before_truncate(caplog):
+    request_logger = RequestLogger(
+        max_body_bytes=16,
+        secrets=["s3cr3t-token"],
+        logger=logging.getLogger("test.boundary"),
+    )
+    # The secret starts before the limit and ends after it
+    body = b'{"token": "s3cr3t-token", "auth": "TD1 1/abcdefgh"}'
+    with caplog.at_level(logging.DEBUG, logger="test.boundary"):
+        request_logger.log("get", "https://example.com", make_response(), 0.1, body)
+
+    message = caplog.records[0].getMessage()
+    assert "s3cr" not in message
+    assert 'response: b\'{"token": "***"' in message
+
+
+def test_request_logger_binary_body(caplog):
+    request_logger = RequestLogger(logger=logging.getLogger("test.binary"))
+    response = make_response(content_type="application/gzip")
+    with caplog.at_level(logging.DEBUG, logger="test.binary"):
+        request_logger.log("get", "https://example.com", response, 0.1, b"\x1f" * 50)
+
+    assert "response: <50 bytes of application/gzip>" in caplog.records[0].getMessage()
+
+
+def test_request_logger_sampling(caplog):
+    request_logger = RequestLogger(
+        sample_rate=0.0, logger=logging.getLogger("test.sampling")
+    )
+    with caplog.at_level(logging.DEBUG, logger="test.sampling"):
+        request_logger.log("get", "https://example.com", make_response(), 0.1, b"{}")
+        assert len(caplog.records) == 0
+
+        failed = make_response(status_code=500)
+        request_logger.log("get", "https://example.com", failed, 0.1, b"{}")
+        assert len(caplog.records) == 1
+
+
+def test_client_redacts_apikey(caplog, mocker):
+    client = Client(site="us", apikey="1/APIKEY")
+    client._http = mocker.MagicMock()
+    client._http.get.return_value = make_response(content=b'{"key": "1/APIKEY"}')
+
+    with caplog.at_level(logging.DEBUG, logger="tdworkflow.client"):
+        client.get("attempts")
+
+    assert "1/APIKEY" not in caplog.text
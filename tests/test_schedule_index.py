@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+from tdworkflow.schedule import Schedule
+from tdworkflow.schedule_index import ScheduleIndex
+
+NOW = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def raw_schedule(schedule_id, project="p1", workflow="wf", minutes=0, disabled=False):
+    return {
+        "id": str(schedule_id),
+        "project": {"id": "1", "name": project},
+        "workflow": {"id": "2", "name": workflow},
+        "updatedAt": "2024-04-01T00:00:00Z",
+        "disabledAt": "2024-04-01T00:00:00Z" if disabled else None,
+        "nextRunTime": (NOW + timedelta(minutes=minutes)).isoformat(),
+    }
+
+
+class FakeClient:
+    def __init__(self, schedules):
+        self.schedules = {int(s["id"]): s for s in schedules}
+        self.calls = []
+
+    def get(self, path, params=None):
+        last_id = int((params or {}).get("last_id") or 0)
+        self.calls.append((path, last_id))
+        ids = sorted(i for i in self.schedules if i > last_id)
+        return {"schedules": [self.schedules[i] for i in ids]}
+
+    def schedule(self, schedule_id):
+        self.calls.append((f"schedules/{schedule_id}", None))
+        return Schedule.from_api_repr(**self.schedules[schedule_id])
+
+
+def test_queries():
+    index = ScheduleIndex(
+        schedules=[
+            Schedule.from_api_repr(**raw_schedule(1, minutes=30)),
+            Schedule.from_api_repr(**raw_schedule(2, minutes=90)),
+            Schedule.from_api_repr(**raw_schedule(3, "p2", minutes=10, disabled=True)),
+            Schedule.from_api_repr(**raw_schedule(4, "p2", "other", minutes=-5)),
+        ]
+    )
+
+    assert [s.id for s in index.due_within(timedelta(hours=1), NOW)] == [1]
+    assert [s.id for s in index.next_runs(end=NOW, include_disabled=True)] == [4]
+    assert [s.id for s in index.next_runs(include_disabled=True)] == [4, 3, 1, 2]
+    assert [s.id for s in index.find(project="p2")] == [3, 4]
+    assert [s.id for s in index.find(workflow="wf", disabled=False)] == [1, 2]
+    assert [s.id for s in index.find(disabled=True)] == [3]
+
+    index.remove(1)
+    assert index.due_within(timedelta(hours=1), NOW) == []
+    assert index.find(project="p1")[0].id == 2
+
+
+def test_refresh():
+    client = FakeClient([raw_schedule(1, minutes=-1), raw_schedule(2, minutes=50)])
+    index = ScheduleIndex(client)
+    assert index.refresh() == 2
+
+    client.schedules[1] = raw_schedule(1, minutes=59)
+    client.schedules[3] = raw_schedule(3, minutes=120)
+    client.calls.clear()
+    assert index.refresh(now=NOW) == 2
+    # Only the schedule whose nextRunTime passed and new schedules are fetched
+    assert client.calls == [
+        ("schedules/1", None),
+        ("schedules", 2),
+        ("schedules", 3),
+    ]
+    assert [s.id for s in index.due_within(timedelta(hours=1), NOW)] == [2, 1]
+
+    del client.schedules[2]
+    index.refresh(full=True)
+    assert 2 not in index
+    assert len(index) == 2
@@ -0,0 +1,77 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tdworkflow.client import Client
+from tdworkflow.singleflight import SingleFlight
+
+
+def test_single_flight():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def func():
+        calls.append(1)
+        release.wait()
+        return {"id": "1"}
+
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(single_flight.do, "key", func) for _ in range(4)]
+        while single_flight._calls.get("key") is None or (
+            single_flight._calls["key"].shared < 3
+        ):
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert single_flight.in_flight() == 0
+
+
+def test_single_flight_error():
+    single_flight = SingleFlight()
+
+    def func():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        single_flight.do("key", func)
+    assert single_flight.do("key", lambda: 1) == 1
+
+
+def wait_for_callers(single_flight, callers):
+    # Wait until every caller has registered as a leader or a follower
+    while True:
+        with single_flight._lock:
+            calls = list(single_flight._calls.values())
+        if sum(call.shared + 1 for call in calls) == callers:
+            return
+        time.sleep(0.001)
+
+
+def test_client_coalesce_gets(mocker):
+    client = Client(site="us", apikey="APIKEY", coalesce_gets=True)
+    release = threading.Event()
+
+    def request(method, path, **kwargs):
+        release.wait(timeout=10)
+        response = mocker.MagicMock()
+        response.status_code = 200
+        response.content = b"{}"
+        response.json.return_value = {"id": "1", "name": "pandas-df"}
+        return response
+
+    _request = mocker.patch.object(client, "_request", side_effect=request)
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(client.project, 1) for _ in range(3)]
+        futures.append(executor.submit(client.project, 2))
+        wait_for_callers(client._single_flight, 4)
+        release.set()
+        projects = [f.result() for f in futures]
+
+    assert _request.call_count == 2
+    assert len(projects) == 4
@@ -0,0 +1,72 @@
+from tdworkflow.client import Client
+from tdworkflow.sync import AttemptSync
+
+
+class FakeAttempts:
+    def __init__(self):
+        self.attempts = {}
+        self.calls = []
+
+    def add(self, attempt_id, done=False, status="running"):
+        self.attempts[attempt_id] = {"id": str(attempt_id), "done": done}
+        self.attempts[attempt_id]["status"] = status
+
+    def get(self, path, params=None):
+        self.calls.append(path)
+        if path == "attempts":
+            last_id = int(params.get("last_id") or 1 << 62)
+            ids = sorted((i for i in self.attempts if i < last_id), reverse=True)
+            page = ids[: params["page_size"]]
+            return {"attempts": [self.attempts[i] for i in page]}
+        return self.attempts[int(path.split("/")[1])]
+
+
+def make_client(fake):
+    client = Client(site="us", apikey="APIKEY")
+    client.get = fake.get
+    return client
+
+
+def test_sync(tmp_path):
+    fake = FakeAttempts()
+    fake.add(1, done=True, status="success")
+    fake.add(2)
+    fake.add(3)
+    state_path = str(tmp_path / "state.json")
+    sync = AttemptSync(make_client(fake), page_size=2, state_path=state_path)
+
+    events = sync.sync()
+    assert [(e.kind, e.attempt.id) for e in events] == [
+        ("created", 1),
+        ("finished", 1),
+        ("created", 2),
+        ("created", 3),
+    ]
+    assert sync.state.last_id == 3
+    assert sync.state.running == {2: "running", 3: "running"}
+
+    fake.add(2, done=True, status="error")
+    fake.add(4)
+    fake.calls.clear()
+    sync = AttemptSync(make_client(fake), page_size=2, state_path=state_path)
+    events = sync.sync()
+    assert [(e.kind, e.attempt.id, e.previous_status) for e in events] == [
+        ("status_changed", 2, "running"),
+        ("finished", 2, "running"),
+        ("created", 4, None),
+    ]
+    # Only running attempts are re-polled and a single page is fetched
+    assert fake.calls == ["attempts/2", "attempts/3", "attempts"]
+    assert sync.state.running == {3: "running", 4: "running"}
+
+
+def test_sync_filters_have_separate_state(tmp_path):
+    fake = FakeAttempts()
+    fake.add(1)
+    state_path = str(tmp_path / "state.json")
+    AttemptSync(make_client(fake), project="a", state_path=state_path).sync()
+
+    sync = AttemptSync(make_client(fake), project="b", state_path=state_path)
+    assert sync.state.last_id == 0
+    sync = AttemptSync(make_client(fake), project="a", state_path=state_path)
+    assert sync.state.last_id == 1
@@ -0,0 +1,84 @@
+import pytest
+
+from tdworkflow import tracing
+from tdworkflow.client import Client
+
+sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+export = pytest.importorskip("opentelemetry.sdk.trace.export")
+in_memory = pytest.importorskip(
+    "opentelemetry.sdk.trace.export.in_memory_span_exporter"
+)
+
+
+@pytest.fixture(scope="module")
+def exporter():
+    from opentelemetry import trace
+
+    exporter = in_memory.InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(export.SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return exporter
+
+
+@pytest.fixture
+def spans(exporter):
+    exporter.clear()
+    previous = tracing.enabled()
+    tracing.set_enabled(True)
+    yield exporter
+    tracing.set_enabled(previous)
+
+
+def test_resource_attributes():
+    assert tracing.resource_attributes("attempts/12/tasks") == {
+        "tdworkflow.resource": "attempts",
+        "tdworkflow.attempt.id": 12,
+    }
+    assert tracing.resource_attributes("projects/3/archive") == {
+        "tdworkflow.resource": "projects",
+        "tdworkflow.project.id": 3,
+    }
+    assert tracing.resource_attributes("schedules") == {
+        "tdworkflow.resource": "schedules"
+    }
+
+
+def test_request_span(spans, mocker):
+    client = Client(site="us", apikey="APIKEY")
+    client._http = mocker.MagicMock()
+    response = client._http.get.return_value
+    response.status_code = 200
+    response.content = b'{"tasks": []}'
+    response.json.return_value = {"tasks": []}
+
+    client.attempt_tasks(42)
+
+    (span,) = spans.get_finished_spans()
+    assert span.name == "tdworkflow GET attempts"
+    assert span.attributes["tdworkflow.attempt.id"] == 42
+    assert span.attributes["http.response.status_code"] == 200
+    assert span.attributes["tdworkflow.response.size"] == len(response.content)
+    assert span.attributes["tdworkflow.retries"] == 0
+
+
+def test_parent_span(spans, mocker):
+    client = Client(site="us", apikey="APIKEY")
+    client._http = mocker.MagicMock()
+    response = client._http.get.return_value
+    response.status_code = 200
+    response.content = b'{"files": []}'
+    response.json.return_value = {"files": []}
+
+    client.logs(42)
+
+    child, parent = spans.get_finished_spans()
+    assert parent.name == "tdworkflow.logs"
+    assert child.parent.span_id == parent.context.span_id
+
+
+def test_disabled(spans):
+    tracing.set_enabled(False)
+    with tracing.span("tdworkflow.test") as span:
+        assert span is None
+    assert spans.get_finished_spans() == ()
@@ -0,0 +1,45 @@
+from tdworkflow.task import Task
+from tdworkflow.tracker import TaskTracker
+
+
+def raw_task(task_id, state, updated_at="2019-12-15T07:27:16Z"):
+    return {
+        "id": str(task_id),
+        "fullName": f"+simple+task{task_id}",
+        "state": state,
+        "updatedAt": updated_at,
+    }
+
+
+def test_task_tracker(mocker):
+    client = mocker.MagicMock()
+    tracker = TaskTracker(client, 1)
+    client.get.return_value = {
+        "tasks": [raw_task(1, "running"), raw_task(2, "blocked")]
+    }
+
+    changes = tracker.poll()
+    client.get.assert_called_with("attempts/1/tasks")
+    assert [(c.task.id, c.previous_state, c.task.state) for c in changes] == [
+        (1, None, "running"),
+        (2, None, "blocked"),
+    ]
+    assert len(tracker) == 2
+    unchanged = tracker[2]
+
+    from_api_repr = mocker.spy(Task, "from_api_repr")
+    client.get.return_value = {
+        "tasks": [
+            raw_task(1, "success", "2019-12-15T07:28:00Z"),
+            raw_task(2, "blocked"),
+            raw_task(3, "ready"),
+        ]
+    }
+    changes = tracker.poll()
+    assert [(c.task.id, c.previous_state, c.task.state) for c in changes] == [
+        (1, "running", "success"),
+        (3, None, "ready"),
+    ]
+    assert from_api_repr.call_count == 2
+    assert tracker[2] is unchanged
+    assert tracker[1].state == "success"
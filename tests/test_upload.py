@@ -0,0 +1,78 @@
+import base64
+import hashlib
+import http.server
+import json
+import os
+import threading
+
+import pytest
+
+from tdworkflow.client import Client
+from tdworkflow.upload import UploadBody
+
+
+def test_upload_body():
+    data = os.urandom(100_000)
+    progress = []
+    body = UploadBody(data, on_progress=lambda *args: progress.append(args))
+
+    assert len(body) == 100_000
+    assert body.md5 == base64.b64encode(hashlib.md5(data).digest()).decode()
+    assert body.read(60_000) + body.read() == data
+    assert progress == [(60_000, 100_000), (100_000, 100_000)]
+    assert body.attempts == 1
+    assert body.bytes_per_second
+
+    body.seek(0)
+    assert body.read() == data
+    assert body.attempts == 2
+
+
+@pytest.fixture
+def flaky_server():
+    bodies = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_PUT(self):
+            bodies.append(self.rfile.read(int(self.headers["Content-Length"])))
+            if len(bodies) == 1:
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            content = json.dumps({"id": "1", "name": "test-project"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, bodies
+    server.shutdown()
+    server.server_close()
+
+
+def test_create_project_retries_whole_archive(flaky_server):
+    server, bodies = flaky_server
+    client = Client(
+        endpoint=f"127.0.0.1:{server.server_address[1]}", apikey="", scheme="http"
+    )
+    progress = []
+    client.create_project(
+        "test-project",
+        "tests/resources/sample_project",
+        on_progress=lambda sent, total: progress.append((sent, total)),
+    )
+
+    assert len(bodies) == 2
+    assert bodies[0] == bodies[1]
+    assert len(bodies[0]) > 0
+    # Progress restarts from the beginning on the retry
+    total = len(bodies[0])
+    assert progress.count((total, total)) == 2
@@ -17,3 +17,21 @@ def test_archive_files():
 
     assert len(expected_files) == len(files)
     assert sorted(expected_files) == sorted(files)
+
+
+def read_archive(data):
+    files = {}
+    with tarfile.open(mode="r:gz", fileobj=data) as tar:
+        for t in tar:
+            f = tar.extractfile(t)
+            files[t.name] = f.read() if f else None
+    return files
+
+
+def test_archive_files_in_parallel():
+    target_dir = Path("tests", "resources", "sample_project")
+    excludes = ["ignore_dir", "__ignoredir__"]
+    expected = archive_files(target_dir, excludes)
+    data = archive_files(target_dir, excludes, compresslevel=1, threads=4)
+
+    assert read_archive(data) == read_archive(expected)
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from tdworkflow.attempt import Attempt
+from tdworkflow.watch import Watcher, watch
+
+
+class FakeClient:
+    def __init__(self, polls):
+        # List of (done, {task_id: state}) returned by successive polls
+        self.polls = polls
+        self.calls = 0
+
+    def attempt(self, attempt_id):
+        done, _ = self.polls[min(self.calls, len(self.polls) - 1)]
+        return Attempt(id=attempt_id, done=done)
+
+    def get(self, path, params=None):
+        assert path == "attempts/10/tasks"
+        _, states = self.polls[min(self.calls, len(self.polls) - 1)]
+        self.calls += 1
+        return {"tasks": [{"id": str(i), "state": s} for i, s in states.items()]}
+
+
+def test_watch(mocker):
+    mocker.patch("time.sleep")
+    client = FakeClient(
+        [
+            (False, {1: "planned", 2: "blocked", 3: "blocked"}),
+            (False, {1: "planned", 2: "running", 3: "blocked"}),
+            (False, {1: "planned", 2: "retry_waiting", 3: "blocked"}),
+            (True, {1: "group_error", 2: "error", 3: "canceled"}),
+        ]
+    )
+
+    events = [(e.kind, e.task.id if e.task else None) for e in watch(client, [10])]
+    assert events == [
+        ("started", 1),
+        ("started", 2),
+        ("retried", 2),
+        ("failed", 1),
+        ("failed", 2),
+        ("canceled", 3),
+        ("attempt_finished", None),
+    ]
+
+
+def test_watcher_coalesces_polls():
+    client = FakeClient([(False, {1: "running"}), (True, {1: "success"})])
+    watcher = Watcher(client)
+    first, second = [], []
+    watcher.subscribe(10, first.append)
+    subscription = watcher.subscribe(10, second.append)
+
+    watcher.poll_once()
+    assert client.calls == 1
+    assert [e.kind for e in first] == [e.kind for e in second] == ["started"]
+
+    subscription.cancel()
+    watcher.poll_once()
+    assert client.calls == 2
+    assert [e.kind for e in first] == ["started", "succeeded", "attempt_finished"]
+    assert len(second) == 1
+    assert not watcher.active
+
+
+def test_watch_shared_watcher():
+    client = FakeClient([(False, {1: "running"}), (True, {1: "success"})])
+    watcher = Watcher(client, interval=0.01)
+    first = watch(client, [10], watcher=watcher)
+    second = watch(client, [10], watcher=watcher)
+
+    expected = ["started", "succeeded", "attempt_finished"]
+    assert [e.kind for e in first] == [e.kind for e in second] == expected
+    assert client.calls == 2
+    watcher.stop()
+    assert not watcher.active
+
+
+def test_watcher_subscribe_project_pages():
+    now = datetime.now(timezone.utc)
+    attempts = [
+        Attempt(id=5, done=False, createdAt=now),
+        Attempt(id=4, done=True, createdAt=now - timedelta(hours=1)),
+        Attempt(id=3, done=False, createdAt=now - timedelta(hours=2)),
+        Attempt(id=2, done=False, createdAt=now - timedelta(days=2)),
+        Attempt(id=1, done=False, createdAt=now - timedelta(days=3)),
+    ]
+    client = MagicMock()
+    client.iter_attempts.return_value = iter(attempts)
+    watcher = Watcher(client)
+    callback = MagicMock()
+
+    watcher.subscribe_project("sample", callback)
+    assert sorted(watcher._subscriptions) == [3, 5]
+    assert watcher._projects["sample"] == (5, [callback])
+    # Attempts older than the cutoff aren't fetched
+    assert next(client.iter_attempts.return_value).id == 1
+
+    watcher.unsubscribe_project("sample", callback)
+    assert not watcher.active